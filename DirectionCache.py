@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+from collections import OrderedDict
+
+from DirectionFinder import DirectionFinder
+
+
+class DirectionCache:
+    """
+    Memoizes the directions found by a DirectionFinder. Quantized sensor
+    outputs tend to repeat the same few amplitude patterns, so remembering
+    the direction found for each pattern lets repeated frames skip the
+    strategy altogether.
+
+    Entries are keyed on the amplitudes of a frame together with the sensor
+    geometry, so a change in geometry never returns a direction found for a
+    different geometry. The least recently used entries are evicted once the
+    cache holds maxsize of them.
+
+    Only frames made up entirely of int amplitudes are cached, as other
+    values such as 1.0 or True compare equal to valid ints while being
+    treated as invalid by FindDirection.
+    """
+
+
+    def __init__(self, directionFinder=None, maxsize=4096):
+        self.directionFinder = directionFinder if directionFinder is not None \
+            else DirectionFinder()
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    def FindDirection(self, sensorData):
+        """
+        Cached form of DirectionFinder.FindDirection. The geometry is taken
+        from the locations in sensorData.
+        """
+        amplitudes = tuple([element['amp'] for element in sensorData])
+        locations = tuple([element['location'] for element in sensorData])
+        if not self._Cacheable(amplitudes):
+            return self.directionFinder.FindDirection(sensorData)
+
+        key = (locations, amplitudes)
+        direction = self._Lookup(key)
+        if direction is None:
+            direction = self.directionFinder.FindDirection(sensorData)
+            self._Store(key, direction)
+        return direction
+
+    def FindDirections(self, amplitudes, locations, geometryId=None):
+        """
+        Cached form of DirectionFinder.FindDirections. geometryId can be
+        given to identify the sensor geometry instead of the locations
+        themselves, which saves hashing the locations on every call. The
+        caller must then use a new geometryId whenever the locations change.
+        Locations which carry their own geometry_id, such as a SensorLayout,
+        are identified by it.
+        """
+        if geometryId is None:
+            geometryId = getattr(locations, 'geometry_id', None)
+        if geometryId is None:
+            geometryId = tuple(locations)
+
+        directions = []
+        for frame in amplitudes:
+            frame = tuple(frame)
+            if not self._Cacheable(frame):
+                directions.append(self.directionFinder.FindDirections((frame,), locations)[0])
+                continue
+
+            key = (geometryId, frame)
+            direction = self._Lookup(key)
+            if direction is None:
+                direction = self.directionFinder.FindDirections((frame,), locations)[0]
+                self._Store(key, direction)
+            directions.append(direction)
+        return directions
+
+    def _Cacheable(self, amplitudes):
+        if all(type(amp) is int for amp in amplitudes):
+            return True
+        self.bypasses += 1
+        return False
+
+    def _Lookup(self, key):
+        direction = self.entries.get(key)
+        if direction is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return direction
+
+    def _Store(self, key, direction):
+        self.entries[key] = direction
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def Invalidate(self, geometryId=None):
+        """
+        Drops the cached entries for a single geometry, or every entry when
+        no geometry is given
+        """
+        if geometryId is None:
+            self.entries.clear()
+            return
+        for key in [key for key in self.entries if key[0] == geometryId]:
+            del self.entries[key]
+
+    def Statistics(self):
+        """
+        Returns the hit, miss, bypass and eviction counts along with the
+        current and maximum size of the cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import unittest
+from DirectionCache import DirectionCache
+from DirectionFinder import DirectionFinder
+
+
+LOCATIONS = [(1, 1), (2, 2), (3, 3), (4, 4)]
+
+
+class CountingDirectionFinder(DirectionFinder):
+
+    def __init__(self):
+        self.calls = 0
+
+    def DirectionFromAmplitudes(self, amplitudes, locations):
+        self.calls += 1
+        return DirectionFinder.DirectionFromAmplitudes(self, amplitudes, locations)
+
+
+class Layout(tuple):
+
+    def __new__(cls, locations, geometryId):
+        layout = super().__new__(cls, locations)
+        layout.geometry_id = geometryId
+        return layout
+
+
+def buildSensorData(amplitudes, locations=LOCATIONS):
+    return [{'amp': amp, 'location': location} \
+        for amp, location in zip(amplitudes, locations)]
+
+
+class DirectionCacheTests(unittest.TestCase):
+
+    def testRepeatedFramesHitCache(self):
+        testDF = CountingDirectionFinder()
+        testCache = DirectionCache(testDF)
+        directions = testCache.FindDirections([[1, 5, 2, 2], [1, 5, 2, 2], [9, 1, 1, 1], \
+            [1, 5, 2, 2]], LOCATIONS)
+
+        self.assertEqual(directions, [(2, 2), (2, 2), (1, 1), (2, 2)])
+        self.assertEqual(testDF.calls, 2)
+        statistics = testCache.Statistics()
+        self.assertEqual(statistics['hits'], 2)
+        self.assertEqual(statistics['misses'], 2)
+        self.assertEqual(statistics['hit_rate'], 0.5)
+
+    def testMatchesFindDirection(self):
+        testCache = DirectionCache()
+        testDF = DirectionFinder()
+        for amplitudes in [[1, 5, 2, 2], [7, 7, 7, 7], [1, 'Q', 1, 1], [1, 1.0, 1, 1], \
+            [1, 5, 2, 2], [True, 1, 1, 1]]:
+            sensorData = buildSensorData(amplitudes)
+            self.assertEqual(testCache.FindDirection(sensorData), testDF.FindDirection(sensorData))
+
+    def testNonIntegerFramesBypassCache(self):
+        testCache = DirectionCache()
+        testCache.FindDirections([[1, 5, 2, 2]], LOCATIONS)
+
+        # 5.0 compares equal to 5 but is not a valid amplitude
+        self.assertEqual(testCache.FindDirections([[1, 5.0, 2, 2]], LOCATIONS), [()])
+        self.assertEqual(testCache.Statistics()['bypasses'], 1)
+
+    def testGeometryChange(self):
+        testCache = DirectionCache()
+        otherLocations = [(5, 5), (6, 6), (7, 7), (8, 8)]
+        testCache.FindDirection(buildSensorData([1, 5, 2, 2]))
+
+        self.assertEqual(testCache.FindDirection(buildSensorData([1, 5, 2, 2], otherLocations)), \
+            (6, 6))
+
+    def testGeometryId(self):
+        testCache = DirectionCache()
+        otherLocations = [(5, 5), (6, 6), (7, 7), (8, 8)]
+        testCache.FindDirections([[1, 5, 2, 2]], LOCATIONS, geometryId=1)
+
+        self.assertEqual(testCache.FindDirections([[1, 5, 2, 2]], otherLocations, geometryId=2), \
+            [(6, 6)])
+        testCache.Invalidate(1)
+        self.assertEqual(testCache.Statistics()['size'], 1)
+        testCache.Invalidate()
+        self.assertEqual(testCache.Statistics()['size'], 0)
+
+    def testLayoutGeometryId(self):
+        testCache = DirectionCache()
+        layout = Layout(LOCATIONS, 7)
+        testCache.FindDirections([[1, 5, 2, 2], [9, 1, 1, 1]], layout)
+
+        self.assertEqual([key[0] for key in testCache.entries], [7, 7])
+        self.assertEqual(testCache.FindDirections([[1, 5, 2, 2]], Layout(LOCATIONS, 7)), [(2, 2)])
+        self.assertEqual(testCache.Statistics()['hits'], 1)
+        testCache.Invalidate(layout.geometry_id)
+        self.assertEqual(testCache.Statistics()['size'], 0)
+
+    def testLeastRecentlyUsedEviction(self):
+        testDF = CountingDirectionFinder()
+        testCache = DirectionCache(testDF, maxsize=2)
+        testCache.FindDirections([[1, 5, 2, 2], [9, 1, 1, 1], [1, 5, 2, 2], [1, 1, 1, 9], \
+            [1, 5, 2, 2], [9, 1, 1, 1]], LOCATIONS)
+
+        self.assertEqual(testDF.calls, 4)
+        self.assertEqual(testCache.Statistics()['evictions'], 2)
+        self.assertEqual(testCache.Statistics()['size'], 2)
+
+if __name__ == "__main__":
+    unittest.main()
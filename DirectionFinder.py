@@ -1,12 +1,58 @@
 #!/usr/bin/env python3
 
+import logging
+from array import array
+
+from Instrumentation import NULL_INSTRUMENTATION
+
+logger = logging.getLogger(__name__)
+
+# Array typecodes which can only hold non-negative ints, every one of which
+# is a valid amplitude
+UNSIGNED_TYPECODES = frozenset('BHILQ')
+
+def is_valid_amplitude(amp):
+    """
+    Returns True when an amplitude would pass the str(amp).isdecimal() check
+    used by FindDirection. Plain ints are the common case, so they are checked
+    directly rather than round-tripping through a string.
+    """
+    if type(amp) is int:
+        return amp >= 0
+    return str(amp).isdecimal()
+
+def is_unsigned_frame(frame):
+    """
+    Returns True when a frame is an array or memoryview of unsigned ints,
+    such as a SensorFrame or the output of a SensorQuantizer. Every element
+    of such a frame is a valid amplitude, so it need not be checked.
+    """
+    return (isinstance(frame, array) and frame.typecode in UNSIGNED_TYPECODES) \
+        or (isinstance(frame, memoryview) and frame.format in UNSIGNED_TYPECODES)
+
+def peak_index(amplitudes):
+    """
+    Returns the index of the first maximum amplitude of a frame, which may be
+    a memoryview as well as a list, tuple or array
+    """
+    if isinstance(amplitudes, memoryview):
+        # memoryview has no index method, but max keeps the first of equal
+        # keys
+        return max(range(len(amplitudes)), key=amplitudes.__getitem__)
+    return amplitudes.index(max(amplitudes))
+
 
 class DirectionFinder:
     """
     The class is responsible for finding the Angle Of Arrival (AOA) of
     light based on the current sensor data.
+
+    The instrumentation attribute can be set to an Instrumentation to count
+    the frames processed and the frames rejected as invalid.
     """
 
+    instrumentation = NULL_INSTRUMENTATION
+
 
     def FindDirection(self, sensorData):
         """
@@ -18,25 +64,89 @@ class DirectionFinder:
         NOTE: If the data provided is determined to be invalid, this method returns
         an empty vector - () which indicates that the AOA could not be determined.
 
-        This implementation is simple in that it does not attempt to interpolate
-        between sensor positions. More sophisticated implementations should override
-        this method.
+        Once the frame is known to be valid the AOA is estimated by
+        DirectionFromAmplitudes, which subclasses override to provide other
+        strategies. This implementation is simple in that it does not attempt
+        to interpolate between sensor positions.
+
+        Every amplitude is checked. Callers holding a SensorFrame or another
+        unsigned array should use FindDirections((frame,), locations), which
+        trusts the frame's type instead.
         """
-        maxAmp = 0
-        maxDirection = { 0, 0 }
+        self.instrumentation.Count('frames')
+
+        # The amplitudes are checked before anything else, so a frame made
+        # of a single repeated invalid value is rejected rather than taken
+        # as light falling evenly on every sensor
+        for element in sensorData:
+            # If any of the amplitudes aren't valid, then return an invalid result
+            if not is_valid_amplitude(element['amp']):
+                logger.error("Invalid amplitude (%s) from sensor at position %s", \
+                    element['amp'], element['location'])
+                self.instrumentation.Count('invalid_frames')
+                return ()
 
         # Special Case: If all elements are the same, don't move anywhere
         if all(element['amp'] == sensorData[0]['amp'] for element in sensorData):
             return (0, 0)
 
-        for element in sensorData:
-            # If any of the amplitudes aren't valid, then return an invalid result
-            if not str(element['amp']).isdecimal():
-                print("Error: Invalid amplitude (" + str(element['amp']) + ") from sensor at position " + str(element['location']))
-                return ()
+        return self.DirectionFromAmplitudes([element['amp'] for element in sensorData], \
+            [element['location'] for element in sensorData])
+
+    def FindDirections(self, amplitudes, locations):
+        """
+        Batch form of FindDirection. Takes an N x M collection of amplitudes,
+        one row per frame and one column per sensor, along with the M sensor
+        locations (2D or 3D) shared by every frame. Returns a list of N
+        directions, one per frame.
+
+        Each frame is evaluated with exactly the same rules as FindDirection:
+        any invalid amplitude gives (), identical amplitudes give (0, 0), and
+        otherwise the direction is estimated by DirectionFromAmplitudes.
+        Invalid frames are counted but not logged. Frames which are unsigned
+        arrays or memoryviews, such as SensorFrames, are known to be valid and
+        are used as they are. Lists and tuples are used as they are too, and
+        any other iterable is copied into a list first.
+        """
+        directions = []
+        append = directions.append
+        estimate = self.DirectionFromAmplitudes
+
+        for frame in amplitudes:
+            # Frames from an unsigned array, such as the output of a
+            # SensorQuantizer or a view onto a FrameLog, need not be checked
+            # element by element, and are compared without copying them
+            if is_unsigned_frame(frame):
+                identical = not frame or max(frame) == min(frame)
+            else:
+                if not isinstance(frame, (list, tuple)):
+                    frame = list(frame)
+                # Checked before the special case, as in FindDirection
+                if not all(map(is_valid_amplitude, frame)):
+                    self.instrumentation.Count('invalid_frames')
+                    append(())
+                    continue
+                # Compared element by element, as FindDirection does, since
+                # list.count would also match a NaN against itself
+                first = frame[0] if frame else None
+                identical = all(amp == first for amp in frame)
 
-            if element['amp'] > maxAmp:
-                maxAmp = element['amp']
-                maxDirection = element['location']
+            # Special Case: If all elements are the same, don't move anywhere
+            if identical:
+                append((0, 0))
+                continue
 
-        return maxDirection
+            append(estimate(frame, locations))
+
+        self.instrumentation.Count('frames', len(directions))
+        return directions
+
+    def DirectionFromAmplitudes(self, amplitudes, locations):
+        """
+        Estimates the AOA from a single frame of amplitudes which is known to
+        be valid and to contain at least two different amplitudes. This
+        implementation returns the location of the first maximum amplitude.
+        Both FindDirection and FindDirections call this method, so
+        subclasses override it to provide other strategies for both.
+        """
+        return locations[peak_index(amplitudes)]
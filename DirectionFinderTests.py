@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import unittest
+from array import array
 from DirectionFinder import DirectionFinder
+from SensorFrame import SensorFrame
 
 
 class DirectionFinderTests(unittest.TestCase):
@@ -97,5 +99,71 @@ class DirectionFinderTests(unittest.TestCase):
 
         self.assertEqual(direction, (0, 0))
 
+    def testBatchMatchesSingleFrame(self):
+        locations = [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7), (8, 8)]
+        frames = []
+        frames.append([128, 128, 128, 128, 128, 128, 128, 128])
+        frames.append([256, 128, 128, 128, 128, 256, 128, 128])
+        frames.append([128, 128, 128, 256, 128, 128, 128, 128])
+        frames.append([0, 0, 0, 0, 0, 0, 0, 0])
+        frames.append([128, 128, 'Q', 128, 128, 128, 128, 128])
+        frames.append([128, 128, 128, 128, 128, 128, 2.5, 128])
+        frames.append([0, 3, 1, 0, 2, 3, 0, 1])
+        # The same NaN object in every position
+        frames.append([float('nan')] * 8)
+        frames.append(['Q'] * 4 + [128] * 4)
+        testDF = DirectionFinder()
+
+        expected = []
+        for frame in frames:
+            sensorData = [{'amp': amp, 'location': location} \
+                for amp, location in zip(frame, locations)]
+            expected.append(testDF.FindDirection(sensorData))
+
+        self.assertEqual(testDF.FindDirections(frames, locations), expected)
+        self.assertEqual(expected[7], ())
+
+    def testBatchThreeDimensionalLocations(self):
+        locations = [(1, 1, 10), (2, 2, 10), (3, 3, 10)]
+        frames = [(1, 5, 2), (7, 7, 7), (9, 1, 1)]
+        testDF = DirectionFinder()
+        directions = testDF.FindDirections(frames, locations)
+
+        self.assertEqual(directions, [(2, 2, 10), (0, 0), (1, 1, 10)])
+
+    def testBatchUnsignedArrayFrames(self):
+        locations = [(1, 1), (2, 2), (3, 3)]
+        frames = [array('H', [1, 5, 2]), array('H', [4, 4, 4]), array('b', [3, -1, 0])]
+        testDF = DirectionFinder()
+        directions = testDF.FindDirections(frames, locations)
+
+        self.assertEqual(directions, [(2, 2), (0, 0), ()])
+
+    def testBatchMemoryviewFrames(self):
+        locations = [(1, 1), (2, 2), (3, 3)]
+        frames = memoryview(array('H', [1, 5, 5, 4, 4, 4, 0, 0, 7]))
+        testDF = DirectionFinder()
+        directions = testDF.FindDirections([frames[0:3], frames[3:6], frames[6:9]], locations)
+
+        self.assertEqual(directions, [(2, 2), (0, 0), (3, 3)])
+
+    def testSingleFrameKnownValid(self):
+        locations = [(1, 1), (2, 2), (3, 3)]
+        frame = SensorFrame([1, 5, 2])
+        sensorData = [{'amp': amp, 'location': location} \
+            for amp, location in zip(frame, locations)]
+        testDF = DirectionFinder()
+
+        self.assertEqual(testDF.FindDirections((frame,), locations), [(2, 2)])
+        self.assertEqual(testDF.FindDirection(sensorData), (2, 2))
+
+        # Only plain non-negative ints and decimal strings are accepted
+        sensorData[0]['amp'] = 1.0
+        with self.assertLogs('DirectionFinder', level='ERROR'):
+            self.assertEqual(testDF.FindDirection(sensorData), ())
+        sensorData[0]['amp'] = -1
+        with self.assertLogs('DirectionFinder', level='ERROR'):
+            self.assertEqual(testDF.FindDirection(sensorData), ())
+
 if __name__ == "__main__":
     unittest.main()
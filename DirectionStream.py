@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+from array import array
+
+from DirectionFinder import DirectionFinder
+from DirectionFinder import is_unsigned_frame
+from DirectionFinder import is_valid_amplitude
+
+
+# Marks the end of the frames placed on an asyncio queue
+END_OF_STREAM = None
+
+# Largest amplitude which fits the unsigned array valid frames are passed on in
+_MAX_UNSIGNED = (1 << 64) - 1
+
+
+class DirectionStream:
+    """
+    Turns a continuous feed of sensor frames into a feed of AOA estimates.
+    Each frame is a sequence of amplitudes, one per sensor, in the same order
+    as the sensor locations given to the stream.
+
+    Frames can be smoothed over time by a FrameFilter, such as a MeanFilter
+    or MedianFilter over a sliding window of recent frames, and the reported
+    direction can be debounced so that it only changes once a new direction
+    has been seen for several frames in a row. The filters keep a fixed
+    amount of state per sensor, so memory use does not grow with the length
+    of the stream. Frames are pulled from their source one at a time as
+    directions are requested, so a slow consumer holds back the producer
+    rather than causing frames to be buffered.
+    """
+
+
+    def __init__(self, locations, directionFinder=None, frameFilter=None, debounce=1):
+        """
+        Creates a stream for sensors at the given locations. frameFilter is
+        the FrameFilter used to smooth the frames, if any. debounce is the
+        number of consecutive frames a new direction must be seen for before
+        it is reported.
+        """
+        if debounce < 1:
+            raise ValueError("debounce must be at least 1")
+
+        self.locations = list(locations)
+        self.directionFinder = directionFinder if directionFinder is not None \
+            else DirectionFinder()
+        self.frameFilter = frameFilter
+        self.debounce = debounce
+
+        self.reported = None
+        self.candidate = None
+        self.candidateCount = 0
+
+    def Reset(self):
+        """
+        Forgets all previously seen frames
+        """
+        if self.frameFilter is not None:
+            self.frameFilter.Reset()
+        self.reported = None
+        self.candidate = None
+        self.candidateCount = 0
+
+    def Process(self, amplitudes):
+        """
+        Adds a single frame to the stream and returns the direction to report
+        after it. A frame with invalid amplitudes is left out of the filter
+        and gives exactly what FindDirections gives for it, which is ().
+
+        Each frame is checked once, here. A frame of plain ints is then
+        passed on as an unsigned array, which the FrameFilter and the
+        DirectionFinder trust without checking it again.
+        """
+        frame = amplitudes
+        if not is_unsigned_frame(frame):
+            frame = list(frame)
+            if not all(map(is_valid_amplitude, frame)):
+                return self.directionFinder.FindDirections((frame,), self.locations)[0]
+            if frame and set(map(type, frame)) == {int} and max(frame) <= _MAX_UNSIGNED:
+                frame = array('Q', frame)
+
+        if self.frameFilter is not None:
+            frame = self.frameFilter.Filter(frame)
+        direction = self.directionFinder.FindDirections((frame,), self.locations)[0]
+
+        return self._Debounce(direction)
+
+    def _Debounce(self, direction):
+        if self.reported is None or direction == self.reported:
+            self.reported = direction
+            self.candidate = None
+            self.candidateCount = 0
+            return direction
+
+        if direction == self.candidate:
+            self.candidateCount += 1
+        else:
+            self.candidate = direction
+            self.candidateCount = 1
+
+        if self.candidateCount >= self.debounce:
+            self.reported = direction
+            self.candidate = None
+            self.candidateCount = 0
+
+        return self.reported
+
+    def Stream(self, frames):
+        """
+        Generator yielding one direction for each frame taken from any
+        iterable of frames
+        """
+        for frame in frames:
+            yield self.Process(frame)
+
+    async def AsyncStream(self, frames):
+        """
+        Asynchronous generator yielding one direction for each frame taken
+        from either an asyncio.Queue or an asynchronous iterable. A queue is
+        read until END_OF_STREAM is taken from it. Giving the queue a maxsize
+        makes the producer wait whenever the consumer falls behind.
+        """
+        if hasattr(frames, '__aiter__'):
+            async for frame in frames:
+                yield self.Process(frame)
+            return
+
+        while True:
+            frame = await frames.get()
+            try:
+                if frame is END_OF_STREAM:
+                    return
+                yield self.Process(frame)
+            finally:
+                frames.task_done()
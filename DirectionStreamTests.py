@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+from array import array
+from DirectionFinder import DirectionFinder
+from DirectionFinder import is_unsigned_frame
+from DirectionStream import DirectionStream
+from DirectionStream import END_OF_STREAM
+from FrameFilter import MeanFilter
+from FrameFilter import MedianFilter
+
+
+LOCATIONS = [(1, 1), (2, 2), (3, 3), (4, 4)]
+
+
+class DirectionStreamTests(unittest.TestCase):
+
+    def testMatchesDirectionFinder(self):
+        frames = [[1, 5, 2, 2], [7, 7, 7, 7], [1, 'Q', 1, 1], ['Q', 'Q', 'Q', 'Q'], \
+            [9, 1, 1, 9]]
+        testStream = DirectionStream(LOCATIONS)
+        directions = list(testStream.Stream(frames))
+
+        self.assertEqual(directions, [(2, 2), (0, 0), (), (), (1, 1)])
+        directionFinder = DirectionFinder()
+        self.assertEqual(directions, [directionFinder.FindDirection( \
+            [{'amp': amp, 'location': location} for amp, location in zip(frame, LOCATIONS)]) \
+            for frame in frames])
+
+    def testFramesCheckedOnce(self):
+        class RecordingFinder(DirectionFinder):
+            def FindDirections(self, amplitudes, locations):
+                self.frames = list(amplitudes)
+                return super().FindDirections(self.frames, locations)
+
+        testFinder = RecordingFinder()
+        testStream = DirectionStream(LOCATIONS, testFinder, MeanFilter(2))
+        self.assertEqual(testStream.Process([1, 5, 2, 2]), (2, 2))
+        self.assertTrue(is_unsigned_frame(testFinder.frames[0]))
+        self.assertEqual(testStream.Process(memoryview(array('H', [1, 1, 9, 1]))), (3, 3))
+        self.assertEqual(testStream.Process([1, 'Q', 1, 1]), ())
+
+    def testMeanWindow(self):
+        frames = [[1, 9, 1, 1], [1, 1, 1, 20], [1, 1, 1, 20]]
+        testStream = DirectionStream(LOCATIONS, frameFilter=MeanFilter(3))
+        directions = list(testStream.Stream(frames))
+
+        # The single glitchy frame only wins once it has been repeated
+        self.assertEqual(directions, [(2, 2), (4, 4), (4, 4)])
+        self.assertEqual(len(testStream.frameFilter.state[0]), 3)
+
+    def testMedianWindow(self):
+        frames = [[1, 9, 1, 1], [1, 9, 1, 1], [1, 1, 1, 90], [1, 9, 1, 1]]
+        testStream = DirectionStream(LOCATIONS, frameFilter=MedianFilter(3))
+        directions = list(testStream.Stream(frames))
+
+        self.assertEqual(directions, [(2, 2), (2, 2), (2, 2), (2, 2)])
+
+    def testWindowIsBounded(self):
+        testStream = DirectionStream(LOCATIONS, frameFilter=MeanFilter(2))
+        for direction in testStream.Stream([[1, 2, 3, 4]] * 100):
+            self.assertEqual(direction, (4, 4))
+        self.assertEqual(len(testStream.frameFilter.state[0]), 2)
+
+    def testDebounce(self):
+        frames = [[1, 9, 1, 1], [9, 1, 1, 1], [1, 9, 1, 1], [9, 1, 1, 1], [9, 1, 1, 1]]
+        testStream = DirectionStream(LOCATIONS, debounce=2)
+        directions = list(testStream.Stream(frames))
+
+        self.assertEqual(directions, [(2, 2), (2, 2), (2, 2), (2, 2), (1, 1)])
+
+    def testInvalidParameters(self):
+        self.assertRaises(ValueError, DirectionStream, LOCATIONS, debounce=0)
+
+    def testAsyncQueue(self):
+        async def run():
+            queue = asyncio.Queue(maxsize=1)
+            testStream = DirectionStream(LOCATIONS)
+
+            async def produce():
+                for frame in [[1, 5, 2, 2], [7, 7, 7, 7], [9, 1, 1, 9]]:
+                    await queue.put(frame)
+                await queue.put(END_OF_STREAM)
+
+            producer = asyncio.ensure_future(produce())
+            directions = [direction async for direction in testStream.AsyncStream(queue)]
+            await producer
+            return directions
+
+        self.assertEqual(asyncio.run(run()), [(2, 2), (0, 0), (1, 1)])
+
+    def testAsyncIterable(self):
+        async def frames():
+            for frame in [[1, 5, 2, 2], [9, 1, 1, 9]]:
+                yield frame
+
+        async def run():
+            testStream = DirectionStream(LOCATIONS)
+            return [direction async for direction in testStream.AsyncStream(frames())]
+
+        self.assertEqual(asyncio.run(run()), [(2, 2), (1, 1)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+from array import array
+from bisect import bisect_left
+from bisect import insort
+from collections import deque
+
+from DirectionFinder import is_unsigned_frame
+from DirectionFinder import is_valid_amplitude
+
+
+class FrameFilter:
+    """
+    Base class for filters which smooth each sensor's amplitude over time
+    before the frames reach a DirectionFinder. A single noisy reading can
+    otherwise flip the direction found for a frame.
+
+    Frames are filtered whole, one amplitude per sensor in the same order
+    every time, and each sensor keeps its own state. Updating the state for
+    a frame takes a fixed amount of work per sensor, however long the
+    stream has run. The filtered amplitudes are rounded back to ints, and an
+    unsigned array frame, such as the output of a SensorQuantizer, or a view
+    onto one, such as a frame replayed from a FrameLog, gives an array of the
+    same type so it is still known to be valid.
+
+    A frame holding an invalid amplitude is returned unchanged and isn't
+    added to the state, so the DirectionFinder still rejects it.
+    """
+
+
+    def __init__(self):
+        self.Reset()
+
+    def Filter(self, amplitudes):
+        """
+        Adds a frame to the filter and returns the filtered frame
+        """
+        knownValid = is_unsigned_frame(amplitudes)
+        frame = list(amplitudes)
+        if not knownValid and not all(map(is_valid_amplitude, frame)):
+            return amplitudes
+        if self.state is None or len(self.state) != len(frame):
+            self.Start(frame)
+            filtered = frame
+        else:
+            filtered = [int(round(value)) for value in self.Update(frame)]
+
+        if isinstance(amplitudes, array):
+            return array(amplitudes.typecode, filtered)
+        if knownValid:
+            # A view onto an unsigned array, such as one from a FrameLog
+            return array(amplitudes.format, filtered)
+        return filtered
+
+    def FilterFrames(self, frames):
+        """
+        Filters a sequence of frames in order, returning a list of the
+        filtered frames
+        """
+        return [self.Filter(frame) for frame in frames]
+
+    def Reset(self):
+        """
+        Forgets all previously seen frames
+        """
+        self.state = None
+
+    def Start(self, frame):
+        """
+        Starts the state of every sensor from the first frame, which is
+        passed through unchanged
+        """
+        raise NotImplementedError
+
+    def Update(self, frame):
+        """
+        Adds a frame to the state of every sensor and returns the filtered
+        values, which need not be ints
+        """
+        raise NotImplementedError
+
+
+class ExponentialFilter(FrameFilter):
+    """
+    Exponential moving average of each sensor. Each new amplitude moves the
+    average alpha of the way towards it, so a smaller alpha smooths more but
+    follows real changes more slowly.
+    """
+
+
+    def __init__(self, alpha=0.5):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        super().__init__()
+
+    def Start(self, frame):
+        self.state = [float(amp) for amp in frame]
+
+    def Update(self, frame):
+        alpha = self.alpha
+        self.state = [average + alpha * (amp - average) \
+            for average, amp in zip(self.state, frame)]
+        return self.state
+
+
+class MeanFilter(FrameFilter):
+    """
+    Mean of each sensor over a sliding window of the most recent frames.
+    Each sensor keeps a running sum of its window, so a new amplitude
+    replaces the oldest one without adding up the window again.
+    """
+
+
+    def __init__(self, window=3):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        super().__init__()
+
+    def Start(self, frame):
+        self.state = [deque([amp]) for amp in frame]
+        self.sums = list(frame)
+
+    def Update(self, frame):
+        window = self.window
+        sums = self.sums
+        means = []
+        for index, (recent, amp) in enumerate(zip(self.state, frame)):
+            total = sums[index] + amp
+            if len(recent) == window:
+                total -= recent.popleft()
+            recent.append(amp)
+            sums[index] = total
+            means.append(total / len(recent))
+        return means
+
+
+class MedianFilter(FrameFilter):
+    """
+    Median of each sensor over a sliding window of the most recent frames,
+    which ignores a glitch lasting less than half the window. Each sensor
+    keeps its window both in arrival order and sorted, so a new amplitude
+    replaces the oldest one without sorting the window again. With an even
+    window the lower median is used so the result is an amplitude that was
+    actually seen.
+    """
+
+
+    def __init__(self, window=3):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        super().__init__()
+
+    def Start(self, frame):
+        self.state = [(deque([amp]), [amp]) for amp in frame]
+
+    def Update(self, frame):
+        window = self.window
+        medians = []
+        for (recent, ordered), amp in zip(self.state, frame):
+            if len(recent) == window:
+                del ordered[bisect_left(ordered, recent.popleft())]
+            recent.append(amp)
+            insort(ordered, amp)
+            medians.append(ordered[(len(ordered) - 1) // 2])
+        return medians
+
+
+class KalmanFilter(FrameFilter):
+    """
+    Scalar Kalman filter of each sensor, treating the light at the sensor as
+    a random walk with variance processVariance per frame, measured with
+    noise of variance measurementVariance. Both are in squared amplitude
+    counts.
+
+    The uncertainty of the estimate doesn't depend on the amplitudes
+    themselves, so with every sensor updated on every frame it is the same
+    for all of them and is kept once for the whole frame.
+    """
+
+
+    def __init__(self, processVariance=1.0, measurementVariance=16.0):
+        if processVariance < 0 or measurementVariance <= 0:
+            raise ValueError("variances must be positive")
+        self.processVariance = processVariance
+        self.measurementVariance = measurementVariance
+        super().__init__()
+
+    def Start(self, frame):
+        self.state = [float(amp) for amp in frame]
+        # The first frame is taken as it is, so the estimate is as
+        # uncertain as a single measurement
+        self.variance = self.measurementVariance
+
+    def Update(self, frame):
+        predicted = self.variance + self.processVariance
+        gain = predicted / (predicted + self.measurementVariance)
+        self.variance = (1 - gain) * predicted
+        self.state = [estimate + gain * (amp - estimate) \
+            for estimate, amp in zip(self.state, frame)]
+        return self.state
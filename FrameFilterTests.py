@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from array import array
+from DirectionFinder import DirectionFinder
+from FrameFilter import ExponentialFilter
+from FrameFilter import FrameFilter
+from FrameFilter import KalmanFilter
+from FrameFilter import MeanFilter
+from FrameFilter import MedianFilter
+
+
+LOCATIONS = [(1, 1), (2, 2), (3, 3), (4, 4)]
+
+
+class FrameFilterTests(unittest.TestCase):
+
+    def testExponential(self):
+        testFilter = ExponentialFilter(alpha=0.5)
+        frames = testFilter.FilterFrames([[0, 10, 20, 30], [10, 10, 10, 10], [10, 10, 10, 10]])
+
+        self.assertEqual(frames, [[0, 10, 20, 30], [5, 10, 15, 20], [8, 10, 12, 15]])
+
+    def testMeanWindow(self):
+        testFilter = MeanFilter(window=2)
+        frames = testFilter.FilterFrames([[0, 10], [10, 10], [20, 10], [21, 10]])
+
+        self.assertEqual(frames, [[0, 10], [5, 10], [15, 10], [20, 10]])
+        self.assertEqual(testFilter.sums, [41, 20])
+
+    def testBaseStartsEmpty(self):
+        class PassThrough(FrameFilter):
+            def Start(self, frame):
+                self.state = frame
+
+        self.assertIsNone(PassThrough().state)
+
+    def testMedianIgnoresGlitch(self):
+        testFilter = MedianFilter(window=3)
+        frames = testFilter.FilterFrames([[1, 9, 1, 1], [1, 9, 1, 1], [1, 1, 1, 30], \
+            [1, 9, 1, 1], [1, 1, 1, 30], [1, 1, 1, 30]])
+
+        self.assertEqual([frame[3] for frame in frames], [1, 1, 1, 1, 30, 30])
+        self.assertEqual(len(testFilter.state[0][0]), 3)
+
+    def testKalmanGainSettles(self):
+        testFilter = KalmanFilter(processVariance=1.0, measurementVariance=16.0)
+        testFilter.FilterFrames([[100, 100]] * 50)
+        # The steady state variance p solves p = (p + q) r / (p + q + r)
+        steady = (-1.0 + (1.0 + 4 * 16.0) ** 0.5) / 2
+        self.assertAlmostEqual(testFilter.variance, steady, 6)
+        self.assertEqual(testFilter.Filter([116, 100]), [100 + round(16 * (steady + 1) \
+            / (steady + 17)), 100])
+
+    def testInvalidFrames(self):
+        testFilter = ExponentialFilter()
+        testFilter.Filter([4, 4, 4, 4])
+        self.assertEqual(testFilter.Filter([1, 'Q', 1, 1]), [1, 'Q', 1, 1])
+        self.assertEqual(testFilter.state, [4, 4, 4, 4])
+
+        filtered = testFilter.Filter(array('H', [8, 8, 8, 8]))
+        self.assertEqual(filtered, array('H', [6, 6, 6, 6]))
+        filtered = testFilter.Filter(memoryview(array('H', [10, 10, 10, 10])))
+        self.assertEqual(filtered, array('H', [8, 8, 8, 8]))
+
+        testFilter.Reset()
+        self.assertEqual(testFilter.Filter([2, 2]), [2, 2])
+
+    def testFewerFlips(self):
+        rng = random.Random(4)
+        frames = [[max(0, round(level + rng.gauss(0, 6))) for level in (40, 46, 52, 58)] \
+            for _ in range(200)]
+        directionFinder = DirectionFinder()
+
+        def flips(frames):
+            directions = directionFinder.FindDirections(frames, LOCATIONS)
+            return sum(1 for before, after in zip(directions, directions[1:]) if before != after)
+
+        raw = flips(frames)
+        for testFilter in [ExponentialFilter(0.2), MedianFilter(5), KalmanFilter()]:
+            self.assertLess(flips(testFilter.FilterFrames(frames)), raw / 2)
+
+    def testBadArguments(self):
+        with self.assertRaises(ValueError):
+            ExponentialFilter(alpha=0)
+        with self.assertRaises(ValueError):
+            MeanFilter(window=0)
+        with self.assertRaises(ValueError):
+            MedianFilter(window=0)
+        with self.assertRaises(ValueError):
+            KalmanFilter(measurementVariance=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+import mmap
+import struct
+import sys
+from array import array
+
+from DirectionFinder import DirectionFinder
+
+
+# File layout, all little endian:
+#
+#   header   magic (8 bytes), version (u16), amplitude typecode (1 byte),
+#            dimensions (u8), sensor count (u32), then dimensions float64
+#            coordinates per sensor, padded with zeros to a multiple of 8 bytes
+#   records  one per frame: timestamp (float64) followed by one amplitude
+#            per sensor, padded with zeros to a multiple of 8 bytes
+#
+# Every record is the same size, so frame i starts at a fixed offset and a
+# partly written record at the end of a log is simply ignored.
+MAGIC = b'NMFRAMES'
+VERSION = 1
+_HEADER = struct.Struct('<8sHcBI')
+_TIMESTAMP = struct.Struct('<d')
+AMPLITUDE_TYPECODES = ('B', 'H', 'I')
+
+
+def _Padded(size):
+    return (size + 7) // 8 * 8
+
+
+class FrameLogWriter:
+    """
+    Writes a log of sensor frames in the fixed record binary format read by
+    FrameLogReader. The sensor geometry is written once in the header and
+    each frame is stored as a timestamp followed by its amplitudes.
+    """
+
+
+    def __init__(self, path, locations, typecode='H'):
+        """
+        Creates a new log at path for sensors at the given 2D or 3D
+        locations. typecode is the unsigned array typecode used to store
+        each amplitude.
+        """
+        if typecode not in AMPLITUDE_TYPECODES:
+            raise ValueError("Unsupported amplitude typecode: " + str(typecode))
+        locations = [tuple(location) for location in locations]
+        dimensions = len(locations[0]) if locations else 2
+        if dimensions not in (2, 3) or any(len(location) != dimensions for location in locations):
+            raise ValueError("Locations must all be 2D or all be 3D")
+
+        self.typecode = typecode
+        self.sensorCount = len(locations)
+        self.recordPadding = bytes(self.RecordSize(typecode, self.sensorCount) \
+            - _TIMESTAMP.size - self.sensorCount * array(typecode).itemsize)
+        self.frameCount = 0
+
+        coordinates = array('d', [value for location in locations for value in location])
+        if sys.byteorder != 'little':
+            coordinates.byteswap()
+        header = _HEADER.pack(MAGIC, VERSION, typecode.encode('ascii'), dimensions, \
+            self.sensorCount) + coordinates.tobytes()
+
+        self.file = open(path, mode='wb')
+        self.file.write(header + bytes(_Padded(len(header)) - len(header)))
+
+    @staticmethod
+    def RecordSize(typecode, sensorCount):
+        """
+        Returns the size in bytes of one frame record
+        """
+        return _Padded(_TIMESTAMP.size + sensorCount * array(typecode).itemsize)
+
+    def WriteFrame(self, timestamp, amplitudes):
+        """
+        Appends a single frame to the log
+        """
+        amplitudes = array(self.typecode, amplitudes)
+        if len(amplitudes) != self.sensorCount:
+            raise ValueError("Expected {} amplitudes but got {}".format( \
+                self.sensorCount, len(amplitudes)))
+        if sys.byteorder != 'little':
+            amplitudes.byteswap()
+        self.file.write(_TIMESTAMP.pack(timestamp))
+        self.file.write(amplitudes)
+        self.file.write(self.recordPadding)
+        self.frameCount += 1
+
+    def WriteFrames(self, timestamps, frames):
+        """
+        Appends a frame for each pair of timestamp and amplitudes
+        """
+        for timestamp, amplitudes in zip(timestamps, frames):
+            self.WriteFrame(timestamp, amplitudes)
+
+    def Close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
+        return False
+
+
+class FrameLogReader:
+    """
+    Reads a log written by FrameLogWriter through a memory map. Amplitudes
+    are returned as memoryviews straight onto the mapped file, so frames are
+    only read from disk as they are used and are never copied. Logs of any
+    size can be replayed through the batch DirectionFinder this way.
+
+    The memoryviews are only valid while the reader is open and must be
+    released before it is closed.
+    """
+
+
+    def __init__(self, path):
+        self.file = open(path, mode='rb')
+        try:
+            self._Open()
+        except Exception:
+            self.file.close()
+            raise
+
+    def _Open(self):
+        header = self.file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Not a frame log: header is truncated")
+        magic, version, typecode, dimensions, sensorCount = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a frame log: bad magic " + repr(magic))
+        if version != VERSION:
+            raise ValueError("Unsupported frame log version: " + str(version))
+        typecode = typecode.decode('ascii')
+        if typecode not in AMPLITUDE_TYPECODES:
+            raise ValueError("Unsupported amplitude typecode: " + typecode)
+
+        coordinates = array('d')
+        coordinates.frombytes(self.file.read(sensorCount * dimensions * 8))
+        if len(coordinates) != sensorCount * dimensions:
+            raise ValueError("Not a frame log: sensor geometry is truncated")
+        if sys.byteorder != 'little':
+            coordinates.byteswap()
+
+        self.typecode = typecode
+        self.sensorCount = sensorCount
+        self.locations = [tuple(coordinates[index:index + dimensions]) \
+            for index in range(0, len(coordinates), dimensions)]
+        self.dataOffset = _Padded(_HEADER.size + len(coordinates) * 8)
+        self.recordSize = FrameLogWriter.RecordSize(typecode, sensorCount)
+        self.amplitudeSize = sensorCount * array(typecode).itemsize
+
+        self.file.seek(0, 2)
+        self.frameCount = max(self.file.tell() - self.dataOffset, 0) // self.recordSize
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+    def __len__(self):
+        return self.frameCount
+
+    def Timestamp(self, index):
+        """
+        Returns the timestamp of a single frame
+        """
+        return _TIMESTAMP.unpack_from(self.map, self._Offset(index))[0]
+
+    def Amplitudes(self, index):
+        """
+        Returns the amplitudes of a single frame as a memoryview
+        """
+        start = self._Offset(index) + _TIMESTAMP.size
+        amplitudes = self.view[start:start + self.amplitudeSize]
+        if sys.byteorder != 'little':
+            # The log is little endian, so big endian machines need a copy
+            swapped = array(self.typecode, amplitudes.tobytes())
+            swapped.byteswap()
+            return memoryview(swapped)
+        return amplitudes.cast(self.typecode)
+
+    def Frame(self, index):
+        """
+        Returns the (timestamp, amplitudes) of a single frame
+        """
+        return self.Timestamp(index), self.Amplitudes(index)
+
+    def _Offset(self, index):
+        if index < 0:
+            index += self.frameCount
+        if not 0 <= index < self.frameCount:
+            raise IndexError("frame index out of range")
+        return self.dataOffset + index * self.recordSize
+
+    def Frames(self, start=0, stop=None):
+        """
+        Yields the (timestamp, amplitudes) of each frame from start up to but
+        not including stop
+        """
+        for index in range(*slice(start, stop).indices(self.frameCount)):
+            yield self.Frame(index)
+
+    def Blocks(self, blockSize=4096, start=0, stop=None):
+        """
+        Yields the frames from start to stop in blocks of up to blockSize
+        frames. Each block is a (timestamps, amplitudes) pair of lists which
+        can be passed straight on to DirectionFinder.FindDirections.
+        """
+        if blockSize < 1:
+            raise ValueError("blockSize must be at least 1")
+        first, last, _ = slice(start, stop).indices(self.frameCount)
+        for blockStart in range(first, last, blockSize):
+            indices = range(blockStart, min(blockStart + blockSize, last))
+            yield [self.Timestamp(index) for index in indices], \
+                [self.Amplitudes(index) for index in indices]
+
+    def Replay(self, directionFinder=None, blockSize=4096, start=0, stop=None):
+        """
+        Yields the (timestamp, direction) found for each frame in the log,
+        finding the directions a block of frames at a time
+        """
+        if directionFinder is None:
+            directionFinder = DirectionFinder()
+        for timestamps, frames in self.Blocks(blockSize, start, stop):
+            # The frames are views of the log, which can't be closed while
+            # any are held, so they are released even if finding fails
+            try:
+                directions = directionFinder.FindDirections(frames, self.locations)
+            finally:
+                for frame in frames:
+                    frame.release()
+            yield from zip(timestamps, directions)
+
+    def Close(self):
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
+        return False
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import unittest
+from DirectionFinder import DirectionFinder
+from FrameLog import FrameLogReader, FrameLogWriter
+
+
+class FailingDirectionFinder(DirectionFinder):
+
+    def FindDirections(self, amplitudes, locations):
+        raise RuntimeError("finder failed")
+
+
+class FrameLogTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'frames.bin')
+        self.locations = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        self.frames = [[10, 20, 30, 40], [5, 5, 5, 5], [900, 1, 2, 3], [0, 65535, 7, 7]]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _WriteLog(self, typecode='H'):
+        with FrameLogWriter(self.path, self.locations, typecode) as writer:
+            writer.WriteFrames([0.5 * index for index in range(len(self.frames))], self.frames)
+
+    def testRoundTrip(self):
+        self._WriteLog()
+        with FrameLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual(reader.locations, self.locations)
+            frames = list(reader.Frames())
+            self.assertEqual([timestamp for timestamp, _ in frames], [0.0, 0.5, 1.0, 1.5])
+            self.assertEqual([list(amplitudes) for _, amplitudes in frames], self.frames)
+            self.assertEqual(list(reader.Amplitudes(-1)), self.frames[-1])
+            del frames
+
+    def testThreeDimensionalGeometry(self):
+        self.locations = [(1.5, 0, 10), (0, 1, 10.25)]
+        self.frames = [[1, 2]]
+        self._WriteLog('B')
+        with FrameLogReader(self.path) as reader:
+            self.assertEqual(reader.locations, self.locations)
+            self.assertEqual(reader.typecode, 'B')
+            self.assertEqual(list(reader.Amplitudes(0)), [1, 2])
+
+    def testReplayMatchesFindDirections(self):
+        self._WriteLog()
+        expected = DirectionFinder().FindDirections(self.frames, self.locations)
+        with FrameLogReader(self.path) as reader:
+            replayed = list(reader.Replay(blockSize=3))
+
+        self.assertEqual([direction for _, direction in replayed], expected)
+        self.assertEqual([timestamp for timestamp, _ in replayed], [0.0, 0.5, 1.0, 1.5])
+
+    def testReplayLeftEarly(self):
+        self._WriteLog()
+        reader = FrameLogReader(self.path)
+        replay = reader.Replay(blockSize=3)
+        for _ in replay:
+            break
+        # The exception is kept, along with the frames in its traceback
+        try:
+            next(reader.Replay(FailingDirectionFinder()))
+        except RuntimeError as error:
+            failure = error
+        reader.Close()
+        self.assertEqual(str(failure), "finder failed")
+
+    def testBlocks(self):
+        self._WriteLog()
+        with FrameLogReader(self.path) as reader:
+            sizes = [len(frames) for _, frames in reader.Blocks(blockSize=3, start=1)]
+        self.assertEqual(sizes, [3])
+
+    def testPartialRecordIgnored(self):
+        self._WriteLog()
+        with open(self.path, mode='ab') as logFile:
+            logFile.write(b'\x01\x02\x03')
+        with FrameLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+
+    def testBadFrames(self):
+        with FrameLogWriter(self.path, self.locations) as writer:
+            with self.assertRaises(ValueError):
+                writer.WriteFrame(0, [1, 2, 3])
+            with self.assertRaises(OverflowError):
+                writer.WriteFrame(0, [1, 2, 3, -4])
+            self.assertEqual(writer.frameCount, 0)
+
+    def testNotAFrameLog(self):
+        with open(self.path, mode='wb') as logFile:
+            logFile.write(b'cart_x,cart_y,move_x,move_y\n')
+        with self.assertRaises(ValueError):
+            FrameLogReader(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import json
+import time
+
+
+class _NullTimer:
+    """
+    Timer used when instrumentation is disabled. It does nothing, and the
+    same instance is reused for every stage.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _StageTimer:
+    """
+    Context manager which records the time spent inside it against a stage
+    """
+
+    def __init__(self, instrumentation, stage):
+        self.instrumentation = instrumentation
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.Record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Collects per-stage timings and named counters from the hot paths of the
+    DirectionFinder and the model. Hooks registered with AddHook are called
+    for every timing and count as it is recorded. Exporters registered with
+    AddExporter are given a snapshot of everything collected whenever Export
+    is called.
+
+    A disabled Instrumentation, such as NULL_INSTRUMENTATION, ignores
+    everything it is given, so instrumented code costs next to nothing when
+    instrumentation isn't wanted.
+    """
+
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.hooks = []
+        self.exporters = []
+        self.Reset()
+
+    def Reset(self):
+        """
+        Discards all collected timings and counts
+        """
+        # Each stage maps to [calls, total seconds, longest call in seconds]
+        self.timers = {}
+        self.counters = {}
+
+    def Timer(self, stage):
+        """
+        Returns a context manager which times the code inside it as stage
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def Record(self, stage, seconds):
+        """
+        Records a single timing for a stage
+        """
+        if not self.enabled:
+            return
+        timer = self.timers.get(stage)
+        if timer is None:
+            self.timers[stage] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+        for hook in self.hooks:
+            hook('timer', stage, seconds)
+
+    def Count(self, name, amount=1):
+        """
+        Adds amount to the named counter
+        """
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook('counter', name, amount)
+
+    def AddHook(self, hook):
+        """
+        Registers hook(kind, name, value) to be called for every timing, with
+        kind 'timer', and every count, with kind 'counter'
+        """
+        self.hooks.append(hook)
+
+    def AddExporter(self, exporter):
+        """
+        Registers exporter(snapshot) to be called by Export
+        """
+        self.exporters.append(exporter)
+
+    def Snapshot(self):
+        """
+        Returns everything collected so far as a dictionary
+        """
+        return {
+            'timers': dict((stage, {'calls': calls, 'total_seconds': total, \
+                'max_seconds': longest}) \
+                for stage, (calls, total, longest) in self.timers.items()),
+            'counters': dict(self.counters),
+        }
+
+    def Export(self):
+        """
+        Passes a snapshot of everything collected to each exporter
+        """
+        snapshot = self.Snapshot()
+        for exporter in self.exporters:
+            exporter(snapshot)
+        return snapshot
+
+
+_NULL_TIMER = _NullTimer()
+
+# Shared disabled instance used by default throughout the project
+NULL_INSTRUMENTATION = Instrumentation(enabled=False)
+
+
+def JsonFileExporter(path):
+    """
+    Creates an exporter which writes each snapshot to a JSON file
+    """
+    def export(snapshot):
+        with open(path, mode='w') as metrics_file:
+            json.dump(snapshot, metrics_file, indent=2, sort_keys=True)
+    return export
+
+
+def PrometheusText(snapshot, prefix='next_move'):
+    """
+    Formats a snapshot in the Prometheus text exposition format
+    """
+    lines = []
+    lines.append('# TYPE {}_stage_calls_total counter'.format(prefix))
+    lines.append('# TYPE {}_stage_seconds_total counter'.format(prefix))
+    lines.append('# TYPE {}_stage_seconds_max gauge'.format(prefix))
+    for stage, timer in sorted(snapshot['timers'].items()):
+        lines.append('{}_stage_calls_total{{stage="{}"}} {}'.format(prefix, stage, timer['calls']))
+        lines.append('{}_stage_seconds_total{{stage="{}"}} {!r}'.format(prefix, stage, \
+            timer['total_seconds']))
+        lines.append('{}_stage_seconds_max{{stage="{}"}} {!r}'.format(prefix, stage, \
+            timer['max_seconds']))
+    for name, value in sorted(snapshot['counters'].items()):
+        lines.append('# TYPE {}_{}_total counter'.format(prefix, name))
+        lines.append('{}_{}_total {}'.format(prefix, name, value))
+    return '\n'.join(lines) + '\n'
+
+
+def PrometheusFileExporter(path, prefix='next_move'):
+    """
+    Creates an exporter which writes each snapshot to a file in the
+    Prometheus text format, standing in for a metrics endpoint
+    """
+    def export(snapshot):
+        with open(path, mode='w') as metrics_file:
+            metrics_file.write(PrometheusText(snapshot, prefix))
+    return export
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from DirectionFinder import DirectionFinder
+from Instrumentation import Instrumentation
+from Instrumentation import JsonFileExporter
+from Instrumentation import NULL_INSTRUMENTATION
+from Instrumentation import PrometheusFileExporter
+from Instrumentation import PrometheusText
+
+
+class InstrumentationTests(unittest.TestCase):
+
+    def testTimer(self):
+        testInstrumentation = Instrumentation()
+        for _ in range(3):
+            with testInstrumentation.Timer('sensing'):
+                pass
+        testInstrumentation.Record('sensing', 5.0)
+
+        timer = testInstrumentation.Snapshot()['timers']['sensing']
+        self.assertEqual(timer['calls'], 4)
+        self.assertGreaterEqual(timer['total_seconds'], 5.0)
+        self.assertEqual(timer['max_seconds'], 5.0)
+
+    def testCounter(self):
+        testInstrumentation = Instrumentation()
+        testInstrumentation.Count('frames')
+        testInstrumentation.Count('frames', 4)
+
+        self.assertEqual(testInstrumentation.Snapshot()['counters'], {'frames': 5})
+
+    def testDisabled(self):
+        hookCalls = []
+        testInstrumentation = Instrumentation(enabled=False)
+        testInstrumentation.AddHook(lambda *event: hookCalls.append(event))
+        with testInstrumentation.Timer('sensing'):
+            pass
+        testInstrumentation.Count('frames')
+
+        self.assertEqual(testInstrumentation.Snapshot(), {'timers': {}, 'counters': {}})
+        self.assertEqual(hookCalls, [])
+
+    def testHooks(self):
+        hookCalls = []
+        testInstrumentation = Instrumentation()
+        testInstrumentation.AddHook(lambda *event: hookCalls.append(event))
+        testInstrumentation.Record('move', 0.5)
+        testInstrumentation.Count('frames', 2)
+
+        self.assertEqual(hookCalls, [('timer', 'move', 0.5), ('counter', 'frames', 2)])
+
+    def testPrometheusText(self):
+        testInstrumentation = Instrumentation()
+        testInstrumentation.Record('move', 0.5)
+        testInstrumentation.Count('frames', 2)
+        text = PrometheusText(testInstrumentation.Snapshot())
+
+        self.assertIn('next_move_stage_calls_total{stage="move"} 1\n', text)
+        self.assertIn('next_move_stage_seconds_total{stage="move"} 0.5\n', text)
+        self.assertIn('next_move_frames_total 2\n', text)
+
+    def testExporters(self):
+        directory = tempfile.mkdtemp()
+        try:
+            jsonPath = os.path.join(directory, 'metrics.json')
+            promPath = os.path.join(directory, 'metrics.prom')
+            testInstrumentation = Instrumentation()
+            testInstrumentation.AddExporter(JsonFileExporter(jsonPath))
+            testInstrumentation.AddExporter(PrometheusFileExporter(promPath))
+            testInstrumentation.Count('frames')
+            snapshot = testInstrumentation.Export()
+
+            with open(jsonPath) as metricsFile:
+                self.assertEqual(json.load(metricsFile), snapshot)
+            with open(promPath) as metricsFile:
+                self.assertEqual(metricsFile.read(), PrometheusText(snapshot))
+        finally:
+            shutil.rmtree(directory)
+
+    def testDirectionFinderCounts(self):
+        testInstrumentation = Instrumentation()
+        testDF = DirectionFinder()
+        testDF.instrumentation = testInstrumentation
+        testDF.FindDirections([[1, 2], [3, 'Q'], [4, 4]], [(1, 1), (2, 2)])
+
+        self.assertEqual(testInstrumentation.Snapshot()['counters'], \
+            {'frames': 3, 'invalid_frames': 1})
+        self.assertIs(DirectionFinder.instrumentation, NULL_INSTRUMENTATION)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import math
+from collections import OrderedDict
+
+from DirectionFinder import DirectionFinder
+from DirectionFinder import peak_index
+
+
+class InterpolatingDirectionFinder(DirectionFinder):
+    """
+    Base class for DirectionFinders which estimate the AOA of light from the
+    amplitudes of several sensors rather than snapping to the location of the
+    brightest one. Subclasses provide the estimate by overriding
+    DirectionFromAmplitudes, which FindDirection and FindDirections both use,
+    so the validity rules and the logging of invalid amplitudes are the same
+    as for DirectionFinder.
+    """
+
+
+class CentroidDirectionFinder(InterpolatingDirectionFinder):
+    """
+    Estimates the AOA as the amplitude weighted centroid of the sensor
+    locations. The smallest amplitude in the frame is subtracted first so that
+    light falling evenly on every sensor doesn't pull the estimate towards the
+    center of the array.
+    """
+
+
+    def DirectionFromAmplitudes(self, amplitudes, locations):
+        baseline = min(amplitudes)
+        weights = [amp - baseline for amp in amplitudes]
+        total_weight = sum(weights)
+
+        return tuple(sum(weight * location[axis] \
+            for weight, location in zip(weights, locations)) / total_weight \
+            for axis in range(len(locations[0])))
+
+
+class QuadraticPeakDirectionFinder(InterpolatingDirectionFinder):
+    """
+    Estimates the AOA by fitting a parabola through the brightest sensor and
+    its two neighbours and placing the estimate at the vertex of the
+    parabola. The sensors are assumed to be listed in order around a ring, as
+    they are on the SensorMount used by the fixture, so the first and last
+    sensors are neighbours.
+
+    The estimate keeps the distance from the origin (and the height, for 3D
+    locations) of the brightest sensor and only interpolates its bearing.
+    """
+
+
+    def DirectionFromAmplitudes(self, amplitudes, locations):
+        count = len(amplitudes)
+        peak = peak_index(amplitudes)
+        peak_location = locations[peak]
+        if count < 3:
+            return peak_location
+
+        before = amplitudes[peak - 1]
+        after = amplitudes[(peak + 1) % count]
+        curvature = before - 2 * amplitudes[peak] + after
+        if curvature == 0:
+            return peak_location
+
+        # Vertex of the parabola through the three samples, measured in
+        # sensor spacings from the peak. It is within half a spacing because
+        # the middle sample is the largest.
+        offset = 0.5 * (before - after) / curvature
+        if offset > 0:
+            neighbour_location = locations[(peak + 1) % count]
+        else:
+            neighbour_location = locations[peak - 1]
+
+        peak_bearing = math.atan2(peak_location[1], peak_location[0])
+        neighbour_bearing = math.atan2(neighbour_location[1], neighbour_location[0])
+        # Take the short way around between the two bearings
+        spacing = math.remainder(neighbour_bearing - peak_bearing, 2 * math.pi)
+        bearing = peak_bearing + abs(offset) * spacing
+
+        radius = math.hypot(peak_location[0], peak_location[1])
+        return (radius * math.cos(bearing), radius * math.sin(bearing)) \
+            + tuple(peak_location[2:])
+
+
+class GradientDirectionFinder(InterpolatingDirectionFinder):
+    """
+    Estimates the AOA from the gradient of the light across every sensor. A
+    plane a + gx * x + gy * y is fitted to the amplitudes by least squares
+    and the estimate points along (gx, gy), at the mean distance of the
+    sensors from the origin (and their mean height, for 3D locations).
+
+    With logIntensity set the plane is fitted to the logarithm of the
+    amplitudes instead. Light falls off with the square of the distance from
+    its source, so the log of the intensity changes more evenly across the
+    sensors than the intensity itself.
+
+    The fit only depends on the amplitudes through a fixed linear map for a
+    given sensor geometry. That map, the pseudo-inverse of the fit, is
+    worked out once per geometry and kept for the most recent
+    geometryCacheSize geometries, leaving two dot products per frame. The
+    same locations are recognised by identity first, so a list of locations
+    must not be changed in place once it has been used. Locations which
+    provide precompute(key, function), such as a SensorLayout, keep the map
+    themselves instead.
+    Sensors which all lie on a line can't be fitted and fall back to the
+    location of the brightest sensor.
+    """
+
+
+    def __init__(self, logIntensity=False, geometryCacheSize=64):
+        self.logIntensity = logIntensity
+        self.geometryCacheSize = geometryCacheSize
+        self.fits = OrderedDict()
+        self.lastLocations = None
+        self.lastFit = None
+
+    def DirectionFromAmplitudes(self, amplitudes, locations):
+        fit = self._Fit(locations)
+        if fit is None:
+            return super().DirectionFromAmplitudes(amplitudes, locations)
+
+        rowX, rowY, radius, height = fit
+        if self.logIntensity:
+            # Zero amplitudes are floored at one count to keep the log finite
+            amplitudes = [math.log(amp if amp > 1 else 1) for amp in amplitudes]
+        gradientX = sum([weight * amp for weight, amp in zip(rowX, amplitudes)])
+        gradientY = sum([weight * amp for weight, amp in zip(rowY, amplitudes)])
+
+        magnitude = math.hypot(gradientX, gradientY)
+        if magnitude == 0:
+            return (0, 0)
+        return (radius * gradientX / magnitude, radius * gradientY / magnitude) + height
+
+    def _Fit(self, locations):
+        # FindDirections passes the same locations for every frame, so the
+        # last fit is checked first without hashing the locations
+        if locations is self.lastLocations:
+            return self.lastFit
+
+        # Precompiled sensor layouts keep the fit themselves, so every finder
+        # using the layout shares it
+        if hasattr(locations, 'precompute'):
+            fit = locations.precompute('GradientDirectionFinder', self._Pseudoinverse)
+            self.lastLocations = locations
+            self.lastFit = fit
+            return fit
+
+        key = tuple(locations)
+        fit = self.fits.get(key, False)
+        if fit is not False:
+            self.fits.move_to_end(key)
+        else:
+            fit = self._Pseudoinverse(locations)
+            self.fits[key] = fit
+            if len(self.fits) > self.geometryCacheSize:
+                self.fits.popitem(last=False)
+
+        self.lastLocations = locations
+        self.lastFit = fit
+        return fit
+
+    @staticmethod
+    def _Pseudoinverse(locations):
+        """
+        Returns the rows of the pseudo-inverse which give gx and gy, along
+        with the mean radius and height of the sensors, or None when the
+        sensors don't span a plane
+        """
+        count = len(locations)
+        meanX = sum(location[0] for location in locations) / count
+        meanY = sum(location[1] for location in locations) / count
+        # With the positions centred the offset a drops out of the fit,
+        # leaving a 2 x 2 system for the gradient
+        xs = [location[0] - meanX for location in locations]
+        ys = [location[1] - meanY for location in locations]
+        sxx = sum(x * x for x in xs)
+        syy = sum(y * y for y in ys)
+        sxy = sum(x * y for x, y in zip(xs, ys))
+        determinant = sxx * syy - sxy * sxy
+        if determinant <= 1e-9 * (sxx * syy or 1):
+            return None
+
+        rowX = [(syy * x - sxy * y) / determinant for x, y in zip(xs, ys)]
+        rowY = [(sxx * y - sxy * x) / determinant for x, y in zip(xs, ys)]
+        radius = sum(math.hypot(location[0], location[1]) for location in locations) / count
+        height = ()
+        if len(locations[0]) > 2:
+            height = (sum(location[2] for location in locations) / count,)
+        return rowX, rowY, radius, height
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+import math
+import unittest
+from array import array
+from InterpolatingDirectionFinder import CentroidDirectionFinder
+from InterpolatingDirectionFinder import GradientDirectionFinder
+from InterpolatingDirectionFinder import QuadraticPeakDirectionFinder
+
+
+RING = [(0, 30), (21.213203436, 21.213203436), (30, 0), (21.213203436, -21.213203436), \
+    (0, -30), (-21.213203436, -21.213203436), (-30, 0), (-21.213203436, 21.213203436)]
+
+
+def buildSensorData(amplitudes, locations=RING):
+    return [{'amp': amp, 'location': location} \
+        for amp, location in zip(amplitudes, locations)]
+
+
+class CentroidDirectionFinderTests(unittest.TestCase):
+
+    def testAllSensorsIdentical(self):
+        testDF = CentroidDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128] * 8))
+
+        self.assertEqual(direction, (0, 0))
+
+    def testOneInvalidAmplitude(self):
+        testDF = CentroidDirectionFinder()
+        with self.assertLogs('DirectionFinder', level='ERROR'):
+            direction = testDF.FindDirection(buildSensorData([128, 128, 'Q', 128, 128, 128, 128, 128]))
+
+        self.assertEqual(direction, ())
+
+    def testSingleMax(self):
+        testDF = CentroidDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128, 128, 256, 128, 128, 128, 128, 128]))
+
+        self.assertAlmostEqual(direction[0], 30, 6)
+        self.assertAlmostEqual(direction[1], 0, 6)
+
+    def testBetweenTwoSensors(self):
+        testDF = CentroidDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128, 128, 256, 256, 128, 128, 128, 128]))
+
+        self.assertAlmostEqual(math.degrees(math.atan2(direction[1], direction[0])), -22.5, 6)
+
+    def testBatchMatchesSingleFrame(self):
+        testDF = CentroidDirectionFinder()
+        frames = [[1, 2, 3, 4, 5, 6, 7, 8], [9, 9, 9, 9, 9, 9, 9, 9], [3, 0, 0, 0, 0, 0, 1, 2]]
+        expected = [testDF.FindDirection(buildSensorData(frame)) for frame in frames]
+
+        self.assertEqual(testDF.FindDirections(frames, RING), expected)
+
+        views = [memoryview(array('H', frame)) for frame in frames]
+        self.assertEqual(testDF.FindDirections(views, RING), expected)
+
+
+class QuadraticPeakDirectionFinderTests(unittest.TestCase):
+
+    def testAllSensorsIdentical(self):
+        testDF = QuadraticPeakDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128] * 8))
+
+        self.assertEqual(direction, (0, 0))
+
+    def testSymmetricPeak(self):
+        testDF = QuadraticPeakDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128, 192, 256, 192, 128, 128, 128, 128]))
+
+        self.assertAlmostEqual(direction[0], 30, 6)
+        self.assertAlmostEqual(direction[1], 0, 6)
+
+    def testEqualNeighbours(self):
+        testDF = QuadraticPeakDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128, 128, 256, 256, 128, 128, 128, 128]))
+
+        self.assertAlmostEqual(math.degrees(math.atan2(direction[1], direction[0])), -22.5, 6)
+        self.assertAlmostEqual(math.hypot(direction[0], direction[1]), 30, 6)
+
+    def testPeakWrapsAroundRing(self):
+        testDF = QuadraticPeakDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([256, 128, 128, 128, 128, 128, 128, 200]))
+
+        bearing = math.degrees(math.atan2(direction[1], direction[0]))
+        self.assertGreater(bearing, 90)
+        self.assertLess(bearing, 112.5)
+
+    def testKeepsHeight(self):
+        locations = [location + (10,) for location in RING]
+        testDF = QuadraticPeakDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128, 192, 256, 128, 128, 128, 128, 128], locations))
+
+        self.assertEqual(len(direction), 3)
+        self.assertEqual(direction[2], 10)
+
+    def testMemoryviewFrame(self):
+        testDF = QuadraticPeakDirectionFinder()
+        frame = [128, 192, 256, 256, 128, 128, 128, 128]
+        expected = testDF.FindDirection(buildSensorData(frame))
+
+        self.assertEqual(testDF.FindDirections([memoryview(array('H', frame))], RING), [expected])
+
+
+def rampAmplitudes(bearing, locations=RING, base=512, slope=4):
+    # Amplitudes rising linearly across the ring towards bearing (degrees)
+    gradient = (math.cos(math.radians(bearing)), math.sin(math.radians(bearing)))
+    return [int(round(base + slope * (gradient[0] * x + gradient[1] * y))) \
+        for x, y in [location[:2] for location in locations]]
+
+
+class GradientDirectionFinderTests(unittest.TestCase):
+
+    def testAllSensorsIdentical(self):
+        testDF = GradientDirectionFinder()
+        direction = testDF.FindDirection(buildSensorData([128] * 8))
+
+        self.assertEqual(direction, (0, 0))
+
+    def testOneInvalidAmplitude(self):
+        testDF = GradientDirectionFinder()
+        with self.assertLogs('DirectionFinder', level='ERROR'):
+            direction = testDF.FindDirection(buildSensorData([128, 128, 'Q', 128, 128, 128, 128, 128]))
+
+        self.assertEqual(direction, ())
+
+    def testContinuousBearing(self):
+        testDF = GradientDirectionFinder()
+        for bearing in (0, 10, 100, -137):
+            direction = testDF.FindDirection(buildSensorData(rampAmplitudes(bearing)))
+
+            self.assertAlmostEqual(math.degrees(math.atan2(direction[1], direction[0])), \
+                bearing, 0)
+            self.assertAlmostEqual(math.hypot(direction[0], direction[1]), 30, 6)
+
+    def testLogIntensity(self):
+        # Inverse-square light from a source off to the north east
+        source = (300, 300, 200)
+        locations = [location + (10,) for location in RING]
+        amplitudes = [int(1e7 / ((source[0] - x) ** 2 + (source[1] - y) ** 2 + (source[2] - z) ** 2)) \
+            for x, y, z in locations]
+        testDF = GradientDirectionFinder(logIntensity=True)
+        direction = testDF.FindDirection(buildSensorData(amplitudes, locations))
+
+        self.assertAlmostEqual(math.degrees(math.atan2(direction[1], direction[0])), 45, 0)
+        self.assertEqual(direction[2], 10)
+
+    def testPseudoinverseReused(self):
+        testDF = GradientDirectionFinder(geometryCacheSize=2)
+        frames = [rampAmplitudes(bearing) for bearing in range(0, 360, 30)]
+        testDF.FindDirections(frames, RING)
+        self.assertEqual(len(testDF.fits), 1)
+
+        testDF.FindDirections(frames, RING[1:])
+        testDF.FindDirections(frames, RING[2:])
+        self.assertEqual(len(testDF.fits), 2)
+
+    def testCollinearSensors(self):
+        testDF = GradientDirectionFinder()
+        locations = [(0, 0), (10, 0), (20, 0)]
+        direction = testDF.FindDirection(buildSensorData([1, 9, 4], locations))
+
+        self.assertEqual(direction, (10, 0))
+
+if __name__ == "__main__":
+    unittest.main()
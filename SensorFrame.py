@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import math
+import operator
+from array import array
+from collections import namedtuple
+
+
+# A single reason a frame was rejected, naming the sensor it came from
+FrameProblem = namedtuple('FrameProblem', ['sensor', 'value', 'reason'])
+
+# Unsigned typecodes from smallest to largest, used to pick the narrowest
+# type which holds every amplitude in a frame's range
+_TYPECODES = ('B', 'H', 'I', 'L', 'Q')
+
+
+class InvalidFrameError(ValueError):
+    """
+    Raised when a SensorFrame is built from amplitudes which are not valid.
+    problems holds a FrameProblem for every rejected amplitude.
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("Invalid amplitude ({}) from sensor {}: {}".format( \
+            problems[0].value, problems[0].sensor, problems[0].reason) \
+            + ("" if len(problems) == 1 else " and {} more".format(len(problems) - 1)))
+
+
+class SensorFrame(array):
+    """
+    A frame of amplitudes, one per sensor, which has been validated once when
+    it was built. The amplitudes are stored as an unsigned array type wide
+    enough for the declared (low, high) range, so DirectionFinder.FindDirections
+    trusts them without checking each amplitude again.
+
+    Amplitudes may be ints, integer scalars from other libraries or floats
+    with an integral value. Anything else, including NaN, bools and values
+    outside of the range, is rejected with an InvalidFrameError. As with any
+    array, the range is only checked when the frame is built.
+    """
+
+    def __new__(cls, amplitudes, amplitudeRange=(0, 1023)):
+        low, high = amplitudeRange
+        if not 0 <= low <= high:
+            raise ValueError("Invalid amplitude range: " + str(amplitudeRange))
+        typecode = cls.TypecodeFor(high)
+
+        # Amplitudes which are already unsigned or are all plain ints are
+        # converted in one step, anything else is checked one at a time
+        if isinstance(amplitudes, array) and amplitudes.typecode in _TYPECODES:
+            values = amplitudes
+        else:
+            amplitudes = list(amplitudes)
+            if set(map(type, amplitudes)) <= {int}:
+                values = amplitudes
+            else:
+                values = cls._Convert(amplitudes)
+
+        if values and (None in values or min(values) < low or max(values) > high):
+            raise InvalidFrameError(cls._Problems(amplitudes, values, low, high))
+
+        frame = super().__new__(cls, typecode, values)
+        frame.amplitudeRange = (low, high)
+        return frame
+
+    @staticmethod
+    def TypecodeFor(high):
+        """
+        Returns the narrowest unsigned typecode able to hold amplitudes up to
+        high
+        """
+        for typecode in _TYPECODES:
+            if high < 1 << (8 * array(typecode).itemsize):
+                return typecode
+        raise OverflowError("Amplitude range too large: " + str(high))
+
+    @staticmethod
+    def _Convert(amplitudes):
+        # Convert each amplitude to an int, or None when it can't be
+        values = []
+        for amp in amplitudes:
+            if isinstance(amp, bool):
+                values.append(None)
+            elif isinstance(amp, float):
+                values.append(int(amp) if amp.is_integer() else None)
+            else:
+                try:
+                    values.append(operator.index(amp))
+                except TypeError:
+                    values.append(None)
+        return values
+
+    @staticmethod
+    def _Problems(amplitudes, values, low, high):
+        problems = []
+        for sensor, (amp, value) in enumerate(zip(amplitudes, values)):
+            if value is None:
+                if isinstance(amp, float) and not math.isnan(amp):
+                    reason = "not a whole number"
+                else:
+                    reason = "not a number"
+            elif not low <= value <= high:
+                reason = "outside of the range ({}, {})".format(low, high)
+            else:
+                continue
+            problems.append(FrameProblem(sensor, amp, reason))
+        return problems
+
+    @classmethod
+    def Problems(cls, amplitudes, amplitudeRange=(0, 1023)):
+        """
+        Returns a FrameProblem for every invalid amplitude, or an empty list
+        when a SensorFrame could be built from them
+        """
+        try:
+            cls(amplitudes, amplitudeRange)
+        except InvalidFrameError as error:
+            return error.problems
+        return []
+
+    def __reduce__(self):
+        return (self.__class__, (list(self), self.amplitudeRange))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import pickle
+import unittest
+from array import array
+from DirectionFinder import DirectionFinder
+from SensorFrame import InvalidFrameError, SensorFrame
+
+
+class IndexLike:
+    """Stands in for an integer scalar from another library"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __index__(self):
+        return self.value
+
+
+class SensorFrameTests(unittest.TestCase):
+
+    def testValidAmplitudes(self):
+        frame = SensorFrame([0, 7, 3.0, IndexLike(1023)])
+
+        self.assertEqual(list(frame), [0, 7, 3, 1023])
+        self.assertEqual(frame.typecode, 'H')
+        self.assertEqual(frame.amplitudeRange, (0, 1023))
+
+    def testTypecodeFollowsRange(self):
+        self.assertEqual(SensorFrame([1, 2], (0, 255)).typecode, 'B')
+        self.assertEqual(SensorFrame([1, 2], (0, 65535)).typecode, 'H')
+        self.assertEqual(SensorFrame([1, 2], (0, 70000)).typecode, 'I')
+
+    def testFromUnsignedArray(self):
+        frame = SensorFrame(array('H', [4, 5, 6]), (0, 10))
+        self.assertEqual(list(frame), [4, 5, 6])
+        with self.assertRaises(InvalidFrameError):
+            SensorFrame(array('H', [4, 50, 6]), (0, 10))
+
+    def testInvalidAmplitudes(self):
+        with self.assertRaises(InvalidFrameError) as context:
+            SensorFrame([1, float('nan'), 'Q', True, -1, 2.5, 2000])
+        problems = context.exception.problems
+
+        self.assertEqual([problem.sensor for problem in problems], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(problems[1].value, 'Q')
+        self.assertEqual(problems[4].reason, "not a whole number")
+        self.assertEqual(problems[5].reason, "outside of the range (0, 1023)")
+
+    def testProblems(self):
+        self.assertEqual(SensorFrame.Problems([1, 2, 3]), [])
+        self.assertEqual(len(SensorFrame.Problems([1, 2, -3])), 1)
+
+    def testInvalidRange(self):
+        with self.assertRaises(ValueError):
+            SensorFrame([1], (-5, 10))
+
+    def testFindDirections(self):
+        locations = [(1, 1), (2, 2), (3, 3)]
+        frames = [SensorFrame([1, 5, 2]), SensorFrame([4, 4, 4]), SensorFrame([9.0, 1, 1])]
+        testDF = DirectionFinder()
+
+        self.assertEqual(testDF.FindDirections(frames, locations), [(2, 2), (0, 0), (1, 1)])
+
+    def testPickle(self):
+        frame = SensorFrame([1, 2, 3], (0, 255))
+        copy = pickle.loads(pickle.dumps(frame))
+
+        self.assertEqual(copy, frame)
+        self.assertEqual(copy.amplitudeRange, (0, 255))
+
+if __name__ == "__main__":
+    unittest.main()
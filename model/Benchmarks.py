@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the DirectionFinder and the model. Each benchmark times
+one operation at a range of sizes and the results are written out as JSON so
+that they can be compared against a stored baseline from an earlier run.
+
+Run from this directory:
+    python Benchmarks.py --output results.json --baseline baseline.json
+
+A benchmark regresses when its time per call grows by more than the
+tolerance relative to the baseline, in which case the script exits with a
+non-zero status.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+from FleetSimulation import FleetSimulation
+from LightField import LightField
+from LightScene import LightScene
+from LightSensor import LightSensor
+from LightSource import LightSource
+from SensorMount import SensorMount
+
+import DirectionFinderFixture
+
+sys.path.append("..")
+from DirectionFinder import DirectionFinder
+
+SENSOR_COUNTS = (8, 64, 512, 10000)
+MOUNT_SIZES = (8, 100, 1000, 10000)
+POINT_CLOUD_SIZES = (100, 10000)
+FLEET_SIZES = (10, 1000)
+SCENE_SIZES = (100, 5000)
+QUICK_SIZES = 2
+
+def time_call(function, min_time=0.2, repeat=3):
+    """
+    Time a call to function. The number of calls per measurement is grown
+    until a measurement takes at least min_time seconds and the best of
+    repeat measurements is reported as seconds per call.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+
+    return best / number
+
+def _ring(count, radius=30):
+    return [(radius * math.cos(2 * math.pi * index / count), \
+        radius * math.sin(2 * math.pi * index / count), 10) for index in range(count)]
+
+def bench_find_direction(sizes, min_time):
+    """
+    Time FindDirection on a single frame and FindDirections on a block of
+    frames for each sensor count
+    """
+    rng = random.Random(0)
+    direction_finder = DirectionFinder()
+    results = {}
+    for count in sizes:
+        locations = _ring(count)
+        frames = [[rng.randint(0, 1023) for _ in range(count)] for _ in range(16)]
+        sensor_data = [{'amp': amp, 'location': location} \
+            for amp, location in zip(frames[0], locations)]
+
+        seconds = time_call(lambda: direction_finder.FindDirection(sensor_data), min_time)
+        results['FindDirection[{}]'.format(count)] = _result(seconds, 1)
+
+        seconds = time_call(lambda: direction_finder.FindDirections(frames, locations), min_time)
+        results['FindDirections[{}x{}]'.format(len(frames), count)] = \
+            _result(seconds, len(frames))
+    return results
+
+def bench_mount_move(sizes, min_time):
+    """
+    Time moving a SensorMount carrying each number of sensors, both on its
+    own and followed by reading back every sensor position
+    """
+    results = {}
+    for count in sizes:
+        mount = SensorMount()
+        for location in _ring(count):
+            mount.add_new_sensor(LightSensor(location, (0, 304), (0, 1023)))
+        seconds = time_call(lambda: mount.move_to_position((1, 1, 0), 5), min_time)
+        results['SensorMount.move_to_position[{}]'.format(count)] = _result(seconds, count)
+
+        def move_and_read():
+            mount.move_to_position((1, 1, 0), 5)
+            mount.sensor_positions()
+
+        seconds = time_call(move_and_read, min_time)
+        results['SensorMount.move_and_read[{}]'.format(count)] = _result(seconds, count)
+    return results
+
+def bench_light_source(sizes, min_time):
+    """
+    Time evaluating a LightSource one point at a time and a LightField over
+    the whole point cloud for each point cloud size
+    """
+    rng = random.Random(0)
+    source = LightSource((0, 0, 304), 500)
+    field = LightField([source])
+    results = {}
+    for count in sizes:
+        points = [(rng.uniform(-500, 500), rng.uniform(-500, 500), 10) \
+            for _ in range(count)]
+
+        def evaluate_points():
+            for point in points:
+                source.get_intensity_at_location(point)
+
+        seconds = time_call(evaluate_points, min_time)
+        results['LightSource.get_intensity_at_location[{}]'.format(count)] = \
+            _result(seconds, count)
+
+        seconds = time_call(lambda: field.get_intensity_at_locations(points), min_time)
+        results['LightField.get_intensity_at_locations[{}]'.format(count)] = \
+            _result(seconds, count)
+    return results
+
+def bench_light_scene(sizes, min_time):
+    """
+    Time evaluating a warehouse of each number of sources over a fixed set of
+    points, both exactly with a LightField and through a LightScene
+    """
+    rng = random.Random(0)
+    points = [(rng.uniform(0, 5000), rng.uniform(0, 5000), 10) for _ in range(100)]
+    results = {}
+    for count in sizes:
+        sources = [LightSource((rng.uniform(0, 5000), rng.uniform(0, 5000), 600), 500) \
+            for _ in range(count)]
+        field = LightField(sources)
+        scene = LightScene(sources)
+        scene.build_index()
+
+        seconds = time_call(lambda: field.get_intensity_at_locations(points), min_time)
+        results['LightField.get_intensity_at_locations[{}x{}]'.format(count, len(points))] = \
+            _result(seconds, len(points))
+
+        seconds = time_call(lambda: scene.get_intensity_at_locations(points), min_time)
+        results['LightScene.get_intensity_at_locations[{}x{}]'.format(count, len(points))] = \
+            _result(seconds, len(points))
+    return results
+
+def bench_run_model(min_time):
+    """
+    Time a full run of the default model without any output and report the
+    number of loop iterations completed per second
+    """
+    iterations = []
+
+    def run():
+        result = DirectionFinderFixture.run_model(results_file=None, \
+            verbosity=DirectionFinderFixture.QUIET)
+        iterations.append(result.iterations)
+
+    seconds = time_call(run, min_time)
+    return {'run_model': _result(seconds, iterations[0])}
+
+def bench_fleet(sizes, min_time):
+    """
+    Time a full run of a FleetSimulation for each number of carts and report
+    the number of cart steps completed per second
+    """
+    rng = random.Random(0)
+    sources = DirectionFinderFixture.default_sources()
+    results = {}
+    for count in sizes:
+        start_locations = [(rng.uniform(-100, 100), rng.uniform(-100, 100), 0) \
+            for _ in range(count)]
+        cart_steps = []
+
+        def run():
+            fleet = FleetSimulation(start_locations, sources, _ring(8), \
+                sensor_input_range=DirectionFinderFixture.COMPARISON_SENSOR_INPUT_RANGE)
+            fleet.run()
+            cart_steps.append(fleet.cart_steps)
+
+        seconds = time_call(run, min_time)
+        results['FleetSimulation.run[{}]'.format(count)] = _result(seconds, cart_steps[0])
+    return results
+
+def _result(seconds, items):
+    return {
+        'seconds_per_call': seconds,
+        'calls_per_second': 1 / seconds,
+        'items_per_second': items / seconds,
+    }
+
+def run_benchmarks(quick=False, min_time=0.2):
+    """
+    Run every benchmark and return the results along with a description of
+    the machine they were run on. A quick run only covers the smaller sizes.
+    """
+    def sizes(all_sizes):
+        return all_sizes[:QUICK_SIZES] if quick else all_sizes
+
+    benchmarks = {}
+    benchmarks.update(bench_find_direction(sizes(SENSOR_COUNTS), min_time))
+    benchmarks.update(bench_mount_move(sizes(MOUNT_SIZES), min_time))
+    benchmarks.update(bench_light_source(sizes(POINT_CLOUD_SIZES), min_time))
+    benchmarks.update(bench_light_scene(sizes(SCENE_SIZES), min_time))
+    benchmarks.update(bench_run_model(min_time))
+    benchmarks.update(bench_fleet(sizes(FLEET_SIZES), min_time))
+
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'benchmarks': benchmarks,
+    }
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """
+    Compare results against a baseline and return a list of
+    (name, baseline seconds, current seconds, change) for every benchmark
+    whose time per call grew by more than the tolerance fraction. Benchmarks
+    missing from either set are ignored.
+    """
+    regressions = []
+    for name, current in sorted(results['benchmarks'].items()):
+        previous = baseline['benchmarks'].get(name)
+        if previous is None:
+            continue
+        change = current['seconds_per_call'] / previous['seconds_per_call'] - 1
+        if change > tolerance:
+            regressions.append((name, previous['seconds_per_call'], \
+                current['seconds_per_call'], change))
+    return regressions
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='file to write the JSON results to')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, \
+        help='allowed fractional slow down before reporting a regression')
+    parser.add_argument('--min-time', type=float, default=0.2, \
+        help='minimum seconds spent on each measurement')
+    parser.add_argument('--quick', action='store_true', help='only run the smaller sizes')
+    options = parser.parse_args(arguments)
+
+    results = run_benchmarks(options.quick, options.min_time)
+    for name, result in sorted(results['benchmarks'].items()):
+        print("{:<50} {:>14.3f} us/call".format(name, result['seconds_per_call'] * 1e6))
+
+    if options.output:
+        with open(options.output, mode='w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(results, baseline, options.tolerance)
+        for name, previous, current, change in regressions:
+            print("REGRESSION {}: {:.3f} us -> {:.3f} us ({:+.0%})".format( \
+                name, previous * 1e6, current * 1e6, change))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
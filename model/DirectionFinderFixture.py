@@ -4,129 +4,463 @@ Software fixture for the DirectionFinder object to evaluate how effective its
 strategy is at moving to the area of the highest light
 """
 
-import csv
+import logging
 import math
+from collections import namedtuple
 
+from LightField import LightField
 from LightSource import LightSource
-from LightSensor import LightSensor
+from LightSensor import SensorQuantizer
+from MotionController import LineSearchController
+from MotionController import MotionController
+from MotionController import ProportionalStepController
+from MotionController import STEP_SIZE
+from MotionController import StepHalvingController
+from ResultsSink import CsvResultsSink
+from SensorLayout import DEFAULT_INPUT_RANGE
+from SensorLayout import DEFAULT_OUTPUT_RANGE
+from SensorLayout import SensorLayout
+from SensorLayout import compile_layout
 from SensorMount import SensorMount
+from SensorNoise import NoisyQuantizer
+from Trajectory import Trajectory
 
 import sys
 sys.path.append("..")
 from DirectionFinder import DirectionFinder
+from Instrumentation import NULL_INSTRUMENTATION
+from InterpolatingDirectionFinder import CentroidDirectionFinder
+from InterpolatingDirectionFinder import GradientDirectionFinder
+from InterpolatingDirectionFinder import QuadraticPeakDirectionFinder
 
-def run_model():
-    # Put a light-bulb 10 feet high in the center of the room
-    light_source_location = (0, 0, 304)
-    light_source_intensity_lux = 500
-    source = LightSource(light_source_location, light_source_intensity_lux)
+logger = logging.getLogger(__name__)
 
-    # Initialize Sensors centered around the center of the room in the pattern
-    # we want our array to use
-    sensor_array = []
-    sensor_input_range = (0, 304)
-    sensor_output_range = (0, 1023)
-    sensor_array.append(LightSensor((0, 30, 10),  \
-        sensor_input_range, sensor_output_range))
+RESULTS_FILE = 'DirectionFinderResults.csv'
 
-    sensor_array.append(LightSensor((30 * math.sqrt(2)/2, \
-        30 * math.sqrt(2)/2, 10),  sensor_input_range, \
-        sensor_output_range))
+# Sensor input range used when comparing strategies, chosen to cover the
+# light falling on the sensors in the default scenario
+COMPARISON_SENSOR_INPUT_RANGE = (0, 10)
 
-    sensor_array.append(LightSensor((30, 0, 10), \
-        sensor_input_range, sensor_output_range))
+# Levels of logging done by run_model. QUIET logs nothing, SUMMARY logs how
+# each run finished and PROGRESS also logs every iteration.
+QUIET = 0
+SUMMARY = 1
+PROGRESS = 2
 
-    sensor_array.append(LightSensor((30 * math.sqrt(2)/2, \
-        -30 * math.sqrt(2)/2, 10), \
-         sensor_input_range, sensor_output_range))
+# Summary of a single run of the model. converged_iteration is the first
+# iteration that ended within the tolerance of the target, or None if the
+# cart never got that close.
+ModelResult = namedtuple('ModelResult', ['iterations', 'converged_iteration', \
+    'initial_error', 'final_error', 'sensor_reads'])
 
-    sensor_array.append(LightSensor((0, -30, 10), \
-        sensor_input_range, sensor_output_range))
+# Collaborators plugged into a single run of the model, any of which can be
+# left as None. The motion_controller decides how far each move goes, the
+# frame_filter smooths the sensor outputs, the sensor_noise is applied to
+# them, the instrumentation times the stages of each iteration and the
+# trajectory records each iteration. With batch set the directions are found
+# with FindDirections rather than FindDirection.
+RunOptions = namedtuple('RunOptions', ['motion_controller', 'frame_filter', \
+    'sensor_noise', 'instrumentation', 'trajectory', 'batch'], \
+    defaults=(None,) * 5 + (False,))
 
-    sensor_array.append(LightSensor((-30 * math.sqrt(2)/2, \
-        -30 * math.sqrt(2)/2, 10), \
-        sensor_input_range, sensor_output_range))
+def default_layout(sensor_input_range=DEFAULT_INPUT_RANGE, \
+    sensor_output_range=DEFAULT_OUTPUT_RANGE):
+    """
+    The ring of eight sensors centered around the center of the mount in the
+    pattern we want our array to use
+    """
+    return compile_layout(input_range=sensor_input_range, output_range=sensor_output_range)
 
-    sensor_array.append(LightSensor((-30, 0, 10), \
-        sensor_input_range, sensor_output_range))
+def default_sensors(sensor_input_range=DEFAULT_INPUT_RANGE, \
+    sensor_output_range=DEFAULT_OUTPUT_RANGE):
+    """
+    Create the eight sensors of the default layout
+    """
+    return default_layout(sensor_input_range, sensor_output_range).sensors()
 
-    sensor_array.append(LightSensor((-30 * math.sqrt(2)/2, \
-        30 * math.sqrt(2)/2, 10), \
-        sensor_input_range, sensor_output_range))
+def default_sources():
+    """
+    Put a light-bulb 10 feet high in the center of the room
+    """
+    light_source_location = (0, 0, 304)
+    light_source_intensity_lux = 500
+    return [LightSource(light_source_location, light_source_intensity_lux)]
 
-    # Initialize our sensor mount and attach all our sensors
-    cart = SensorMount()
-    for sensor in sensor_array:
-        cart.add_new_sensor(sensor)
+def mount_sensors(sensors, start_location, start_rotation, sensor_noise=None):
+    """
+    Attach the sensors, either LightSensors or a compiled SensorLayout, to a
+    new SensorMount at the starting pose. Returns the mount along with the
+    quantizer for its sensors, adding the sensor_noise if one is given.
+    """
+    # A compiled SensorLayout brings its sensors and quantizer along ready
+    # made
+    if isinstance(sensors, SensorLayout):
+        cart = SensorMount.from_layout(sensors)
+        quantizer = sensors.quantizer()
+    else:
+        cart = SensorMount()
+        for sensor in sensors:
+            cart.add_new_sensor(sensor)
+        quantizer = SensorQuantizer.from_sensors(sensors)
+    if sensor_noise is not None:
+        quantizer = NoisyQuantizer(quantizer, sensor_noise)
 
     # Move the mount to somewhere away from just below the light
-    cart.move_to_position((60, 0, 0), 0)
+    cart.move_to_position(start_location, start_rotation)
+    return cart, quantizer
 
+def rotation_towards(cart, next_move):
+    """
+    Work out the rotation, in the units used by SensorMount, which turns the
+    cart to face along next_move
+    """
+    # The SensorMount doesn't have a defined front so by convention we'll
+    # say that the first sensor attached to it represents the front.
+    current_cart_front = cart.get_sensor(0).current_position()
+    current_cart_angle = math.atan2(current_cart_front[1], current_cart_front[2])
+    final_cart_angle = math.atan2(next_move[1], next_move[0])
+    return round(final_cart_angle - current_cart_angle, 2)
 
-    #Initialize DirectionFinder to be evaluated
-    direction_finder = DirectionFinder()
+def horizontal_error(location, target):
+    """
+    Work out the horizontal distance between a location and the target
+    """
+    return math.sqrt(math.pow(location[0] - target[0], 2) \
+        + math.pow(location[1] - target[1], 2))
 
-    # Keep iterating on getting the next direction and moving until we either
-    # stabilize or we have tried more than the maximum specified times
-    for iteration in range(1, 25):
-        # Get all the sensor location and outputs to feed into the DF
-        current_sensor_data = []
-        cart_location = cart.current_position()
-        print(str(iteration) + ": Cart Location: " + str(cart_location))
+def start_run(sources=None, sensors=None, start_location=(60, 0, 0), start_rotation=0, \
+    light_field=None, options=None):
+    """
+    Set up the scene and the cart for a run of the model, with the same
+    defaults as run_model. The stateful collaborators in the RunOptions are
+    reset, and a fixed step MotionController and NULL_INSTRUMENTATION are
+    filled in when none are given. Returns the LightField, the location of
+    the brightest source, the cart, its quantizer and the completed
+    RunOptions.
+    """
+    if sources is None:
+        sources = light_field.get_sources() if light_field is not None else default_sources()
+    if sensors is None:
+        sensors = default_layout()
+    if light_field is None:
+        light_field = LightField(sources)
+    target = max(sources, key=lambda source: source.get_output_intensity()).get_location()
 
-        for sensor_index in range(0, 7):
-            current_sensor = cart.get_sensor(sensor_index)
-            global_sensor_location = current_sensor.current_position()
+    if options is None:
+        options = RunOptions()
+    if options.motion_controller is None:
+        options = options._replace(motion_controller=MotionController())
+    if options.instrumentation is None:
+        options = options._replace(instrumentation=NULL_INSTRUMENTATION)
+    options.motion_controller.reset()
+    if options.frame_filter is not None:
+        options.frame_filter.Reset()
 
-            incident_light = source.get_intensity_at_location(global_sensor_location)
-            measured_light = current_sensor.output_from_sources(incident_light)
-            relative_sensor_location =  (global_sensor_location[0] - cart_location[0], \
-                global_sensor_location[1] - cart_location[1], \
-                cart_location[2])
-            sensor_element = { 'amp':measured_light, 'location':relative_sensor_location }
-            current_sensor_data.append(sensor_element)
+    cart, quantizer = mount_sensors(sensors, start_location, start_rotation, \
+        options.sensor_noise)
+    return light_field, target, cart, quantizer, options
 
-        next_move = direction_finder.FindDirection(current_sensor_data)
-        print("Next Move: {} ".format(next_move))
-        current_sensor_data.clear()
+def step_cart(cart, measured_light, direction_finder, motion_controller, \
+    follow_direction=False, batch=False, instrumentation=NULL_INSTRUMENTATION, \
+    log_progress=False):
+    """
+    Take one step of a run from a frame of sensor outputs read where the
+    cart is: find the direction of the light, let the motion_controller
+    decide how far to move and move the cart. With batch set the direction
+    is found with FindDirections, which doesn't log the frames it rejects,
+    and otherwise with FindDirection. Returns the direction found and the
+    move made, which is None when the DirectionFinder rejected the frame
+    and the cart stayed where it was. The frame, and whether it was
+    rejected, is counted in the instrumentation rather than in the
+    DirectionFinder's own, which may be shared with other runs.
+    """
+    cart_location = cart.current_position()
+    with instrumentation.Timer('direction_finding'):
+        # The direction is found in the cart's own frame, where the sensor
+        # offsets stay the same from one iteration to the next so a
+        # DirectionFinder can keep work which only depends on them, and then
+        # turned to face the same way as the cart
+        sensor_offsets = cart.sensor_offsets()
+        if batch:
+            next_move = direction_finder.FindDirections((measured_light,), sensor_offsets)[0]
+        else:
+            current_sensor_data = [{ 'amp':amplitude, 'location':sensor_offset } \
+                for sensor_offset, amplitude in zip(sensor_offsets, measured_light)]
+            next_move = direction_finder.FindDirection(current_sensor_data)
+        instrumentation.Count('frames')
+        if next_move != () and next_move != (0, 0):
+            next_move = cart.to_world_direction(next_move)
+    if log_progress:
+        logger.info("Next Move: %s ", next_move)
 
-        # We only want to move 5 cm in that direction, so figure out that point
-        move_vector = [next_move[0] - cart_location[0], next_move[1]  - cart_location[1]]
-        orig_magnitude = math.sqrt(math.pow(move_vector[0], 2) + math.pow(move_vector[1], 2))
-        scaled_move = [0, 0]
-        if orig_magnitude != 0.0:
-            scaled_move = [ 5 * ( move_vector[0]) / orig_magnitude, 5 * (move_vector[1]) / orig_magnitude ]
+    if next_move == ():
+        instrumentation.Count('invalid_frames')
+        return next_move, None
 
-        print("Scaled Move: {}".format(scaled_move))
+    with instrumentation.Timer('move'):
+        # Let the controller decide how far to move in that direction
+        if follow_direction:
+            move_vector = [next_move[0], next_move[1]]
+        else:
+            move_vector = [next_move[0] - cart_location[0], next_move[1]  - cart_location[1]]
+        scaled_move = motion_controller.next_move(move_vector, measured_light)
 
         # Calculate the translation the move represents
         next_translation = ( cart_location[0] + scaled_move[0], \
             cart_location[1] + scaled_move[1], \
             0)
+        cart.move_to_position(next_translation, rotation_towards(cart, next_move))
+    if log_progress:
+        logger.info("Scaled Move: %s", scaled_move)
+    return next_move, scaled_move
+
+def run_model(sources=None, sensors=None, start_location=(60, 0, 0), \
+    start_rotation=0, max_iterations=24, direction_finder=None, \
+    tolerance=STEP_SIZE, results_file=RESULTS_FILE, results_sink=None, \
+    run_id=0, follow_direction=False, stop_on_convergence=False, \
+    light_field=None, verbosity=PROGRESS, options=None):
+    """
+    Drive a cart carrying the given sensors, either LightSensors or a
+    compiled SensorLayout, from the starting pose towards the light and
+    report how well the DirectionFinder did. Every sensor is read on each
+    iteration. Without any arguments this runs the original scenario of a
+    single light 10 feet above the center of the room and a cart starting
+    60 cm away.
+
+    The error is the horizontal distance between the cart and the brightest
+    source. Each iteration writes a row tagged with run_id to results_sink.
+    When no sink is given the rows are appended to results_file unless it is
+    None. Progress is logged at INFO level at the given verbosity level,
+    QUIET, SUMMARY or PROGRESS. The verbosity only decides what is logged
+    about the run; which frames the DirectionFinder logs as invalid is up
+    to the batch option.
+
+    By default each move heads from the cart towards the point given by the
+    DirectionFinder, which is how the fixture has always worked. As the
+    directions are relative to the cart, this mostly steers the cart towards
+    the origin. With follow_direction set the cart instead steps along the
+    direction itself, which is what is needed to compare strategies. With
+    stop_on_convergence set the run ends as soon as the error is within the
+    tolerance.
+
+    A prebuilt light_field, such as one attached from a SharedScene, can be
+    given in place of building one from the sources. Its sources are used
+    when no sources are given.
+
+    The collaborators plugged into the run are given together as a
+    RunOptions:
+        motion_controller   decides how far each move goes and when the
+                            cart stops. By default every move is STEP_SIZE
+                            cm.
+        frame_filter        a FrameFilter which smooths the sensor outputs
+                            over the iterations of the run before they
+                            reach the DirectionFinder and the
+                            motion_controller
+        sensor_noise        a SensorNoise applied to the sensor outputs,
+                            with the frames of each run numbered from 0 so
+                            that a run with the same noise seed is
+                            reproduced exactly
+        instrumentation     an Instrumentation recording per-stage timings
+                            and counts, including the frames given to
+                            the DirectionFinder and those it rejected
+        trajectory          a Trajectory recording each iteration
+        batch               find the directions with FindDirections, which
+                            counts invalid frames rather than logging them,
+                            in place of FindDirection
+
+    When a frame is rejected by the DirectionFinder the cart stays where it
+    is and reads its sensors again on the next iteration.
+    """
+    if direction_finder is None:
+        #Initialize DirectionFinder to be evaluated
+        direction_finder = DirectionFinder()
+    light_field, target, cart, quantizer, options = start_run(sources, sensors, \
+        start_location, start_rotation, light_field, options)
+    instrumentation = options.instrumentation
+    frame_filter = options.frame_filter
+    trajectory = options.trajectory
+
+    # Skip building the log messages when nothing would be logged
+    if not logger.isEnabledFor(logging.INFO):
+        verbosity = QUIET
+    log_progress = verbosity >= PROGRESS
+
+    owns_sink = results_sink is None and results_file is not None
+    if owns_sink:
+        results_sink = CsvResultsSink(results_file)
+
+    initial_error = horizontal_error(start_location, target)
+    current_error = initial_error
+    converged_iteration = None
+    iteration = 0
+    sensor_reads = 0
+
+    read_count = cart.sensor_count()
+
+    # Keep iterating on getting the next direction and moving until we either
+    # stabilize or we have tried more than the maximum specified times
+    for iteration in range(1, max_iterations + 1):
+        cart_location = cart.current_position()
+        if log_progress:
+            logger.info("%d: Cart Location: %s", iteration, cart_location)
+
+        # Get all the sensor location and outputs to feed into the DF
+        with instrumentation.Timer('sensing'):
+            global_sensor_locations = cart.sensor_positions()
+            incident_light = light_field.get_intensity_at_locations(global_sensor_locations)
+
+        with instrumentation.Timer('quantization'):
+            measured_light = quantizer.quantize(incident_light)
+
+        if frame_filter is not None:
+            with instrumentation.Timer('filtering'):
+                measured_light = frame_filter.Filter(measured_light)
+
+        sensor_reads += read_count
+        _, scaled_move = step_cart(cart, measured_light, direction_finder, \
+            options.motion_controller, follow_direction, options.batch, \
+            instrumentation, log_progress)
+
+        finished = False
+        if scaled_move is None:
+            # The frame couldn't be used, so stay put and read the sensors
+            # again on the next iteration
+            instrumentation.Count('rereads')
+            scaled_move = (0, 0)
+        else:
+            current_error = horizontal_error(cart.current_position(), target)
+            if converged_iteration is None and current_error <= tolerance:
+                converged_iteration = iteration
+            finished = scaled_move == [0, 0] \
+                or (stop_on_convergence and converged_iteration is not None)
+
+        if results_sink is not None:
+            with instrumentation.Timer('io'):
+                results_sink.write_row((cart_location[0], cart_location[1], \
+                    scaled_move[0], scaled_move[1], current_error), run_id)
+        if trajectory is not None:
+            trajectory.record(cart_location, scaled_move, current_error)
+        instrumentation.Count('iterations')
+
+        if finished:
+            if log_progress:
+                logger.info("Reached ideal spot in %d iterations", iteration)
+            break
+
+        if log_progress:
+            logger.info("   Current Error: %s", current_error)
+
+    if owns_sink:
+        with instrumentation.Timer('io'):
+            results_sink.close()
+
+    if verbosity >= SUMMARY:
+        logger.info("Finished after %d iterations with an error of %s", iteration, \
+            current_error)
+
+    return ModelResult(iteration, converged_iteration, initial_error, current_error, \
+        sensor_reads)
+
+def run_trajectory(record_trajectory=True, options=None, **model_arguments):
+    """
+    Run the model quietly, without a results file, and return a Trajectory
+    holding each iteration, with the ModelResult of the run as its result.
+    With record_trajectory unset only the result is kept. The trajectory
+    replaces any given in the options. Any other keyword arguments are
+    passed on to run_model.
+    """
+    max_iterations = model_arguments.get('max_iterations', 24)
+    trajectory = Trajectory(max_iterations if record_trajectory else 0)
+    if options is None:
+        options = RunOptions()
+    model_arguments.setdefault('verbosity', QUIET)
+    model_arguments.setdefault('results_file', None)
+    trajectory.result = run_model(options=options._replace( \
+        trajectory=trajectory if record_trajectory else None), **model_arguments)
+    return trajectory
+
+def compare_direction_finders(direction_finders=None, **model_arguments):
+    """
+    Run the same scenario once with each of the given DirectionFinders and
+    return a list of (name, ModelResult) pairs. By default the simple
+    DirectionFinder is compared against the interpolating strategies. Any
+    other keyword arguments are passed on to run_model.
+
+    Unless told otherwise the cart follows each strategy's direction, stops
+    once it is within the tolerance, and uses sensors whose input range
+    covers the light seen from the default scenario. The default 0-304 range
+    leaves the sensors only about 15 counts to work with.
+    """
+    if direction_finders is None:
+        direction_finders = [DirectionFinder(), CentroidDirectionFinder(), \
+            QuadraticPeakDirectionFinder(), GradientDirectionFinder()]
+
+    model_arguments.setdefault('sensors', \
+        default_sensors(COMPARISON_SENSOR_INPUT_RANGE))
+    model_arguments.setdefault('results_file', None)
+    model_arguments.setdefault('verbosity', QUIET)
+    model_arguments.setdefault('follow_direction', True)
+    model_arguments.setdefault('stop_on_convergence', True)
+
+    comparison = []
+    for direction_finder in direction_finders:
+        result = run_model(direction_finder=direction_finder, **model_arguments)
+        comparison.append((type(direction_finder).__name__, result))
+    return comparison
 
-        # Create a csv file to hold the data generated
-        with open('DirectionFinderResults.csv', mode='a') as df_results:
-            df_results = csv.writer(df_results, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            df_results.writerow([cart.current_position()[0], cart.current_position()[1],scaled_move[0],
-                                 scaled_move[1], math.sqrt(math.pow(next_translation[0], 2) +
-                                                           math.pow(next_translation[1], 2))])
+def compare_motion_controllers(motion_controllers=None, **model_arguments):
+    """
+    Run the same scenario once with each of the given MotionControllers and
+    return a list of (name, ModelResult, iterations saved, sensor reads
+    saved) tuples. The savings are relative to the first controller, which
+    by default is the fixed step controller the fixture has always used.
+    Any other keyword arguments are passed on to run_model.
 
-        # The SensorMount doesn't have a defined front so by convention we'll
-        # say that the first sensor attached to it represents the front.
-        current_cart_front = cart.get_sensor(0).current_position()
-        current_cart_angle = math.atan2(current_cart_front[1], current_cart_front[2])
-        final_cart_angle = math.atan2(next_move[1], next_move[0])
-        next_rotation = round(final_cart_angle - current_cart_angle, 2)
+    Unless told otherwise the cart follows the simple DirectionFinder's
+    direction using the comparison sensors, and only stops when the
+    controller decides to.
+    """
+    if motion_controllers is None:
+        motion_controllers = [MotionController(), ProportionalStepController(), \
+            LineSearchController(), StepHalvingController()]
 
-        cart.move_to_position(next_translation, next_rotation)
+    model_arguments.setdefault('sensors', \
+        default_sensors(COMPARISON_SENSOR_INPUT_RANGE))
+    model_arguments.setdefault('results_file', None)
+    model_arguments.setdefault('verbosity', QUIET)
+    model_arguments.setdefault('follow_direction', True)
 
-        if scaled_move == [0, 0]:
-            print("Reached ideal spot in " + str(iteration) + " iterations")
-            return
+    options = model_arguments.pop('options', None)
+    if options is None:
+        options = RunOptions()
 
-        print("   Current Error: " + str(math.sqrt(math.pow(next_translation[0], 2) \
-            + math.pow(next_translation[1], 2))))
+    comparison = []
+    baseline = None
+    for motion_controller in motion_controllers:
+        result = run_model(options=options._replace(motion_controller=motion_controller), \
+            **model_arguments)
+        if baseline is None:
+            baseline = result
+        comparison.append((type(motion_controller).__name__, result, \
+            baseline.iterations - result.iterations, \
+            baseline.sensor_reads - result.sensor_reads))
+    return comparison
 
 
 if __name__ == "__main__":
-    run_model()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    if "--compare" in sys.argv:
+        for name, result in compare_direction_finders():
+            print("{}: {} iterations, {} sensor reads, final error {}".format( \
+                name, result.iterations, result.sensor_reads, result.final_error))
+    elif "--compare-controllers" in sys.argv:
+        for name, result, saved_iterations, saved_reads in compare_motion_controllers():
+            print("{}: {} iterations ({} saved), {} sensor reads ({} saved), final error {}".format( \
+                name, result.iterations, saved_iterations, result.sensor_reads, saved_reads, \
+                result.final_error))
+    elif "--headless" in sys.argv:
+        result = run_trajectory(record_trajectory=False).result
+        print("{} iterations, {} sensor reads, final error {}".format( \
+            result.iterations, result.sensor_reads, result.final_error))
+    else:
+        run_model()
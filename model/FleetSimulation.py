@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Simulates a whole fleet of independent carts in lockstep. Rather than
+running the DirectionFinderFixture model once per cart, the state of every
+cart is held in arrays and each tick senses, decides and moves all of the
+carts that are still running. Carts drop out of the active set as soon as
+they finish so they no longer cost anything on later ticks.
+
+Every cart carries the same sensor layout, given as offsets from the cart
+position in the cart's own frame. Directions are found in that frame for
+all carts with a single call to the DirectionFinder, then turned into world
+coordinates using each cart's heading. Like run_model with follow_direction
+set, each cart steps STEP_SIZE cm along the direction it was given and
+turns to face that way.
+"""
+
+import math
+from array import array
+
+from LightField import LightField
+from LightSensor import SensorQuantizer
+from Rotation import angle_to_yaw
+from Rotation import yaw_to_angle
+from SensorLayout import DEFAULT_INPUT_RANGE
+from SensorLayout import DEFAULT_OUTPUT_RANGE
+from SensorLayout import SensorLayout
+from SensorNoise import NoisyQuantizer
+
+from DirectionFinderFixture import ModelResult
+from DirectionFinderFixture import STEP_SIZE
+
+import sys
+sys.path.append("..")
+from DirectionFinder import DirectionFinder
+
+# Reasons a cart stops running
+RUNNING = 0
+CONVERGED = 1
+STATIONARY = 2
+EXHAUSTED = 3
+
+class FleetSimulation(object):
+    """
+    The state of a fleet of carts which are simulated together
+    """
+    def __init__(self, start_locations, sources, sensor_offsets, \
+        sensor_input_range=DEFAULT_INPUT_RANGE, sensor_output_range=DEFAULT_OUTPUT_RANGE, \
+        direction_finder=None, step_size=STEP_SIZE, tolerance=STEP_SIZE, \
+        start_headings=None, sensor_noise=None):
+        """
+        Initialize a fleet with one cart at each start location. sources is
+        either a list of LightSources seen by every cart or a list holding a
+        separate list of LightSources for each cart. sensor_offsets are the
+        (x, y, z) offsets of the sensors from the cart position, or a
+        SensorLayout, which are shared by every cart. Headings are clockwise
+        yaws in degrees, as used by SensorMount, and default to 0.
+
+        A SensorNoise given as sensor_noise is applied to every frame. The
+        noise of each frame depends only on the cart and the tick, so a cart
+        sees the same noise whatever else is in the fleet. As in run_model, a
+        cart whose frame is rejected by the DirectionFinder stays where it
+        is and reads its sensors again on the next tick.
+        """
+        cart_count = len(start_locations)
+        if sources and isinstance(sources[0], (list, tuple)):
+            if len(sources) != cart_count:
+                raise ValueError("Expected sources for {} carts but got {}".format( \
+                    cart_count, len(sources)))
+            per_cart_sources = sources
+        else:
+            per_cart_sources = [sources] * cart_count
+
+        # Carts which share a list of sources also share the LightField
+        fields = {}
+        self.fields = []
+        self.targets = []
+        for cart_sources in per_cart_sources:
+            field = fields.get(id(cart_sources))
+            if field is None:
+                field = LightField(cart_sources)
+                fields[id(cart_sources)] = field
+            self.fields.append(field)
+            self.targets.append(max(cart_sources, \
+                key=lambda source: source.get_output_intensity()).get_location())
+
+        self.shared_field = self.fields[0] if len(fields) == 1 else None
+
+        # A SensorLayout is kept as it is so that the direction finder can
+        # share the fit kept with it, and it brings its own sensor ranges
+        if isinstance(sensor_offsets, SensorLayout):
+            self.sensor_offsets = sensor_offsets
+            self.quantizer = sensor_offsets.quantizer()
+        else:
+            self.sensor_offsets = [tuple(offset) for offset in sensor_offsets]
+            self.quantizer = SensorQuantizer([sensor_input_range] * len(self.sensor_offsets), \
+                [sensor_output_range] * len(self.sensor_offsets))
+        if sensor_noise is not None:
+            self.quantizer = NoisyQuantizer(self.quantizer, sensor_noise)
+        self.sensor_noise = sensor_noise
+        self.sensor_count = len(self.sensor_offsets)
+        self.direction_finder = direction_finder if direction_finder is not None \
+            else DirectionFinder()
+        self.step_size = step_size
+        self.tolerance = tolerance
+
+        self.x = array('d', [location[0] for location in start_locations])
+        self.y = array('d', [location[1] for location in start_locations])
+        self.z = array('d', [location[2] if len(location) > 2 else 0 \
+            for location in start_locations])
+        if start_headings is None:
+            start_headings = [0.0] * cart_count
+        self.heading = array('d', [heading % 360 for heading in start_headings])
+
+        self.iterations = array('l', [0] * cart_count)
+        self.rereads = array('l', [0] * cart_count)
+        self.status = array('b', [RUNNING] * cart_count)
+        self.initial_error = array('d', [self.error(index) for index in range(cart_count)])
+        self.active = list(range(cart_count))
+        self.ticks = 0
+        self.cart_steps = 0
+
+    def __len__(self):
+        return len(self.x)
+
+    def error(self, cart_index):
+        """
+        Query the horizontal distance between a cart and its brightest source
+        """
+        target = self.targets[cart_index]
+        return math.hypot(self.x[cart_index] - target[0], self.y[cart_index] - target[1])
+
+    def sensor_positions(self, cart_index):
+        """
+        Query the absolute position of every sensor on a cart
+        """
+        return self._sensor_positions((cart_index,))
+
+    def _sensor_positions(self, indices):
+        # The positions of every sensor on each of the carts, one cart after
+        # another
+        x, y, z = self.x, self.y, self.z
+        angles = [yaw_to_angle(self.heading[index]) for index in indices]
+        offsets = self.sensor_offsets
+        return [(cx + cos_angle * ox - sin_angle * oy, \
+            cy + sin_angle * ox + cos_angle * oy, cz + oz) \
+            for cx, cy, cz, cos_angle, sin_angle in [(x[index], y[index], z[index], \
+                math.cos(angle), math.sin(angle)) for index, angle in zip(indices, angles)] \
+            for ox, oy, oz in offsets]
+
+    def _group_by_field(self, indices):
+        # Split the carts into groups which share a LightField
+        if self.shared_field is not None:
+            return ((self.shared_field, indices),)
+        groups = {}
+        for index in indices:
+            field = self.fields[index]
+            groups.setdefault(id(field), (field, []))[1].append(index)
+        return groups.values()
+
+    def tick(self):
+        """
+        Advance every active cart by one sense, decide and move step.
+        Returns the number of carts which are still active afterwards.
+        """
+        active = self.active
+        if not active:
+            return 0
+
+        # Sense every active cart, with one field query for all of the carts
+        # sharing a field, and find all of their directions at once
+        incident_light = {}
+        for field, indices in self._group_by_field(active):
+            intensities = field.get_intensity_at_locations(self._sensor_positions(indices))
+            for position, index in enumerate(indices):
+                start = position * self.sensor_count
+                incident_light[index] = intensities[start:start + self.sensor_count]
+        if self.sensor_noise is None:
+            frames = self.quantizer.quantize_frames([incident_light[index] for index in active])
+        else:
+            frames = self.quantizer.quantize_frames([incident_light[index] for index in active], \
+                [self.ticks << 32 | index for index in active])
+        directions = self.direction_finder.FindDirections(frames, self.sensor_offsets)
+
+        still_active = []
+        step_size = self.step_size
+        for index, direction in zip(active, directions):
+            self.iterations[index] += 1
+
+            if direction == ():
+                # The frame couldn't be used, so stay put and read the
+                # sensors again on the next tick
+                self.rereads[index] += 1
+                still_active.append(index)
+                continue
+            magnitude = math.hypot(direction[0], direction[1])
+            if magnitude == 0.0:
+                self.status[index] = STATIONARY
+                continue
+
+            # Turn the direction from the cart's frame into the world frame
+            bearing = yaw_to_angle(self.heading[index]) + math.atan2(direction[1], direction[0])
+            self.x[index] += step_size * math.cos(bearing)
+            self.y[index] += step_size * math.sin(bearing)
+            self.heading[index] = angle_to_yaw(bearing)
+
+            if self.error(index) <= self.tolerance:
+                self.status[index] = CONVERGED
+            else:
+                still_active.append(index)
+
+        self.ticks += 1
+        self.cart_steps += len(active)
+        self.active = still_active
+        return len(still_active)
+
+    def run(self, max_ticks=24):
+        """
+        Tick until every cart has finished or max_ticks ticks have run. Carts
+        still running at the end are marked as exhausted. Returns the
+        results for every cart.
+        """
+        while self.ticks < max_ticks and self.tick():
+            pass
+        for index in self.active:
+            self.status[index] = EXHAUSTED
+        self.active = []
+        return self.results()
+
+    def results(self):
+        """
+        Summarize every cart as a ModelResult, as returned by run_model
+        """
+        sensor_count = self.sensor_count
+        return [ModelResult(self.iterations[index], \
+            self.iterations[index] if self.status[index] == CONVERGED else None, \
+            self.initial_error[index], self.error(index), \
+            self.iterations[index] * sensor_count) for index in range(len(self.x))]
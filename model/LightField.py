@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Contains the implementation of a LightField which combines the light from
+many LightSources within the model
+"""
+
+import math
+from array import array
+
+class LightField(object):
+    """
+    Object representing the combined light of a collection of LightSources.
+    The incident intensity at any point is the sum of the intensity from each
+    source. For static scenes the field can be sampled onto a regular grid
+    ahead of time and queries answered by interpolating that grid.
+    """
+
+    INTERPOLATION_MODES = ('nearest', 'linear')
+
+    def __init__(self, sources=()):
+        """
+        Initialize a LightField containing the provided LightSources
+        """
+        self.sources = []
+        self._source_terms = []
+        self.grid = None
+        for source in sources:
+            self.add_source(source)
+
+    def add_source(self, source):
+        """
+        Add a LightSource to the field. Any precomputed grid no longer
+        describes the field and is discarded.
+        """
+        self.sources.append(source)
+        location = source.get_location()
+
+        # Fold the cm to m conversion and the 4 * pi into a single constant so
+        # that each query is one multiply and one divide per source
+        scale = source.get_output_intensity() * 10000 / (4 * math.pi)
+        min_distance_sq = math.pow(source.min_distance, 2)
+        self._source_terms.append((location[0], location[1], location[2], \
+            scale, min_distance_sq))
+        self.grid = None
+
+    def get_sources(self):
+        """
+        Queries the LightSources that make up the field
+        """
+        return self.sources
+
+    def get_intensity_at_location(self, location):
+        """
+        Queries the total incident intensity of all sources at a single
+        location
+        """
+        return self.get_intensity_at_locations((location,))[0]
+
+    def get_intensity_at_locations(self, locations):
+        """
+        Queries the total incident intensity of all sources at each of the
+        provided locations. Returns a list with one intensity per location.
+
+        If a grid has been precomputed then locations inside it are
+        interpolated from the grid and locations outside of it are evaluated
+        exactly.
+        """
+        if self.grid is not None:
+            return [self.grid.lookup(location, self._exact_intensity) \
+                for location in locations]
+
+        # Accumulate one source at a time over every location
+        totals = [0.0] * len(locations)
+        for source_x, source_y, source_z, scale, min_distance_sq in self._source_terms:
+            distances_sq = [(source_x - location[0]) ** 2 + (source_y - location[1]) ** 2 \
+                + (source_z - location[2]) ** 2 for location in locations]
+            totals = [total + scale / (distance_sq if distance_sq > min_distance_sq \
+                else min_distance_sq) for total, distance_sq in zip(totals, distances_sq)]
+        return totals
+
+    def _exact_intensity(self, location):
+        """
+        Sum the contribution of every source at a single location
+        """
+        x, y, z = location[0], location[1], location[2]
+        total = 0.0
+        for source_x, source_y, source_z, scale, min_distance_sq \
+            in self._source_terms:
+            dx = source_x - x
+            dy = source_y - y
+            dz = source_z - z
+            distance_sq = dx * dx + dy * dy + dz * dz
+            if distance_sq < min_distance_sq:
+                distance_sq = min_distance_sq
+            total += scale / distance_sq
+        return total
+
+    def precompute_grid(self, x_axis, y_axis, z_axis, interpolation='linear'):
+        """
+        Sample the field onto a regular grid so that later queries are
+        answered by interpolation. Each axis is given as (start, stop, spacing)
+        in cm and includes both end points. A single plane can be sampled by
+        giving an axis with the same start and stop.
+        """
+        if interpolation not in self.INTERPOLATION_MODES:
+            raise ValueError("Unknown interpolation mode: " + str(interpolation))
+
+        self.grid = None
+        grid = IntensityGrid(x_axis, y_axis, z_axis, interpolation)
+        grid.fill(self._exact_intensity)
+        self.grid = grid
+        return grid
+
+    def clear_grid(self):
+        """
+        Discard any precomputed grid and return to exact evaluation
+        """
+        self.grid = None
+
+
+class IntensityGrid(object):
+    """
+    A regular 3D grid of intensity samples stored in a flat array with the x
+    index varying fastest.
+    """
+
+    def __init__(self, x_axis, y_axis, z_axis, interpolation='linear'):
+        """
+        Initialize an empty grid over the given (start, stop, spacing) axes
+        """
+        self.axes = tuple(self._axis(axis) for axis in (x_axis, y_axis, z_axis))
+        self.interpolation = interpolation
+        self.values = array('d')
+
+    @classmethod
+    def from_samples(cls, axes, values, interpolation='linear'):
+        """
+        Initialize a grid around existing samples, such as those of another
+        grid. axes are given as (start, spacing, count) as held in the axes
+        attribute and values may be any sequence of floats supporting
+        indexing, which is used without being copied.
+        """
+        grid = cls.__new__(cls)
+        grid.axes = tuple(tuple(axis) for axis in axes)
+        grid.interpolation = interpolation
+        count = 1
+        for _, _, axis_count in grid.axes:
+            count *= axis_count
+        if len(values) != count:
+            raise ValueError("Expected {} samples but got {}".format(count, len(values)))
+        grid.values = values
+        return grid
+
+    @staticmethod
+    def _axis(axis):
+        start, stop, spacing = axis
+        if stop < start or spacing <= 0:
+            raise ValueError("Invalid grid axis: " + str(axis))
+        count = int(round((stop - start) / spacing)) + 1
+        return (start, spacing, count)
+
+    def shape(self):
+        """
+        Queries the number of samples along each axis
+        """
+        return tuple(count for _, _, count in self.axes)
+
+    def fill(self, intensity_function):
+        """
+        Evaluate intensity_function at every node of the grid
+        """
+        (x0, dx, nx), (y0, dy, ny), (z0, dz, nz) = self.axes
+        self.values = array('d', [intensity_function((x0 + i * dx, y0 + j * dy, z0 + k * dz)) \
+            for k in range(nz) for j in range(ny) for i in range(nx)])
+
+    def lookup(self, location, fallback):
+        """
+        Interpolate the grid at a location. Locations outside of the grid are
+        passed to fallback instead.
+        """
+        cells = []
+        for value, (start, spacing, count) in zip(location, self.axes):
+            position = (value - start) / spacing
+            if position < 0 or position > count - 1:
+                return fallback(location)
+            cells.append(position)
+
+        (_, _, nx), (_, _, ny), (_, _, nz) = self.axes
+        values = self.values
+
+        if self.interpolation == 'nearest':
+            i, j, k = (int(round(position)) for position in cells)
+            return values[(k * ny + j) * nx + i]
+
+        # Trilinear interpolation between the eight surrounding samples. An
+        # axis with a single sample contributes no weight along that axis.
+        lower = []
+        weights = []
+        for position, count in zip(cells, (nx, ny, nz)):
+            index = min(int(position), max(count - 2, 0))
+            lower.append(index)
+            weights.append(position - index)
+
+        (i, j, k), (wx, wy, wz) = lower, weights
+        i1 = i + 1 if nx > 1 else i
+        j1 = j + 1 if ny > 1 else j
+        k1 = k + 1 if nz > 1 else k
+
+        def sample(a, b, c):
+            return values[(c * ny + b) * nx + a]
+
+        c00 = sample(i, j, k) * (1 - wx) + sample(i1, j, k) * wx
+        c10 = sample(i, j1, k) * (1 - wx) + sample(i1, j1, k) * wx
+        c01 = sample(i, j, k1) * (1 - wx) + sample(i1, j, k1) * wx
+        c11 = sample(i, j1, k1) * (1 - wx) + sample(i1, j1, k1) * wx
+
+        c0 = c00 * (1 - wy) + c10 * wy
+        c1 = c01 * (1 - wy) + c11 * wy
+
+        return c0 * (1 - wz) + c1 * wz
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Contains the implementation of a LightScene, a LightField for scenes with
+many LightSources such as a warehouse full of light fixtures.
+
+The sources are indexed by a k-d tree in which every node knows the total
+output of the sources below it and where that output is centred. When a
+query point is far enough from a node, the whole node is treated as one
+source at that centre rather than visiting each of its sources, and nodes
+whose total contribution can't reach the cutoff are skipped altogether.
+Each query then only visits the sources near the point in full, so its cost
+grows roughly with the logarithm of the number of sources.
+"""
+
+from LightField import LightField
+
+# Maximum number of sources evaluated directly at a leaf of the tree
+LEAF_SIZE = 8
+
+class SourceNode(object):
+    """
+    A node of the k-d tree over the sources of a LightScene
+    """
+    __slots__ = ('low', 'high', 'scale', 'centre', 'size_sq', 'min_distance_sq', \
+        'children', 'terms')
+
+    def __init__(self, terms):
+        """
+        Initialize a node holding the given source terms, splitting them
+        between two children when there are more than LEAF_SIZE of them
+        """
+        self.low = tuple(min(term[axis] for term in terms) for axis in range(3))
+        self.high = tuple(max(term[axis] for term in terms) for axis in range(3))
+        self.scale = sum(term[3] for term in terms)
+        if self.scale > 0:
+            self.centre = tuple(sum(term[axis] * term[3] for term in terms) / self.scale \
+                for axis in range(3))
+        else:
+            self.centre = tuple((low + high) / 2 for low, high in zip(self.low, self.high))
+        self.size_sq = sum((high - low) ** 2 for low, high in zip(self.low, self.high))
+        self.min_distance_sq = min(term[4] for term in terms)
+
+        if len(terms) <= LEAF_SIZE:
+            self.children = ()
+            self.terms = terms
+            return
+
+        # Split at the median of the widest axis
+        extents = [high - low for low, high in zip(self.low, self.high)]
+        axis = extents.index(max(extents))
+        terms = sorted(terms, key=lambda term: term[axis])
+        middle = len(terms) // 2
+        self.children = (SourceNode(terms[:middle]), SourceNode(terms[middle:]))
+        self.terms = None
+
+
+class LightScene(LightField):
+    """
+    A LightField which answers queries from a spatial index over its
+    sources. Two settings trade accuracy for speed:
+
+    theta is the largest ratio of a group of sources' size to its distance
+    from the query point at which the group is approximated by a single
+    source at its centre. 0 evaluates every source exactly, while 0.5 keeps
+    the error to around a percent for a ceiling of evenly spread fixtures.
+
+    cutoff is an intensity in W/m^2 below which a group too near to be
+    approximated is ignored instead. The contribution of a skipped group is
+    bounded by the cutoff, so the total error is at most the cutoff times
+    the number of skipped groups. 0 never skips a group.
+    """
+
+    def __init__(self, sources=(), theta=0.5, cutoff=0.0):
+        """
+        Initialize a LightScene containing the provided LightSources
+        """
+        if theta < 0 or cutoff < 0:
+            raise ValueError("theta and cutoff must not be negative")
+        self.theta = theta
+        self.cutoff = cutoff
+        self.root = None
+        super().__init__(sources)
+
+    def add_source(self, source):
+        """
+        Add a LightSource to the scene. The index is rebuilt on the next
+        query.
+        """
+        super().add_source(source)
+        self.root = None
+
+    def build_index(self):
+        """
+        Build the index over the current sources. This happens automatically
+        on the first query after sources are added.
+        """
+        self.root = SourceNode(list(self._source_terms)) if self._source_terms else None
+        return self.root
+
+    def get_intensity_at_locations(self, locations):
+        """
+        Queries the total incident intensity of all sources at each of the
+        provided locations, within the accuracy set by theta and cutoff.
+        A precomputed grid takes precedence over the index, as it does for
+        a LightField.
+        """
+        if self.grid is not None:
+            return super().get_intensity_at_locations(locations)
+        if self.root is None:
+            if not self._source_terms:
+                return [0.0] * len(locations)
+            self.build_index()
+        return [self._indexed_intensity(location) for location in locations]
+
+    def _indexed_intensity(self, location):
+        x, y, z = location[0], location[1], location[2]
+        theta_sq = self.theta * self.theta
+        cutoff = self.cutoff
+        total = 0.0
+        stack = [self.root]
+        pop = stack.pop
+        push = stack.extend
+        while stack:
+            node = pop()
+            terms = node.terms
+            if terms is not None:
+                for source_x, source_y, source_z, scale, min_distance_sq in terms:
+                    dx = source_x - x
+                    dy = source_y - y
+                    dz = source_z - z
+                    distance_sq = dx * dx + dy * dy + dz * dz
+                    if distance_sq < min_distance_sq:
+                        distance_sq = min_distance_sq
+                    total += scale / distance_sq
+                continue
+
+            centre = node.centre
+            dx = centre[0] - x
+            dy = centre[1] - y
+            dz = centre[2] - z
+            distance_sq = dx * dx + dy * dy + dz * dz
+            if node.size_sq < theta_sq * distance_sq:
+                total += node.scale / distance_sq
+                continue
+
+            if cutoff:
+                # Skip the node if its sources can't reach the cutoff even
+                # from the nearest point of the node
+                low, high = node.low, node.high
+                dx = max(low[0] - x, 0.0, x - high[0])
+                dy = max(low[1] - y, 0.0, y - high[1])
+                dz = max(low[2] - z, 0.0, z - high[2])
+                nearest_sq = max(dx * dx + dy * dy + dz * dz, node.min_distance_sq)
+                if node.scale / nearest_sq < cutoff:
+                    continue
+            push(node.children)
+        return total
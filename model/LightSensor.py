@@ -4,6 +4,8 @@ Provides a simple representation of a light sensor which can be used to
 model a single light sensitive element and associated A/D
 """
 
+from array import array
+
 class LightSensor(object):
     """
     Each LightSensor represents a photosensitive element at a specific
@@ -35,9 +37,90 @@ class LightSensor(object):
 
     def output_from_sources(self, incident_light):
         """
-        Determine an output based on the specified input
+        Determine an output based on the specified input. Inputs outside of
+        the input range saturate at the ends of the output range.
         """
-        return int(round((incident_light - self.input_range[0]) \
+        output = int(round((incident_light - self.input_range[0]) \
           * (self.output_range[1] - self.output_range[0]) \
           / (self.input_range[1] - self.input_range[0]) \
           + self.output_range[0]))
+        return int(min(max(output, self.output_range[0]), self.output_range[1]))
+
+
+class SensorQuantizer(object):
+    """
+    Converts incident light into sensor outputs for a whole group of sensors
+    at once. The gain and offset of every sensor are computed up front so
+    each conversion is a multiply, an add and a clip per sample.
+    """
+    def __init__(self, input_ranges, output_ranges):
+        """
+        Initialize a quantizer for sensors with the given input and output
+        ranges, one (low, high) pair per sensor.
+        """
+        self.gains = array('d')
+        self.offsets = array('d')
+        self.lows = []
+        self.highs = []
+        for input_range, output_range in zip(input_ranges, output_ranges):
+            gain = (output_range[1] - output_range[0]) \
+                / (input_range[1] - input_range[0])
+            self.gains.append(gain)
+            self.offsets.append(output_range[0] - input_range[0] * gain)
+            self.lows.append(int(output_range[0]))
+            self.highs.append(int(output_range[1]))
+
+        # Use the compact unsigned 16 bit type whenever the outputs fit, as
+        # they do for the 10 bit A/D used by the model
+        if self.lows and min(self.lows) >= 0 and max(self.highs) <= 0xFFFF:
+            self.typecode = 'H'
+        else:
+            self.typecode = 'q'
+
+    @classmethod
+    def from_sensors(cls, sensors):
+        """
+        Initialize a quantizer from a sequence of LightSensors
+        """
+        return cls([sensor.input_range for sensor in sensors], \
+            [sensor.output_range for sensor in sensors])
+
+    def __len__(self):
+        return len(self.gains)
+
+    def quantize(self, incident_light):
+        """
+        Convert one frame of incident light, one value per sensor, into an
+        array of integer sensor outputs clipped to each sensor's output range
+        """
+        if len(incident_light) != len(self.gains):
+            raise ValueError("Expected {} values but got {}".format( \
+                len(self.gains), len(incident_light)))
+        # round() of a float already gives an int, and the clip is written
+        # out inline as it is noticeably faster than calling min and max
+        return array(self.typecode, [low if output < low else high if output > high else output \
+            for output, low, high in zip([round(light * gain + offset) \
+                for light, gain, offset in zip(incident_light, self.gains, self.offsets)], \
+            self.lows, self.highs)])
+
+    def quantize_frames(self, frames):
+        """
+        Convert many frames of incident light, such as a sequence of time
+        steps, returning one array of sensor outputs per frame. All of the
+        frames are converted in a single pass.
+        """
+        frames = list(frames)
+        count = len(self.gains)
+        for frame in frames:
+            if len(frame) != count:
+                raise ValueError("Expected {} values but got {}".format(count, len(frame)))
+
+        frame_count = len(frames)
+        if not count:
+            return [array(self.typecode) for _ in frames]
+        outputs = array(self.typecode, [low if output < low else high if output > high else output \
+            for output, low, high in zip([round(light * gain + offset) \
+                for light, gain, offset in zip([light for frame in frames for light in frame], \
+                    self.gains * frame_count, self.offsets * frame_count)], \
+            self.lows * frame_count, self.highs * frame_count)])
+        return [outputs[start:start + count] for start in range(0, len(outputs), count)]
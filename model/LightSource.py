@@ -5,6 +5,11 @@ Contains the implementation of a LightSource within the model
 
 import math
 
+# Closest distance, in cm, at which a LightSource is evaluated. Points nearer
+# than this are treated as being this far away so that the inverse-square
+# falloff stays finite at the source itself.
+MIN_DISTANCE = 1
+
 class LightSource(object):
     """
     Object representing an omni-directional light source at a specified location
@@ -12,12 +17,15 @@ class LightSource(object):
     changed once initialized.
     """
 
-    def __init__(self, location, intensity):
+    def __init__(self, location, intensity, min_distance=MIN_DISTANCE):
         """
-        Initialize a LightSource at a specified location and intensity
+        Initialize a LightSource at a specified location and intensity.
+        Optionally the minimum distance, in cm, used when evaluating the
+        incident intensity near the source can be specified.
         """
         self.location = location
         self.output_intensity = intensity
+        self.min_distance = min_distance
 
     def get_location(self):
         """
@@ -42,4 +50,7 @@ class LightSource(object):
             + math.pow((self.location[1] - location[1]) / 100, 2) \
             + math.pow((self.location[2] - location[2]) / 100, 2)
 
+        # Avoid the singularity when the location coincides with the source
+        distance_sq = max(distance_sq, math.pow(self.min_distance / 100, 2))
+
         return self.output_intensity / (4 * math.pi * distance_sq)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Motion controllers decide how far the cart moves along the direction chosen
+on each iteration of the model, and when it has found the light and should
+stop. The base MotionController always moves the same distance, which is
+how the fixture has always worked, while the others adapt the step to what
+the sensors are reading.
+
+A controller only sees what a real cart could: the direction it was given
+and the sensor outputs it measured. It never sees the distance to the
+light. Every controller stops the cart once its step falls below min_step
+or once the cart has turned back on itself max_reversals times in a row.
+"""
+
+import math
+
+# Distance, in cm, the cart moves on each iteration
+STEP_SIZE = 5
+
+class MotionController(object):
+    """
+    Moves a fixed step_size along every direction
+    """
+    def __init__(self, step_size=STEP_SIZE, min_step=0.5, max_reversals=None):
+        """
+        Initialize a controller. Steps shorter than min_step stop the cart,
+        as does turning back max_reversals times in a row. The fixed step
+        controller never stops on reversals unless max_reversals is given.
+        """
+        self.step_size = step_size
+        self.min_step = min_step
+        self.max_reversals = max_reversals
+        self.reset()
+
+    def reset(self):
+        """
+        Forget everything about the previous run
+        """
+        self.step = self.step_size
+        self.previous_direction = None
+        self.previous_intensity = None
+        self.reversals = 0
+        self.stopped = False
+
+    def next_move(self, move_vector, measured_light):
+        """
+        Scale the (x, y) move_vector to the distance the cart should move
+        this iteration, given the sensor outputs it measured. Returns [0, 0]
+        once the cart should stop.
+        """
+        magnitude = math.sqrt(math.pow(move_vector[0], 2) + math.pow(move_vector[1], 2))
+        if magnitude == 0.0:
+            return [0, 0]
+        direction = (move_vector[0] / magnitude, move_vector[1] / magnitude)
+
+        # Turning back on ourselves means the last step went past the light
+        reversed_direction = self.previous_direction is not None and \
+            direction[0] * self.previous_direction[0] \
+            + direction[1] * self.previous_direction[1] < 0
+        self.reversals = self.reversals + 1 if reversed_direction else 0
+        intensity = sum(measured_light)
+
+        step = self.step_length(reversed_direction, intensity, measured_light)
+        self.previous_direction = direction
+        self.previous_intensity = intensity
+
+        if step < self.min_step or (self.max_reversals is not None \
+            and self.reversals >= self.max_reversals):
+            self.stopped = True
+            return [0, 0]
+        return [step * (move_vector[0]) / magnitude, step * (move_vector[1]) / magnitude]
+
+    def step_length(self, reversed_direction, intensity, measured_light):
+        """
+        The distance to move this iteration. Subclasses override this to
+        adapt the step.
+        """
+        return self.step_size
+
+
+class ProportionalStepController(MotionController):
+    """
+    Moves a distance proportional to the gradient of the light across the
+    sensors, measured as the difference between the brightest and dimmest
+    sensor relative to their sum. The gradient flattens out as the cart gets
+    under the light, so the steps shrink as it closes in.
+    """
+    def __init__(self, gain=800, min_step=0.5, max_step=20, max_reversals=3):
+        super().__init__(max_step, min_step, max_reversals)
+        self.gain = gain
+
+    def step_length(self, reversed_direction, intensity, measured_light):
+        brightest = max(measured_light)
+        dimmest = min(measured_light)
+        if brightest + dimmest <= 0:
+            return self.step_size
+        gradient = (brightest - dimmest) / (brightest + dimmest)
+        return min(self.gain * gradient, self.step_size)
+
+
+class LineSearchController(MotionController):
+    """
+    Searches along the way towards the light using the total light measured
+    by the sensors. The step grows while each move brightens the reading and
+    is cut back whenever a move darkens it or turns the cart around.
+    """
+    def __init__(self, step_size=STEP_SIZE, growth=1.5, shrink=0.5, min_step=0.5, \
+        max_step=40, max_reversals=3):
+        super().__init__(step_size, min_step, max_reversals)
+        self.growth = growth
+        self.shrink = shrink
+        self.max_step = max_step
+
+    def step_length(self, reversed_direction, intensity, measured_light):
+        if self.previous_intensity is not None:
+            if reversed_direction or intensity < self.previous_intensity:
+                self.step *= self.shrink
+            else:
+                self.step = min(self.step * self.growth, self.max_step)
+        return self.step
+
+
+class StepHalvingController(MotionController):
+    """
+    Moves a fixed step until the cart overshoots the light and turns back,
+    then halves the step on every overshoot. The cart stops once the step
+    is smaller than min_step.
+    """
+    def __init__(self, step_size=4 * STEP_SIZE, min_step=1, max_reversals=None):
+        super().__init__(step_size, min_step, max_reversals)
+
+    def step_length(self, reversed_direction, intensity, measured_light):
+        if reversed_direction:
+            self.step /= 2
+        return self.step
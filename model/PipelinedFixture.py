@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Runs many independent carts through the model in one process with the
+stages of each iteration pipelined. Each cart is set up and stepped with
+the same start_run and step_cart as DirectionFinderFixture.run_model, but
+rather than one cart running sense, decide, write and move strictly in
+turn, an asyncio event loop passes the carts between three stages:
+    sensing   reads the sensors of every waiting cart, with one LightField
+              query for all of the carts sharing a field
+    deciding  finds the direction, moves the cart and sends it back to be
+              sensed again
+    writing   hands the result rows to a writer thread so the writes
+              overlap with the sensing and deciding of the next steps
+
+Each stage takes its work from a queue whose depth is sampled every time
+work is added, so the stage holding up the pipeline is the one with the
+deepest queue. Carts only ever wait in one queue at a time, so the sensing
+and deciding queues never hold more than one entry per cart. The writing
+queue is bounded, which holds the carts back if the writes fall behind.
+"""
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from MotionController import STEP_SIZE
+
+import DirectionFinderFixture
+from DirectionFinderFixture import ModelResult
+
+import sys
+sys.path.append("..")
+from DirectionFinder import DirectionFinder
+
+# Stages of the pipeline, in the order a cart passes through them
+STAGES = ('sensing', 'deciding', 'writing')
+
+class StageQueue(asyncio.Queue):
+    """
+    An asyncio.Queue which keeps track of how deep it gets
+    """
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.max_depth = 0
+        self.total_depth = 0
+        self.samples = 0
+
+    def put_nowait(self, item):
+        super().put_nowait(item)
+        depth = self.qsize()
+        self.total_depth += depth
+        self.samples += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def drain(self):
+        """
+        Take every item waiting in the queue without waiting for more
+        """
+        items = []
+        while not self.empty():
+            items.append(self.get_nowait())
+        return items
+
+    def depth_stats(self):
+        """
+        Query the current, largest and mean depth of the queue along with
+        the number of items added to it
+        """
+        return {'depth': self.qsize(), 'max_depth': self.max_depth, \
+            'mean_depth': self.total_depth / self.samples if self.samples else 0.0, \
+            'items': self.samples}
+
+
+class CartRun(object):
+    """
+    The state of a single cart working its way through the pipeline
+    """
+    def __init__(self, run_id, sources=None, sensors=None, start_location=(60, 0, 0), \
+        start_rotation=0, max_iterations=24, direction_finder=None, \
+        tolerance=STEP_SIZE, follow_direction=False, stop_on_convergence=False, \
+        light_field=None, options=None):
+        """
+        Initialize a cart with the same arguments, and the same defaults, as
+        run_model. Only the motion_controller, frame_filter, sensor_noise
+        and batch of the RunOptions are used. The direction_finder, motion_controller
+        and frame_filter keep state, so every cart needs its own.
+        """
+        self.run_id = run_id
+        self.light_field, self.target, self.cart, self.quantizer, options = \
+            DirectionFinderFixture.start_run(sources, sensors, start_location, \
+            start_rotation, light_field, options)
+        self.direction_finder = direction_finder if direction_finder is not None \
+            else DirectionFinder()
+        self.motion_controller = options.motion_controller
+        self.frame_filter = options.frame_filter
+        self.batch = options.batch
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.follow_direction = follow_direction
+        self.stop_on_convergence = stop_on_convergence
+
+        self.initial_error = DirectionFinderFixture.horizontal_error(start_location, \
+            self.target)
+        self.current_error = self.initial_error
+        self.converged_iteration = None
+        self.iteration = 0
+        self.sensor_reads = 0
+        self.measured_light = None
+
+    def sensed(self, incident_light):
+        """
+        Record the light falling on the sensors
+        """
+        measured_light = self.quantizer.quantize(incident_light)
+        if self.frame_filter is not None:
+            measured_light = self.frame_filter.Filter(measured_light)
+        self.measured_light = measured_light
+
+    def decide(self):
+        """
+        Find the direction from the last sensor readings and move the cart,
+        as run_model does for each iteration. Returns the result row for the
+        iteration and whether the cart has finished.
+        """
+        self.iteration += 1
+        cart = self.cart
+        cart_location = cart.current_position()
+        self.sensor_reads += cart.sensor_count()
+        _, scaled_move = DirectionFinderFixture.step_cart(cart, self.measured_light, \
+            self.direction_finder, self.motion_controller, self.follow_direction, self.batch)
+        out_of_iterations = self.iteration >= self.max_iterations
+
+        if scaled_move is None:
+            # The frame couldn't be used, so stay put and read again
+            return (cart_location[0], cart_location[1], 0, 0, self.current_error), \
+                out_of_iterations
+
+        self.current_error = DirectionFinderFixture.horizontal_error( \
+            cart.current_position(), self.target)
+        if self.converged_iteration is None and self.current_error <= self.tolerance:
+            self.converged_iteration = self.iteration
+        converged_now = self.stop_on_convergence and self.converged_iteration is not None
+
+        return (cart_location[0], cart_location[1], scaled_move[0], scaled_move[1], \
+            self.current_error), \
+            out_of_iterations or scaled_move == [0, 0] or converged_now
+
+    def result(self):
+        """
+        Summarize the run as a ModelResult, as returned by run_model
+        """
+        return ModelResult(self.iteration, self.converged_iteration, self.initial_error, \
+            self.current_error, self.sensor_reads)
+
+
+class PipelinedFixture(object):
+    """
+    Runs a group of carts together through the sensing, deciding and
+    writing stages
+    """
+    def __init__(self, results_sink=None, write_queue_size=256):
+        """
+        Initialize a fixture writing every result row to results_sink, if
+        given. The rows are written by a single thread, one batch at a time
+        in the order the iterations were decided, so the sink needn't be
+        thread safe. Rows from at most write_queue_size iterations wait to
+        be written before the carts are held back.
+        """
+        self.results_sink = results_sink
+        self.write_queue_size = write_queue_size
+        self.runs = []
+        self.queues = None
+        self.remaining = 0
+        self.all_finished = None
+
+    def add_cart(self, run_id=None, **model_arguments):
+        """
+        Add a cart which runs with the given run_model arguments, tagging its
+        rows with run_id, which defaults to the order the cart was added in
+        """
+        if run_id is None:
+            run_id = len(self.runs)
+        self.runs.append(CartRun(run_id, **model_arguments))
+
+    def run(self):
+        """
+        Run every cart until it finishes. Returns a ModelResult for each cart
+        in the order they were added. The carts can only be run once.
+        """
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """
+        Coroutine form of run, for use from an event loop which is already
+        running
+        """
+        self.queues = {'sensing': StageQueue(), 'deciding': StageQueue(), \
+            'writing': StageQueue(self.write_queue_size)}
+        loop = asyncio.get_running_loop()
+        self.remaining = 0
+        self.all_finished = loop.create_future()
+        for cart_run in self.runs:
+            if cart_run.max_iterations > 0:
+                self.remaining += 1
+                self.queues['sensing'].put_nowait(cart_run)
+        if not self.remaining:
+            self.all_finished.set_result(None)
+
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            stages = [asyncio.create_task(self._sense()), asyncio.create_task(self._decide()), \
+                asyncio.create_task(self._write(writer))]
+            tasks = list(stages)
+            try:
+                # A stage only finishes early by raising, which is passed on
+                await asyncio.wait([self.all_finished] + stages, \
+                    return_when=asyncio.FIRST_COMPLETED)
+                for stage in stages:
+                    if stage.done():
+                        stage.result()
+                # The writing queue may be full, and if the writer fails it is
+                # never emptied, so stop waiting to put the sentinel as soon as
+                # the writer finishes and pass on its error
+                tasks.append(asyncio.create_task(self.queues['writing'].put(None)))
+                await asyncio.wait([tasks[-1], stages[2]], return_when=asyncio.FIRST_COMPLETED)
+                await stages[2]
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return [cart_run.result() for cart_run in self.runs]
+
+    def queue_depths(self):
+        """
+        Query the depth statistics of the queue feeding each stage
+        """
+        if self.queues is None:
+            return {}
+        return {stage: self.queues[stage].depth_stats() for stage in STAGES}
+
+    async def _sense(self):
+        sensing = self.queues['sensing']
+        deciding = self.queues['deciding']
+        while True:
+            cart_runs = [await sensing.get()] + sensing.drain()
+
+            # Carts sharing a LightField are sensed with one query
+            groups = {}
+            for cart_run in cart_runs:
+                groups.setdefault(id(cart_run.light_field), []).append(cart_run)
+            for group in groups.values():
+                positions = [cart_run.cart.sensor_positions() for cart_run in group]
+                intensities = group[0].light_field.get_intensity_at_locations( \
+                    [position for sensor_positions in positions for position in sensor_positions])
+                start = 0
+                for cart_run, sensor_positions in zip(group, positions):
+                    end = start + len(sensor_positions)
+                    cart_run.sensed(intensities[start:end])
+                    start = end
+                    deciding.put_nowait(cart_run)
+            # Let the other stages run before sensing the carts sent back
+            await asyncio.sleep(0)
+
+    async def _decide(self):
+        sensing = self.queues['sensing']
+        deciding = self.queues['deciding']
+        writing = self.queues['writing']
+        while True:
+            for cart_run in [await deciding.get()] + deciding.drain():
+                row, finished = cart_run.decide()
+                if self.results_sink is not None:
+                    await writing.put((row, cart_run.run_id))
+                if not finished:
+                    sensing.put_nowait(cart_run)
+                    continue
+                self.remaining -= 1
+                if not self.remaining:
+                    self.all_finished.set_result(None)
+            await asyncio.sleep(0)
+
+    async def _write(self, writer):
+        writing = self.queues['writing']
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            items = [await writing.get()] + writing.drain()
+            if items[-1] is None:
+                finished = True
+                items.pop()
+            if items and self.results_sink is not None:
+                await loop.run_in_executor(writer, _write_rows, self.results_sink, items)
+        if self.results_sink is not None:
+            await loop.run_in_executor(writer, self.results_sink.flush)
+
+
+def _write_rows(results_sink, items):
+    for row, run_id in items:
+        results_sink.write_row(row, run_id)
+
+def run_pipelined(cart_arguments, results_sink=None):
+    """
+    Run a cart for each dictionary of run_model arguments in cart_arguments
+    through a PipelinedFixture. Returns the ModelResult of every cart along
+    with the depth statistics of each stage's queue.
+    """
+    fixture = PipelinedFixture(results_sink)
+    for arguments in cart_arguments:
+        fixture.add_cart(**arguments)
+    results = fixture.run()
+    return results, fixture.queue_depths()
+
+
+if __name__ == "__main__":
+    # Run carts starting all around the default light and show how deep the
+    # queue feeding each stage got
+    _, depths = run_pipelined([{'start_location': (60 * math.cos(index / 16 * math.pi), \
+        60 * math.sin(index / 16 * math.pi), 0)} for index in range(32)])
+    for stage in STAGES:
+        print("{}: {}".format(stage, depths[stage]))
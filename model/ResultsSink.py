@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Provides buffered sinks for the rows of results generated by the model.
+Rows are held in memory and written out in bulk when the buffer fills or the
+sink is flushed, rather than opening the output file for every row. Every
+row is tagged with the id of the run that produced it so that results from
+many runs can share one output.
+"""
+
+import ast
+import csv
+import os
+import struct
+import sys
+from array import array
+
+RESULT_COLUMNS = ('cart_x', 'cart_y', 'move_x', 'move_y', 'error')
+
+class ResultsSink(object):
+    """
+    Base class for a sink of result rows. Subclasses implement _write_rows to
+    persist a batch of buffered rows.
+    """
+
+    def __init__(self, columns=RESULT_COLUMNS, buffer_rows=1024):
+        """
+        Initialize a sink for rows with the given columns. Rows are written
+        out once buffer_rows of them have been buffered.
+        """
+        self.columns = ('run_id',) + tuple(columns)
+        self.buffer_rows = buffer_rows
+        self.rows = []
+
+    def write_row(self, row, run_id=0):
+        """
+        Buffer a single row of results produced by the run with id run_id
+        """
+        if len(row) != len(self.columns) - 1:
+            raise ValueError("Expected {} values but got {}".format( \
+                len(self.columns) - 1, len(row)))
+        self.rows.append((run_id,) + tuple(row))
+        if len(self.rows) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out any buffered rows
+        """
+        if self.rows:
+            self._write_rows(self.rows)
+            self.rows = []
+
+    def close(self):
+        """
+        Flush any buffered rows and release the sink
+        """
+        self.flush()
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MemoryResultsSink(ResultsSink):
+    """
+    Keeps every row in memory, which is useful when the results are consumed
+    by the same process that generated them.
+    """
+
+    def __init__(self, columns=RESULT_COLUMNS, buffer_rows=1024):
+        ResultsSink.__init__(self, columns, buffer_rows)
+        self.results = []
+
+    def _write_rows(self, rows):
+        self.results.extend(rows)
+
+
+class CsvResultsSink(ResultsSink):
+    """
+    Appends rows to a CSV file. The file is only opened when a batch of rows
+    is written out.
+    """
+
+    def __init__(self, path, columns=RESULT_COLUMNS, buffer_rows=1024):
+        ResultsSink.__init__(self, columns, buffer_rows)
+        self.path = path
+
+    def _write_rows(self, rows):
+        with open(self.path, mode='a', newline='') as results_file:
+            writer = csv.writer(results_file, delimiter=',', quotechar='"', \
+                quoting=csv.QUOTE_MINIMAL)
+            writer.writerows(rows)
+
+
+class ColumnarResultsSink(ResultsSink):
+    """
+    Writes rows into a directory of binary column chunks. Each flush creates
+    a chunk directory holding one .npy file per column, with the run id
+    stored as 64 bit integers and every other column as 64 bit floats.
+    """
+
+    CHUNK_FORMAT = 'chunk_{:06d}'
+
+    def __init__(self, path, columns=RESULT_COLUMNS, buffer_rows=65536):
+        ResultsSink.__init__(self, columns, buffer_rows)
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.chunk_count = len([name for name in os.listdir(path) \
+            if name.startswith('chunk_')])
+
+    def _write_rows(self, rows):
+        chunk_path = os.path.join(self.path, self.CHUNK_FORMAT.format(self.chunk_count))
+        os.makedirs(chunk_path)
+        for index, column in enumerate(self.columns):
+            typecode = 'q' if index == 0 else 'd'
+            values = array(typecode, [row[index] for row in rows])
+            _write_npy(os.path.join(chunk_path, column + '.npy'), values)
+        self.chunk_count += 1
+
+
+def read_columnar_results(path):
+    """
+    Read back every chunk written by a ColumnarResultsSink. Returns a
+    dictionary mapping each column name to a list of its values.
+    """
+    columns = {}
+    for chunk in sorted(os.listdir(path)):
+        chunk_path = os.path.join(path, chunk)
+        for file_name in sorted(os.listdir(chunk_path)):
+            column = file_name[:-len('.npy')]
+            values = _read_npy(os.path.join(chunk_path, file_name))
+            columns.setdefault(column, []).extend(values)
+    return columns
+
+
+# Minimal reader and writer for version 1.0 .npy files holding a single
+# little endian column.
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_NPY_DESCR = {'q': '<i8', 'd': '<f8'}
+_NPY_TYPECODE = {'<i8': 'q', '<f8': 'd'}
+
+def _write_npy(path, values):
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}".format( \
+        _NPY_DESCR[values.typecode], len(values))
+    # The header is padded so that the data starts on a 64 byte boundary
+    padding = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + ' ' * padding + '\n'
+
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    with open(path, mode='wb') as npy_file:
+        npy_file.write(_NPY_MAGIC)
+        npy_file.write(struct.pack('<H', len(header)))
+        npy_file.write(header.encode('latin1'))
+        npy_file.write(values.tobytes())
+
+def _read_npy(path):
+    with open(path, mode='rb') as npy_file:
+        if npy_file.read(len(_NPY_MAGIC)) != _NPY_MAGIC:
+            raise ValueError("Not a version 1.0 .npy file: " + path)
+        header_length = struct.unpack('<H', npy_file.read(2))[0]
+        header = ast.literal_eval(npy_file.read(header_length).decode('latin1'))
+        values = array(_NPY_TYPECODE[header['descr']])
+        values.frombytes(npy_file.read())
+
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
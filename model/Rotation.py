@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Rotation matrices for moving groups of sensors. Matrices are 3x3 row-major
+tuples which can be handed straight to SensorArray.transform, so a whole
+group of sensors is rotated with one matrix built once per move.
+
+Angles are in degrees. Yaw turns about the z axis in the clockwise sense
+used by SensorMount, pitch turns about the y axis raising the positive x
+axis and roll turns about the x axis raising the positive y axis. A full
+attitude applies roll first, then pitch, then yaw. yaw_to_angle and
+angle_to_yaw convert between a yaw and the counter-clockwise radians of the
+math module.
+
+Building a matrix takes a handful of trig calls, so the most recently used
+matrices are cached. The angles are brought within a single turn and
+rounded to ANGLE_PLACES decimal places to form the cache key, so the same
+heading reached by adding up different moves finds the same matrix. A
+single run of the fixture rarely comes back to a heading, but runs from the
+same start, such as those compared by compare_direction_finders, repeat
+the headings of the runs before them.
+"""
+
+import math
+from functools import lru_cache
+
+# Number of distinct rotations kept by each cache
+CACHE_SIZE = 1024
+
+# Decimal places of a degree kept in the cache key of an angle
+ANGLE_PLACES = 6
+
+IDENTITY = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+def angle_key(angle):
+    """
+    Bring an angle in degrees within [0, 360) and round it to ANGLE_PLACES
+    decimal places
+    """
+    return round(angle % 360, ANGLE_PLACES) % 360
+
+def yaw_to_angle(yaw):
+    """
+    Convert a clockwise yaw in degrees into the counter-clockwise angle in
+    radians used by math.cos, math.sin and math.atan2
+    """
+    return -math.radians(yaw)
+
+def angle_to_yaw(angle):
+    """
+    Convert a counter-clockwise angle in radians, such as one from
+    math.atan2, into a clockwise yaw in degrees within [0, 360)
+    """
+    yaw = -math.degrees(angle) % 360
+    # A tiny positive angle would otherwise round up to a whole turn
+    return 0.0 if yaw == 360 else yaw
+
+def yaw_matrix(yaw):
+    """
+    Build the matrix for a clockwise rotation of yaw degrees about the z axis
+    """
+    return _yaw_matrix(angle_key(yaw))
+
+def attitude_matrix(yaw=0, pitch=0, roll=0):
+    """
+    Build the matrix for a full attitude of yaw, pitch and roll degrees
+    """
+    return _attitude_matrix(angle_key(yaw), angle_key(pitch), angle_key(roll))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _yaw_matrix(yaw):
+    yaw_rads = math.radians(yaw)
+    cos_yaw = math.cos(yaw_rads)
+    sin_yaw = math.sin(yaw_rads)
+    return ((cos_yaw, sin_yaw, 0), \
+        (-sin_yaw, cos_yaw, 0), \
+        (0, 0, 1))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _attitude_matrix(yaw, pitch, roll):
+    if pitch == 0 and roll == 0:
+        return _yaw_matrix(yaw)
+
+    pitch_rads = math.radians(pitch)
+    cos_pitch = math.cos(pitch_rads)
+    sin_pitch = math.sin(pitch_rads)
+    pitch_matrix = ((cos_pitch, 0, -sin_pitch), \
+        (0, 1, 0), \
+        (sin_pitch, 0, cos_pitch))
+
+    roll_rads = math.radians(roll)
+    cos_roll = math.cos(roll_rads)
+    sin_roll = math.sin(roll_rads)
+    roll_matrix = ((1, 0, 0), \
+        (0, cos_roll, -sin_roll), \
+        (0, sin_roll, cos_roll))
+
+    return multiply(_yaw_matrix(yaw), multiply(pitch_matrix, roll_matrix))
+
+def multiply(first, second):
+    """
+    Multiply two matrices, giving the rotation which applies second and
+    then first
+    """
+    columns = tuple(zip(*second))
+    return tuple(tuple(sum(a * b for a, b in zip(row, column)) for column in columns) \
+        for row in first)
+
+def transpose(matrix):
+    """
+    Transpose a matrix, which for a rotation gives its inverse
+    """
+    return tuple(zip(*matrix))
+
+def rotate(matrix, point):
+    """
+    Rotate a single (x, y, z) point
+    """
+    x, y, z = point[0], point[1], point[2]
+    return tuple(row[0] * x + row[1] * y + row[2] * z for row in matrix)
+
+def cache_info():
+    """
+    Query the hit and miss counts of the matrix caches
+    """
+    return {'yaw': _yaw_matrix.cache_info(), 'attitude': _attitude_matrix.cache_info()}
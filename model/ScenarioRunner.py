@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Runs the DirectionFinderFixture model over many randomized scenarios in
+parallel and aggregates how well the DirectionFinder converges.
+
+A sweep maps scenario parameters to the values they may take. A list of
+values is swept exhaustively, while a (low, high) tuple is sampled uniformly
+for every run. Each run is given its own seed derived from the base seed and
+its run id, so the same sweep always produces the same scenarios regardless
+of how many processes are used.
+"""
+
+import itertools
+import math
+import multiprocessing
+import random
+
+from LightSource import LightSource
+from SensorLayout import DEFAULT_INPUT_RANGE
+from SensorLayout import DEFAULT_OUTPUT_RANGE
+from SensorLayout import compile_layout
+from SharedScene import SharedScene
+
+import DirectionFinderFixture
+
+DEFAULT_SWEEP = {
+    'start_distance': (20, 200),
+    'start_rotation': (0, 360),
+    'source_count': [1],
+    'source_height': (200, 400),
+    'source_intensity': [500],
+    'source_spread': [0],
+    'sensor_count': [8],
+    'sensor_radius': [30],
+    'sensor_input_limit': [DEFAULT_INPUT_RANGE[1]],
+    'max_iterations': [24],
+}
+
+# The SharedScene used by the scenarios run in this process, if any
+_scene = None
+
+def ring_layout(count, radius, height=10, input_range=DEFAULT_INPUT_RANGE, \
+    output_range=DEFAULT_OUTPUT_RANGE):
+    """
+    Compile a SensorLayout of count sensors evenly spaced on a ring of the
+    given radius. The first sensor sits on the positive y axis and the rest
+    follow clockwise, matching the layout used by the fixture. Scenarios
+    with the same ring share one layout.
+    """
+    return compile_layout({'type': 'ring', 'count': count, 'radius': radius, \
+        'height': height, 'input_range': list(input_range), 'output_range': list(output_range)})
+
+def ring_sensors(count, radius, height=10, input_range=DEFAULT_INPUT_RANGE, \
+    output_range=DEFAULT_OUTPUT_RANGE):
+    """
+    Create count sensors evenly spaced on a ring of the given radius
+    """
+    return ring_layout(count, radius, height, input_range, output_range).sensors()
+
+def expand_sweep(sweep=None, repeats=1, base_seed=0):
+    """
+    Expand a sweep into a list of scenarios. Every combination of the listed
+    values is repeated the requested number of times and each scenario is
+    given a unique run_id and seed.
+    """
+    if sweep is None:
+        sweep = DEFAULT_SWEEP
+
+    names = sorted(sweep)
+    choices = [sweep[name] if isinstance(sweep[name], list) else [sweep[name]] \
+        for name in names]
+
+    scenarios = []
+    for combination in itertools.product(*choices):
+        for _ in range(repeats):
+            scenario = dict(zip(names, combination))
+            scenario['run_id'] = len(scenarios)
+            scenario['seed'] = base_seed * 2**32 + scenario['run_id']
+            scenarios.append(scenario)
+    return scenarios
+
+def _sample(value, rng):
+    """
+    Resolve a sweep value for a single run
+    """
+    if isinstance(value, tuple):
+        return rng.uniform(value[0], value[1])
+    return value
+
+def build_model_arguments(scenario):
+    """
+    Turn a scenario into the keyword arguments for run_model, drawing any
+    random quantities from the scenario's own seed.
+    """
+    rng = random.Random(scenario['seed'])
+    params = dict((name, _sample(value, rng)) for name, value in sorted(scenario.items()))
+
+    sources = []
+    for _ in range(int(params['source_count'])):
+        spread = rng.uniform(0, params['source_spread'])
+        spread_angle = rng.uniform(0, 2 * math.pi)
+        location = (spread * math.cos(spread_angle), spread * math.sin(spread_angle), \
+            params['source_height'])
+        sources.append(LightSource(location, params['source_intensity']))
+
+    start_angle = rng.uniform(0, 2 * math.pi)
+    start_location = (params['start_distance'] * math.cos(start_angle), \
+        params['start_distance'] * math.sin(start_angle), 0)
+
+    return {
+        'sources': sources,
+        'sensors': ring_layout(int(params['sensor_count']), params['sensor_radius'], \
+            input_range=(0, params.get('sensor_input_limit', DEFAULT_INPUT_RANGE[1]))),
+        'start_location': start_location,
+        'start_rotation': params['start_rotation'],
+        'max_iterations': int(params['max_iterations']),
+    }
+
+def run_scenario(scenario):
+    """
+    Run the model for a single scenario without any console or file output.
+    Returns a dictionary describing the outcome which is tagged with the
+    scenario's run_id.
+
+    Besides the sweep parameters a scenario may name the DirectionFinder
+    class to evaluate and any run_model options in its 'model_options'.
+
+    When a shared scene is attached to this process its light field is used
+    in place of the sampled sources, and a scenario may name one of its
+    sensor layouts as 'sensor_template' in place of the sampled ring.
+    """
+    arguments = build_model_arguments(scenario)
+    if _scene is not None:
+        arguments['sources'] = None
+        arguments['light_field'] = _scene.light_field()
+        if 'sensor_template' in scenario:
+            arguments['sensors'] = _scene.sensors(scenario['sensor_template'])
+    arguments.update(scenario.get('model_options', {}))
+    if 'direction_finder' in scenario:
+        arguments['direction_finder'] = scenario['direction_finder']()
+    result = DirectionFinderFixture.run_model(results_file=None, \
+        verbosity=DirectionFinderFixture.QUIET, **arguments)
+
+    return {
+        'run_id': scenario['run_id'],
+        'seed': scenario['seed'],
+        'iterations': result.iterations,
+        'converged_iteration': result.converged_iteration,
+        'initial_error': result.initial_error,
+        'final_error': result.final_error,
+        'diverged': result.final_error > result.initial_error,
+        'sensor_reads': result.sensor_reads,
+    }
+
+def _attach_scene(descriptor):
+    """
+    Attach a worker process to a shared scene for the rest of its life
+    """
+    global _scene
+    _scene = SharedScene.attach(descriptor) if descriptor is not None else None
+
+def run_scenarios(scenarios, processes=None, chunksize=None, scene=None):
+    """
+    Run every scenario, fanning them out over a pool of worker processes.
+    With processes set to 1 the scenarios are run in this process. Results
+    are returned in run_id order.
+
+    A published SharedScene can be given for every scenario to run in. Each
+    worker attaches to it once when it starts rather than being sent the
+    scene with every scenario.
+    """
+    global _scene
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if processes == 1:
+        previous_scene, _scene = _scene, scene
+        try:
+            results = [run_scenario(scenario) for scenario in scenarios]
+        finally:
+            _scene = previous_scene
+    else:
+        # Large chunks keep the inter-process traffic low while still leaving
+        # a few chunks per worker to balance uneven run times.
+        if chunksize is None:
+            chunksize = max(1, len(scenarios) // (processes * 4))
+        descriptor = scene.descriptor if scene is not None else None
+        with multiprocessing.Pool(processes, _attach_scene, (descriptor,)) as pool:
+            results = list(pool.imap_unordered(run_scenario, scenarios, chunksize))
+
+    return sorted(results, key=lambda result: result['run_id'])
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+def summarize(results):
+    """
+    Aggregate the convergence statistics over a set of scenario results
+    """
+    run_count = len(results)
+    if run_count == 0:
+        return {'runs': 0}
+
+    converged = [result['converged_iteration'] for result in results \
+        if result['converged_iteration'] is not None]
+    final_errors = [result['final_error'] for result in results]
+    diverged = [result for result in results if result['diverged']]
+    sensor_reads = [result['sensor_reads'] for result in results]
+
+    summary = {
+        'runs': run_count,
+        'convergence_rate': len(converged) / run_count,
+        'divergence_rate': len(diverged) / run_count,
+        'mean_final_error': sum(final_errors) / run_count,
+        'median_final_error': _median(final_errors),
+        'max_final_error': max(final_errors),
+        'mean_sensor_reads': sum(sensor_reads) / run_count,
+        'mean_iterations_to_converge': None,
+        'median_iterations_to_converge': None,
+    }
+    if converged:
+        summary['mean_iterations_to_converge'] = sum(converged) / len(converged)
+        summary['median_iterations_to_converge'] = _median(converged)
+    return summary
+
+def run_sweep(sweep=None, repeats=1, base_seed=0, processes=None, scene=None):
+    """
+    Expand, run and summarize a sweep in a single call
+    """
+    results = run_scenarios(expand_sweep(sweep, repeats, base_seed), processes, scene=scene)
+    return summarize(results)
+
+def compare_direction_finders(direction_finders, sweep=None, repeats=1, \
+    base_seed=0, processes=None, model_options=None):
+    """
+    Run the same sweep once for each DirectionFinder class and return a
+    dictionary mapping each class name to its summary. Every class sees
+    exactly the same scenarios. By default the cart follows each strategy's
+    direction and stops once it has converged, as in the fixture's own
+    compare_direction_finders.
+    """
+    if model_options is None:
+        model_options = {'follow_direction': True, 'stop_on_convergence': True}
+
+    scenarios = expand_sweep(sweep, repeats, base_seed)
+    comparison = {}
+    for direction_finder in direction_finders:
+        finder_scenarios = [dict(scenario, direction_finder=direction_finder, \
+            model_options=model_options) for scenario in scenarios]
+        comparison[direction_finder.__name__] = summarize( \
+            run_scenarios(finder_scenarios, processes))
+    return comparison
+
+
+if __name__ == "__main__":
+    for name, value in sorted(run_sweep(repeats=1000).items()):
+        print("{}: {}".format(name, value))
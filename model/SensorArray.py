@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Provides a compact container for many light sensors. Rather than keeping one
+LightSensor object per element, the positions and the input and output ranges
+of every sensor are held in contiguous arrays so that moving a whole group of
+sensors is a single pass over those arrays.
+"""
+
+from array import array
+
+from LightSensor import LightSensor
+from LightSensor import SensorQuantizer
+
+# Ranges are optional for sensors that are only used for positioning, so an
+# unspecified range is stored as NaN and reported back as an empty tuple.
+_MISSING = float('nan')
+
+
+def _range_pair(value_range):
+    """
+    Convert a (low, high) range into a pair of floats suitable for storage
+    """
+    if len(value_range) == 0:
+        return (_MISSING, _MISSING)
+    return (float(value_range[0]), float(value_range[1]))
+
+
+def _range_tuple(low, high):
+    """
+    Convert a stored pair of floats back into a (low, high) range
+    """
+    if low != low:
+        return ()
+    return (low, high)
+
+
+class SensorArray(object):
+    """
+    Holds the positions, input ranges and output ranges of a group of light
+    sensors in a struct-of-arrays layout. Individual sensors are accessed
+    through SensorView objects which read and write the shared arrays.
+    """
+    def __init__(self):
+        """
+        Initialize an empty SensorArray
+        """
+        self.x = array('d')
+        self.y = array('d')
+        self.z = array('d')
+        self.input_low = array('d')
+        self.input_high = array('d')
+        self.output_low = array('d')
+        self.output_high = array('d')
+
+    def __len__(self):
+        return len(self.x)
+
+    def copy(self):
+        """
+        Create an independent copy of the array
+        """
+        sensor_array = SensorArray()
+        for column in ('x', 'y', 'z', 'input_low', 'input_high', 'output_low', 'output_high'):
+            setattr(sensor_array, column, array('d', getattr(self, column)))
+        return sensor_array
+
+    def add_sensor(self, location, input_range, output_range):
+        """
+        Append a new sensor at the given location with the given input and
+        output ranges. Returns the index of the new sensor.
+        """
+        self.x.append(location[0])
+        self.y.append(location[1])
+        self.z.append(location[2])
+
+        input_low, input_high = _range_pair(input_range)
+        self.input_low.append(input_low)
+        self.input_high.append(input_high)
+
+        output_low, output_high = _range_pair(output_range)
+        self.output_low.append(output_low)
+        self.output_high.append(output_high)
+
+        return len(self.x) - 1
+
+    def add_light_sensor(self, sensor):
+        """
+        Copy the state of an existing LightSensor into the array. Returns the
+        index of the new sensor.
+        """
+        return self.add_sensor(sensor.current_position(), sensor.input_range, \
+            sensor.output_range)
+
+    def get_sensor(self, sensor_index):
+        """
+        Returns a LightSensor compatible view of a single sensor in the array
+        """
+        if sensor_index < 0:
+            sensor_index += len(self.x)
+        if not 0 <= sensor_index < len(self.x):
+            raise IndexError("sensor index out of range")
+        return SensorView(self, sensor_index)
+
+    def position(self, sensor_index):
+        """
+        Query the current location of a single sensor
+        """
+        return (self.x[sensor_index], self.y[sensor_index], self.z[sensor_index])
+
+    def set_position(self, sensor_index, location):
+        """
+        Move a single sensor to the specified location
+        """
+        self.x[sensor_index] = location[0]
+        self.y[sensor_index] = location[1]
+        self.z[sensor_index] = location[2]
+
+    def positions(self):
+        """
+        Query the current location of every sensor as a list of (x, y, z)
+        """
+        return list(zip(self.x, self.y, self.z))
+
+    def quantizer(self):
+        """
+        Create a SensorQuantizer for the current sensors in the array
+        """
+        return SensorQuantizer(zip(self.input_low, self.input_high), \
+            zip(self.output_low, self.output_high))
+
+    def transform(self, matrix, origin, destination):
+        """
+        Apply a rigid transform to every sensor at once. Each position is
+        rotated by the 3x3 row-major matrix about the origin point and the
+        result is translated so that the origin ends up at the destination.
+        """
+        self.x, self.y, self.z = self.transformed(matrix, origin, destination)
+
+    def transformed(self, matrix, origin, destination):
+        """
+        Compute the result of transform without modifying the array. Returns
+        the new x, y and z arrays.
+        """
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+        ox, oy, oz = origin[0], origin[1], origin[2]
+        dx, dy, dz = destination[0], destination[1], destination[2]
+
+        relative = [(x - ox, y - oy, z - oz) \
+            for x, y, z in zip(self.x, self.y, self.z)]
+
+        return (array('d', [m00 * rx + m01 * ry + m02 * rz + dx \
+                for rx, ry, rz in relative]), \
+            array('d', [m10 * rx + m11 * ry + m12 * rz + dy \
+                for rx, ry, rz in relative]), \
+            array('d', [m20 * rx + m21 * ry + m22 * rz + dz \
+                for rx, ry, rz in relative]))
+
+
+class SensorView(LightSensor):
+    """
+    A LightSensor whose location and ranges live inside a SensorArray. Views
+    are cheap to create and always reflect the current contents of the array.
+    """
+    def __init__(self, sensor_array, sensor_index):
+        """
+        Create a view onto the sensor at sensor_index within sensor_array
+        """
+        self.sensor_array = sensor_array
+        self.sensor_index = sensor_index
+
+    @property
+    def location(self):
+        return self.sensor_array.position(self.sensor_index)
+
+    @location.setter
+    def location(self, location):
+        self.sensor_array.set_position(self.sensor_index, location)
+
+    @property
+    def input_range(self):
+        return _range_tuple(self.sensor_array.input_low[self.sensor_index], \
+            self.sensor_array.input_high[self.sensor_index])
+
+    @property
+    def output_range(self):
+        return _range_tuple(self.sensor_array.output_low[self.sensor_index], \
+            self.sensor_array.output_high[self.sensor_index])
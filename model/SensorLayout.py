@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Describes the arrangement of the sensors on a mount declaratively and
+compiles each description once into a SensorLayout which can be shared by
+every run that uses it.
+
+A spec is a dictionary, which may be loaded from a JSON file, whose 'type'
+is one of:
+    ring    'count' sensors evenly spaced on a circle of 'radius', the first
+            at 'start_angle' degrees (90, the positive y axis, by default)
+            and the rest following clockwise unless 'clockwise' is false
+    grid    'rows' by 'columns' sensors 'spacing' apart, centred on the mount
+    custom  the listed 'offsets', each (x, y) or (x, y, z)
+Every type also takes the 'height' of the sensors above the mount, which
+defaults to 10, and the 'input_range' and 'output_range' of the sensors.
+
+The default ring matches the eight sensors the fixture has always used:
+    {"type": "ring", "count": 8, "radius": 30, "height": 10}
+"""
+
+import json
+import math
+from array import array
+from functools import lru_cache
+
+from LightSensor import LightSensor
+from LightSensor import SensorQuantizer
+from SensorArray import SensorArray
+
+DEFAULT_SPEC = {'type': 'ring', 'count': 8, 'radius': 30, 'height': 10}
+
+DEFAULT_INPUT_RANGE = (0, 304)
+DEFAULT_OUTPUT_RANGE = (0, 1023)
+
+class SensorLayout(tuple):
+    """
+    A compiled sensor arrangement. The layout is a tuple of the (x, y, z)
+    offset of each sensor from the mount position, so it is immutable,
+    hashable and can be passed anywhere a list of sensor locations is
+    expected. Two layouts are equal only when their offsets and ranges are,
+    matching the geometry_id they hash to, and a layout is never equal to a
+    plain tuple of the same offsets.
+
+    Data which only depends on the layout, such as the offset arrays or the
+    fit used by a DirectionFinder, is worked out the first time it is needed
+    and then kept with the layout. The arrays must be treated as read only.
+    """
+    def __new__(cls, offsets, input_range=DEFAULT_INPUT_RANGE, \
+        output_range=DEFAULT_OUTPUT_RANGE, name=None):
+        """
+        Initialize a layout with the given offsets, each (x, y) or (x, y, z),
+        shared input and output ranges and an optional name
+        """
+        layout = super().__new__(cls, (tuple(float(value) for value in offset) \
+            if len(offset) == 3 else (float(offset[0]), float(offset[1]), 0.0) \
+            for offset in offsets))
+        layout.input_range = tuple(input_range)
+        layout.output_range = tuple(output_range)
+        layout.name = name
+        layout.geometry_id = hash((tuple(layout), layout.input_range, layout.output_range))
+        layout._precomputed = {}
+        return layout
+
+    def __eq__(self, other):
+        if not isinstance(other, SensorLayout):
+            return False
+        return self.geometry_id == other.geometry_id and tuple.__eq__(self, other) \
+            and self.input_range == other.input_range \
+            and self.output_range == other.output_range
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self.geometry_id
+
+    def __reduce__(self):
+        return (self.__class__, (tuple(self), self.input_range, self.output_range, self.name))
+
+    def sensor_count(self):
+        """
+        Query the number of sensors in the layout
+        """
+        return len(self)
+
+    def precompute(self, key, function):
+        """
+        Return function(self), calling it only the first time key is asked
+        for and keeping the result with the layout
+        """
+        try:
+            return self._precomputed[key]
+        except KeyError:
+            value = self._precomputed[key] = function(self)
+            return value
+
+    def offset_arrays(self):
+        """
+        Query the x, y and z offsets of the sensors as arrays
+        """
+        return self.precompute('offset_arrays', lambda layout: \
+            tuple(array('d', column) for column in zip(*layout)) if layout \
+            else (array('d'), array('d'), array('d')))
+
+    def quantizer(self):
+        """
+        Query the SensorQuantizer shared by every sensor in the layout
+        """
+        return self.precompute('quantizer', lambda layout: SensorQuantizer( \
+            [layout.input_range] * len(layout), [layout.output_range] * len(layout)))
+
+    def sensors(self):
+        """
+        Create a new LightSensor at each offset
+        """
+        return [LightSensor(offset, self.input_range, self.output_range) for offset in self]
+
+    def sensor_array(self):
+        """
+        Create a new SensorArray holding the layout, copied from one built
+        the first time it was asked for
+        """
+        return self.precompute('sensor_array', _build_sensor_array).copy()
+
+
+def _build_sensor_array(layout):
+    sensor_array = SensorArray()
+    for offset in layout:
+        sensor_array.add_sensor(offset, layout.input_range, layout.output_range)
+    return sensor_array
+
+
+def compile_layout(spec=None, **overrides):
+    """
+    Compile a spec, with any keyword overrides applied, into a SensorLayout.
+    The same spec always compiles to the same shared layout.
+    """
+    spec = dict(DEFAULT_SPEC if spec is None else spec)
+    spec.update(overrides)
+    return _compile(json.dumps(spec, sort_keys=True))
+
+@lru_cache(maxsize=128)
+def _compile(canonical_spec):
+    spec = json.loads(canonical_spec)
+    layout_type = spec.get('type')
+    height = spec.get('height', 10)
+
+    if layout_type == 'ring':
+        count = int(spec['count'])
+        radius = spec['radius']
+        start = math.radians(spec.get('start_angle', 90))
+        sense = -1 if spec.get('clockwise', True) else 1
+        offsets = []
+        for index in range(count):
+            angle = start + sense * 2 * math.pi * index / count
+            offsets.append((_snap(radius * math.cos(angle)), _snap(radius * math.sin(angle)), \
+                height))
+    elif layout_type == 'grid':
+        rows = int(spec['rows'])
+        columns = int(spec['columns'])
+        spacing = spec['spacing']
+        offsets = [((column - (columns - 1) / 2) * spacing, \
+            ((rows - 1) / 2 - row) * spacing, height) \
+            for row in range(rows) for column in range(columns)]
+    elif layout_type == 'custom':
+        offsets = [tuple(offset) if len(offset) == 3 else (offset[0], offset[1], height) \
+            for offset in spec['offsets']]
+    else:
+        raise ValueError("Unknown layout type: " + str(layout_type))
+
+    return SensorLayout(offsets, spec.get('input_range', DEFAULT_INPUT_RANGE), \
+        spec.get('output_range', DEFAULT_OUTPUT_RANGE), spec.get('name'))
+
+def _snap(value):
+    # Keep sensors on an axis exactly on it despite rounding in cos and sin
+    return 0.0 if abs(value) < 1e-9 else value
+
+def load_layout(path, **overrides):
+    """
+    Load a spec from a JSON file and compile it
+    """
+    with open(path) as spec_file:
+        return compile_layout(json.load(spec_file), **overrides)
@@ -4,80 +4,184 @@ A container for LightSensors which provides a fixed physical frame for the
 LightSensors attached to it so that moving the SensorMount affects all
 attached LightSensors appropriately.
 
-SensorMounts allow translations and rotations when specifying a move. Thus
-they do not allow for six degrees of freedom of movement. This is sufficient
-for modeling the movements of a cart, but would not be good enough for a
-flying drone.
+A cart only needs move_to_position, which translates the mount and turns it
+about the vertical axis. For a flying drone move_to_pose also sets the pitch
+and roll of the mount, giving all six degrees of freedom.
 """
 
-import math
+import Rotation
+from SensorArray import SensorArray
+from SensorArray import SensorView
 
 class SensorMount(object):
     """
     Represent an apparatus on which sensors may be mounted such that as
     the SensorMount is moved, the attached sensors are also moved.
+
+    The mount keeps the offset of each sensor from the mount position along
+    with the pose of the mount itself. Moving the mount only updates the
+    pose, and the absolute positions of the sensors are worked out for all
+    of them at once the next time they are read. As every position is
+    computed from the fixed offsets, errors don't build up over many moves.
     """
     def __init__(self):
         """
         Initialize a SensorMount object at the origin with no attached sensors
         """
-        self.sensor_list = []
+        self.sensors = SensorArray()
         self.location = (0, 0, 0)
         self.rotation = 0
+        self.pitch = 0
+        self.roll = 0
+        self.positions = None
+        self.offsets = None
+
+    @classmethod
+    def from_layout(cls, layout):
+        """
+        Create a SensorMount at the origin carrying a sensor at each offset
+        of a SensorLayout
+        """
+        mount = cls()
+        mount.sensors = layout.sensor_array()
+        # The layout holds the same offsets and keeps work which only
+        # depends on them, so it stands in for them until a sensor changes
+        mount.offsets = layout
+        return mount
 
     def add_new_sensor(self, sensor):
         """
-        Attach a new sensor object to the SensorMount
+        Attach a new sensor object to the SensorMount. The sensor's state is
+        copied into the mount, so later changes should be made through the
+        object returned by get_sensor.
         """
-        self.sensor_list.append(sensor)
+        self.sensors.add_sensor(self._to_mount_frame(sensor.current_position()), \
+            sensor.input_range, sensor.output_range)
+        self.positions = None
+        self.offsets = None
 
     def move_to_position(self, location, rotation):
         """
         Move this SensorMount as well as all the attached sensors to
-        the new location defined by the provided translation and rotation
-        """
-        rotation_rads = math.radians(rotation)
-
-        for index, sensor in enumerate(self.sensor_list):
-            current_position = sensor.current_position()
-            relative_x = current_position[0] - self.location[0]
-            relative_y = current_position[1] - self.location[1]
-            relative_z = current_position[2] - self.location[2]
-            # The rotation is calculated about the mount position
-            rotated_x = relative_x * math.cos(rotation_rads) \
-                + relative_y * math.sin(rotation_rads)
-
-            rotated_y = - relative_x * math.sin(rotation_rads) \
-                + relative_y * math.cos(rotation_rads)
-
-            # ASSUMPITION: Our mount operates on a flat plane
-            rotated_z = relative_z
-
-            # Translate back to absolute coordinates
-            rotated_position = (rotated_x + self.location[0], \
-                rotated_y + self.location[1], \
-                    rotated_z + self.location[2] )
-
-            # The translation is the difference in the coordinates between
-            # the initial and final position.
-            new_x = rotated_position[0] \
-                + (location[0] - self.location[0])
-            new_y = rotated_position[1] \
-                + (location[1] - self.location[1])
-            new_z = rotated_position[2] \
-                + (location[2] - self.location[2])
-
-            new_sensor_position = (new_x, new_y, new_z)
-            sensor.move_to_position(new_sensor_position)
-            self.sensor_list[index] = sensor
+        the new location defined by the provided translation and rotation.
+        The rotation is in degrees and is relative to the current heading of
+        the SensorMount.
+        """
+        self.location = location
+        # Keep the heading within a single turn so that it doesn't build up
+        # over many moves
+        self.rotation = (self.rotation + rotation) % 360
+        self.positions = None
 
+    def move_to_pose(self, location, yaw, pitch=0, roll=0):
+        """
+        Move this SensorMount to an absolute pose. Unlike move_to_position
+        the yaw replaces the current heading rather than adding to it. All
+        angles are in degrees, as described in the Rotation module.
+        """
         self.location = location
+        self.rotation = yaw
+        self.pitch = pitch
+        self.roll = roll
+        self.positions = None
 
     def get_sensor(self, sensor_index):
-        return self.sensor_list[sensor_index]
+        if sensor_index < 0:
+            sensor_index += len(self.sensors)
+        if not 0 <= sensor_index < len(self.sensors):
+            raise IndexError("sensor index out of range")
+        return MountedSensorView(self, sensor_index)
+
+    def sensor_count(self):
+        """
+        Query the number of sensors attached to the SensorMount
+        """
+        return len(self.sensors)
+
+    def sensor_positions(self):
+        """
+        Query the absolute position of every attached sensor as a list of
+        (x, y, z)
+        """
+        if self.positions is None:
+            self.positions = list(zip(*self.sensors.transformed( \
+                self._matrix(), (0, 0, 0), self.location)))
+        return self.positions
+
+    def sensor_offsets(self):
+        """
+        Query the offset of every attached sensor from the mount position,
+        in the mount's own frame, as a tuple of (x, y, z). The offsets don't
+        change as the mount moves, so the same tuple is returned until a
+        sensor is added or moved. A mount created from a SensorLayout
+        returns the layout itself.
+        """
+        if self.offsets is None:
+            self.offsets = tuple(self.sensors.positions())
+        return self.offsets
+
+    def to_world_direction(self, direction):
+        """
+        Turn a direction found from the sensor offsets, either (x, y) or
+        (x, y, z), into the world frame
+        """
+        x, y, z = Rotation.rotate(self._matrix(), (direction[0], direction[1], \
+            direction[2] if len(direction) > 2 else 0))
+        return (x, y, z) if len(direction) > 2 else (x, y)
+
+    def set_sensor_position(self, sensor_index, location):
+        """
+        Move a single attached sensor to the specified absolute location
+        """
+        self.sensors.set_position(sensor_index, self._to_mount_frame(location))
+        self.positions = None
+        self.offsets = None
 
     def current_position(self):
         """
         Query for the current position of the SensorMount
         """
         return self.location
+
+    def current_heading(self):
+        """
+        Query for the rotation of the SensorMount in degrees. Headings
+        reached by move_to_position are within [0, 360).
+        """
+        return self.rotation
+
+    def current_attitude(self):
+        """
+        Query for the (yaw, pitch, roll) of the SensorMount in degrees
+        """
+        return (self.rotation, self.pitch, self.roll)
+
+    def _matrix(self):
+        return Rotation.attitude_matrix(self.rotation, self.pitch, self.roll)
+
+    def _to_mount_frame(self, location):
+        """
+        Convert an absolute location into an offset from the mount position
+        """
+        # The inverse of a rotation is its transpose
+        return Rotation.rotate(Rotation.transpose(self._matrix()), \
+            (location[0] - self.location[0], location[1] - self.location[1], \
+            location[2] - self.location[2]))
+
+
+class MountedSensorView(SensorView):
+    """
+    A LightSensor attached to a SensorMount. Its location is the absolute
+    position worked out from the mount pose and its offset.
+    """
+    def __init__(self, mount, sensor_index):
+        SensorView.__init__(self, mount.sensors, sensor_index)
+        self.mount = mount
+
+    @property
+    def location(self):
+        return self.mount.sensor_positions()[self.sensor_index]
+
+    @location.setter
+    def location(self, location):
+        self.mount.set_sensor_position(self.sensor_index, location)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Models the imperfections of real light sensors and their A/D so strategies
+can be compared under the conditions seen on the floor. A SensorNoise
+describes the noise and faults, and a NoisyQuantizer applies them in place
+of a SensorQuantizer:
+    shot noise      varies with the square root of the incident light
+    read noise      a fixed spread in output counts added to every sample
+    mismatch        a fixed gain and offset error for each sensor
+    stuck channels  sensors which always give the same output
+    dead channels   sensors which always give the bottom of their range
+    garbage         samples replaced by a value which isn't a valid
+                    amplitude, as a glitchy bus might deliver
+
+Every random value is worked out from the seed, the id of the frame, the
+sensor and what the value is for, by hashing them together rather than by
+stepping a generator. A frame therefore always gets the same noise however
+many frames came before it or which process generates it, so frames can be
+generated in any order or in parallel and still be reproduced exactly.
+"""
+
+import math
+from array import array
+
+# Values substituted for a garbage sample, none of which FindDirection
+# accepts as an amplitude
+GARBAGE_VALUES = (-1, 0.5, None, 'ERR')
+
+# Identifiers of the independent random streams
+_SHOT = 1
+_READ = 2
+_GARBAGE = 3
+_GARBAGE_VALUE = 4
+_GAIN = 5
+_OFFSET = 6
+_STUCK = 7
+_STUCK_VALUE = 8
+_DEAD = 9
+
+_MASK = (1 << 64) - 1
+
+def _mix(value):
+    # The SplitMix64 finalizer, which scrambles every bit of a 64 bit value
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK
+    return value ^ (value >> 31)
+
+def uniform(seed, stream, frame_id, sensor_index):
+    """
+    A uniform random value in (0, 1) determined only by its arguments
+    """
+    key = _mix((seed * 0x9E3779B97F4A7C15 + stream) & _MASK)
+    key = _mix((key ^ frame_id * 0xD6E8FEB86659FD93) & _MASK)
+    key = _mix((key + sensor_index * 0x9E3779B97F4A7C15) & _MASK)
+    return ((key >> 11) + 0.5) / (1 << 53)
+
+def normal(seed, stream, frame_id, sensor_index):
+    """
+    A standard normal random value determined only by its arguments
+    """
+    # Box-Muller transform of two independent uniform values
+    first = uniform(seed, stream, frame_id, sensor_index)
+    second = uniform(seed, stream + 0x100, frame_id, sensor_index)
+    return math.sqrt(-2.0 * math.log(first)) * math.cos(2.0 * math.pi * second)
+
+
+class SensorNoise(object):
+    """
+    The noise and faults of a group of sensors. Every parameter defaults to
+    a perfect sensor.
+    """
+    def __init__(self, seed=0, shot_noise=0.0, read_noise=0.0, gain_mismatch=0.0, \
+        offset_mismatch=0.0, stuck_probability=0.0, dead_probability=0.0, \
+        garbage_probability=0.0, garbage_values=GARBAGE_VALUES):
+        """
+        Initialize a noise model. shot_noise scales the square root of the
+        incident light to give the spread of the light, in input units.
+        read_noise is the spread of the output in counts. gain_mismatch is
+        the spread of each sensor's relative gain error and offset_mismatch
+        the spread of its offset in counts. Each sensor is stuck or dead with
+        the given probability, and each sample is replaced by one of the
+        garbage_values with garbage_probability.
+        """
+        self.seed = seed
+        self.shot_noise = shot_noise
+        self.read_noise = read_noise
+        self.gain_mismatch = gain_mismatch
+        self.offset_mismatch = offset_mismatch
+        self.stuck_probability = stuck_probability
+        self.dead_probability = dead_probability
+        self.garbage_probability = garbage_probability
+        self.garbage_values = tuple(garbage_values)
+
+    def channel_faults(self, lows, highs):
+        """
+        Query the fixed faults of sensors with the given output ranges. Returns
+        the gain and offset errors of each sensor along with the output each
+        sensor is stuck at, or None for a working sensor.
+        """
+        seed = self.seed
+        gains = [1.0 + self.gain_mismatch * normal(seed, _GAIN, 0, index) \
+            if self.gain_mismatch else 1.0 for index in range(len(lows))]
+        offsets = [self.offset_mismatch * normal(seed, _OFFSET, 0, index) \
+            if self.offset_mismatch else 0.0 for index in range(len(lows))]
+        stuck = []
+        for index, (low, high) in enumerate(zip(lows, highs)):
+            if self.dead_probability and uniform(seed, _DEAD, 0, index) < self.dead_probability:
+                stuck.append(low)
+            elif self.stuck_probability \
+                and uniform(seed, _STUCK, 0, index) < self.stuck_probability:
+                stuck.append(low + int(uniform(seed, _STUCK_VALUE, 0, index) * (high - low + 1)))
+            else:
+                stuck.append(None)
+        return gains, offsets, stuck
+
+
+class NoisyQuantizer(object):
+    """
+    Converts incident light into sensor outputs like the SensorQuantizer it
+    wraps, with a SensorNoise applied. Frames are numbered in the order they
+    are converted unless their ids are given. A frame holding a garbage
+    sample is returned as a list, as it no longer fits an unsigned array.
+    """
+    def __init__(self, quantizer, noise, first_frame_id=0):
+        """
+        Initialize a quantizer adding noise to the outputs of quantizer
+        """
+        self.quantizer = quantizer
+        self.noise = noise
+        self.typecode = quantizer.typecode
+        self.next_frame_id = first_frame_id
+        self.gains, self.offsets, self.stuck = noise.channel_faults( \
+            quantizer.lows, quantizer.highs)
+
+    def __len__(self):
+        return len(self.quantizer)
+
+    def reset(self, first_frame_id=0):
+        """
+        Start numbering frames from first_frame_id again
+        """
+        self.next_frame_id = first_frame_id
+
+    def quantize(self, incident_light, frame_id=None):
+        """
+        Convert one frame of incident light into noisy sensor outputs
+        """
+        return self.quantize_frames((incident_light,), \
+            None if frame_id is None else (frame_id,))[0]
+
+    def quantize_frames(self, frames, frame_ids=None):
+        """
+        Convert many frames of incident light into noisy sensor outputs,
+        one per frame. frame_ids identify the frames to the random streams,
+        and default to consecutive ids following the last frame converted.
+        """
+        frames = list(frames)
+        quantizer = self.quantizer
+        count = len(quantizer)
+        for frame in frames:
+            if len(frame) != count:
+                raise ValueError("Expected {} values but got {}".format(count, len(frame)))
+        if frame_ids is None:
+            frame_ids = range(self.next_frame_id, self.next_frame_id + len(frames))
+            self.next_frame_id += len(frames)
+
+        noise = self.noise
+        seed = noise.seed
+        sensors = list(zip(quantizer.gains, quantizer.offsets, self.gains, self.offsets, \
+            quantizer.lows, quantizer.highs, self.stuck))
+        outputs = []
+        for frame_id, frame in zip(frame_ids, frames):
+            if noise.shot_noise:
+                frame = [light + noise.shot_noise * math.sqrt(light if light > 0 else 0) \
+                    * normal(seed, _SHOT, frame_id, index) for index, light in enumerate(frame)]
+            values = [(light * gain + offset) * gain_error + offset_error \
+                for light, (gain, offset, gain_error, offset_error, _, _, _) \
+                in zip(frame, sensors)]
+            if noise.read_noise:
+                values = [value + noise.read_noise * normal(seed, _READ, frame_id, index) \
+                    for index, value in enumerate(values)]
+            output = [stuck if stuck is not None else \
+                low if value < low else high if value > high else value \
+                for value, (_, _, _, _, low, high, stuck) \
+                in zip([round(value) for value in values], sensors)]
+
+            if noise.garbage_probability:
+                for index in range(count):
+                    if uniform(seed, _GARBAGE, frame_id, index) < noise.garbage_probability:
+                        output[index] = noise.garbage_values[int(uniform(seed, \
+                            _GARBAGE_VALUE, frame_id, index) * len(noise.garbage_values))]
+                if not all(type(value) is int and value >= 0 for value in output):
+                    outputs.append(output)
+                    continue
+            outputs.append(array(self.typecode, output))
+        return outputs
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Publishes a static scene into shared memory so that worker processes can use
+it without each rebuilding or receiving their own copy. A scene is made up
+of its light sources, optionally an intensity grid precomputed over them and
+any number of named sensor layouts.
+
+The publishing process creates the scene with SharedScene.publish and hands
+its small, picklable descriptor to the workers, which call
+SharedScene.attach. The intensity grid and sensor layouts of an attached
+scene are read straight out of the shared block, so the memory used by each
+worker does not grow with the size of the grid.
+
+Everything is stored as float64 in a single block:
+    sources    x, y, z, intensity and min distance of each source
+    grid       the samples of the intensity grid, if there is one
+    templates  for each layout, its x, y, z, input_low, input_high,
+               output_low and output_high columns in turn
+"""
+
+from array import array
+from multiprocessing import shared_memory
+
+from LightField import IntensityGrid
+from LightField import LightField
+from LightSource import LightSource
+from SensorArray import SensorArray
+
+_ITEM_SIZE = 8
+_SOURCE_FIELDS = 5
+_SENSOR_COLUMNS = ('x', 'y', 'z', 'input_low', 'input_high', 'output_low', 'output_high')
+
+
+class SharedScene(object):
+    """
+    A static scene held in a block of shared memory
+    """
+    def __init__(self, memory, descriptor, owner):
+        """
+        Wrap an existing block of shared memory described by descriptor. Use
+        publish or attach rather than calling this directly.
+        """
+        self.memory = memory
+        self.descriptor = descriptor
+        self.owner = owner
+        self.values = memory.buf.cast('d')
+        self._field = None
+        self._templates = {}
+
+    @classmethod
+    def publish(cls, sources, grid=None, sensor_templates=None):
+        """
+        Copy a scene into a new block of shared memory. grid is an
+        IntensityGrid, such as the one returned by
+        LightField.precompute_grid, and sensor_templates maps names to
+        SensorArrays. The caller owns the block and must unlink it once the
+        workers are finished with it.
+        """
+        sources = list(sources)
+        sensor_templates = dict(sensor_templates or {})
+
+        source_values = [value for source in sources for value in \
+            tuple(source.get_location()[:3]) + (source.get_output_intensity(), source.min_distance)]
+        grid_values = grid.values if grid is not None else ()
+        template_values = []
+        templates = []
+        for name, template in sorted(sensor_templates.items()):
+            for column in _SENSOR_COLUMNS:
+                template_values.extend(getattr(template, column))
+            templates.append((name, len(template)))
+
+        descriptor = {
+            'sources': len(sources),
+            'grid': (grid.axes, grid.interpolation, len(grid_values)) if grid is not None else None,
+            'templates': templates,
+        }
+        count = len(source_values) + len(grid_values) + len(template_values)
+        memory = shared_memory.SharedMemory(create=True, size=max(count, 1) * _ITEM_SIZE)
+        descriptor['name'] = memory.name
+
+        scene = cls(memory, descriptor, owner=True)
+        offset = 0
+        for values in (source_values, grid_values, template_values):
+            scene.values[offset:offset + len(values)] = _as_doubles(values)
+            offset += len(values)
+        return scene
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attach to a scene published by another process
+        """
+        memory = shared_memory.SharedMemory(name=descriptor['name'])
+        return cls(memory, descriptor, owner=False)
+
+    def _grid_offset(self):
+        return self.descriptor['sources'] * _SOURCE_FIELDS
+
+    def _templates_offset(self):
+        grid = self.descriptor['grid']
+        return self._grid_offset() + (grid[2] if grid is not None else 0)
+
+    def sources(self):
+        """
+        Create the LightSources of the scene
+        """
+        values = self.values[:self._grid_offset()].tolist()
+        return [LightSource(tuple(values[start:start + 3]), values[start + 3], values[start + 4]) \
+            for start in range(0, len(values), _SOURCE_FIELDS)]
+
+    def light_field(self):
+        """
+        Query a LightField for the scene. When the scene has a grid, the
+        field interpolates it directly from shared memory.
+        """
+        if self._field is None:
+            field = LightField(self.sources())
+            grid = self.descriptor['grid']
+            if grid is not None:
+                axes, interpolation, count = grid
+                start = self._grid_offset()
+                field.grid = IntensityGrid.from_samples(axes, \
+                    self.values[start:start + count], interpolation)
+            self._field = field
+        return self._field
+
+    def template_names(self):
+        """
+        Query the names of the sensor layouts in the scene
+        """
+        return [name for name, _ in self.descriptor['templates']]
+
+    def sensor_template(self, name):
+        """
+        Query a sensor layout as a SensorArray whose columns are read from
+        shared memory. The layout must be treated as read only.
+        """
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+
+        offset = self._templates_offset()
+        for template_name, count in self.descriptor['templates']:
+            if template_name == name:
+                break
+            offset += count * len(_SENSOR_COLUMNS)
+        else:
+            raise KeyError(name)
+
+        template = SensorArray()
+        for column in _SENSOR_COLUMNS:
+            setattr(template, column, self.values[offset:offset + count])
+            offset += count
+        self._templates[name] = template
+        return template
+
+    def sensors(self, name):
+        """
+        Query the sensors of a layout, ready to be passed to run_model
+        """
+        template = self.sensor_template(name)
+        return [template.get_sensor(index) for index in range(len(template))]
+
+    def close(self):
+        """
+        Detach from the shared memory. Fields and layouts taken from the
+        scene can't be used afterwards.
+        """
+        self._field = None
+        self._templates = {}
+        self.values.release()
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Free the shared memory once every process is done with it. Only the
+        process which published the scene should call this.
+        """
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+        return False
+
+
+def _as_doubles(values):
+    # View a sequence of numbers as float64 values to copy into the block
+    if not isinstance(values, array) or values.typecode != 'd':
+        values = array('d', values)
+    return memoryview(values)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Records the path taken by a cart through a run of the model. Each iteration
+adds the cart position, the move made from it and the error after the move,
+matching the columns written to a ResultsSink. The columns are arrays which
+are allocated up front for the expected number of iterations, so recording
+a run doesn't build a row object per iteration.
+"""
+
+from array import array
+
+from ResultsSink import RESULT_COLUMNS
+
+class Trajectory(object):
+    """
+    The recorded path of a single run, along with the ModelResult summarising
+    it once the run has finished
+    """
+    def __init__(self, capacity=0):
+        """
+        Initialize an empty trajectory with room for capacity iterations. It
+        grows if more are recorded.
+        """
+        self.length = 0
+        self.capacity = capacity
+        self.columns = {column: array('d', bytes(8 * capacity)) for column in RESULT_COLUMNS}
+        self.result = None
+
+    def __len__(self):
+        return self.length
+
+    def record(self, cart_location, move, error):
+        """
+        Add an iteration which moved the cart by move from cart_location,
+        leaving it error away from the light
+        """
+        if self.length == self.capacity:
+            self._grow()
+        index = self.length
+        columns = self.columns
+        columns['cart_x'][index] = cart_location[0]
+        columns['cart_y'][index] = cart_location[1]
+        columns['move_x'][index] = move[0]
+        columns['move_y'][index] = move[1]
+        columns['error'][index] = error
+        self.length = index + 1
+
+    def column(self, name):
+        """
+        Query the recorded values of one of the RESULT_COLUMNS as an array
+        """
+        return self.columns[name][:self.length]
+
+    def positions(self):
+        """
+        Query the (x, y) position of the cart at the start of each iteration
+        """
+        return list(zip(self.column('cart_x'), self.column('cart_y')))
+
+    def moves(self):
+        """
+        Query the (x, y) move made on each iteration
+        """
+        return list(zip(self.column('move_x'), self.column('move_y')))
+
+    def errors(self):
+        """
+        Query the error after each iteration as an array
+        """
+        return self.column('error')
+
+    def write_to(self, results_sink, run_id=0):
+        """
+        Write every recorded iteration to a ResultsSink as rows tagged with
+        run_id
+        """
+        for row in zip(*(self.column(column) for column in RESULT_COLUMNS)):
+            results_sink.write_row(row, run_id)
+
+    def _grow(self):
+        extra = max(self.capacity, 16)
+        for column in self.columns.values():
+            column.frombytes(bytes(8 * extra))
+        self.capacity += extra
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the benchmark suite
+"""
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import Benchmarks
+
+class BenchmarksTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the benchmark
+    helpers
+    """
+
+    def testTimeCall(self):
+        """
+        Confirm that timing a call reports a positive time per call and that
+        the call is actually made.
+        """
+        calls = []
+        seconds = Benchmarks.time_call(lambda: calls.append(1), min_time=0.001)
+
+        self.assertGreater(seconds, 0)
+        self.assertGreater(len(calls), 0)
+
+    def testCompareToBaseline(self):
+        """
+        Confirm that only benchmarks which slowed down by more than the
+        tolerance are reported as regressions.
+        """
+        baseline = {'benchmarks': {
+            'steady': {'seconds_per_call': 1.0},
+            'slower': {'seconds_per_call': 1.0},
+            'faster': {'seconds_per_call': 1.0},
+            'removed': {'seconds_per_call': 1.0},
+        }}
+        results = {'benchmarks': {
+            'steady': {'seconds_per_call': 1.1},
+            'slower': {'seconds_per_call': 1.5},
+            'faster': {'seconds_per_call': 0.5},
+            'added': {'seconds_per_call': 9.0},
+        }}
+        regressions = Benchmarks.compare_to_baseline(results, baseline, tolerance=0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0][0], 'slower')
+        self.assertAlmostEqual(regressions[0][3], 0.5, 6)
+
+    def testBenchmarkResults(self):
+        """
+        Confirm that a benchmark reports results for each requested size
+        """
+        results = Benchmarks.bench_mount_move((8, 16), min_time=0.001)
+
+        self.assertEqual(sorted(results), ['SensorMount.move_and_read[16]', \
+            'SensorMount.move_and_read[8]', 'SensorMount.move_to_position[16]', \
+            'SensorMount.move_to_position[8]'])
+        for result in results.values():
+            self.assertAlmostEqual(result['calls_per_second'] * result['seconds_per_call'], 1, 6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the DirectionFinderFixture
+"""
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import DirectionFinderFixture
+from DirectionFinderFixture import RunOptions
+from FrameFilter import MedianFilter
+from Instrumentation import Instrumentation
+from ResultsSink import MemoryResultsSink
+from SensorNoise import SensorNoise
+
+class DirectionFinderFixtureTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    DirectionFinderFixture
+    """
+
+    def testDefaultScenario(self):
+        """
+        Confirm that the default scenario runs every iteration and reads all
+        eight sensors on each one.
+        """
+        result = DirectionFinderFixture.run_model(results_file=None, \
+            verbosity=DirectionFinderFixture.QUIET)
+
+        self.assertEqual(result.iterations, 24)
+        self.assertEqual(result.sensor_reads, 24 * 8)
+        self.assertEqual(result.initial_error, 60)
+        self.assertEqual(result.converged_iteration, 12)
+
+    def testInstrumentation(self):
+        """
+        Confirm that every stage of an iteration is timed when an
+        Instrumentation is given, along with the frames seen by the
+        DirectionFinder, whose own Instrumentation is left alone.
+        """
+        instrumentation = Instrumentation()
+        direction_finder = DirectionFinderFixture.DirectionFinder()
+        finder_instrumentation = Instrumentation()
+        direction_finder.instrumentation = finder_instrumentation
+        result = DirectionFinderFixture.run_model(results_file=None, \
+            verbosity=DirectionFinderFixture.QUIET, max_iterations=5, \
+            direction_finder=direction_finder, \
+            options=RunOptions(instrumentation=instrumentation))
+        snapshot = instrumentation.Snapshot()
+
+        self.assertEqual(sorted(snapshot['timers']), \
+            ['direction_finding', 'move', 'quantization', 'sensing'])
+        self.assertEqual(snapshot['timers']['sensing']['calls'], result.iterations)
+        self.assertEqual(snapshot['counters'], \
+            {'iterations': result.iterations, 'frames': result.iterations})
+        self.assertIs(direction_finder.instrumentation, finder_instrumentation)
+        self.assertEqual(finder_instrumentation.Snapshot()['counters'], \
+            {'frames': result.iterations})
+
+    def testQuietBatchMatches(self):
+        """
+        Confirm that a quiet run finding its directions in a batch takes the
+        same path as a logged one for every strategy and logs nothing.
+        """
+        for direction_finder in [None, DirectionFinderFixture.GradientDirectionFinder()]:
+            sink = MemoryResultsSink()
+            result = DirectionFinderFixture.run_model(results_file=None, \
+                verbosity=DirectionFinderFixture.SUMMARY, results_sink=sink, \
+                direction_finder=direction_finder)
+            sink.close()
+
+            with self.assertNoLogs(level='DEBUG'):
+                trajectory = DirectionFinderFixture.run_trajectory( \
+                    direction_finder=direction_finder, options=RunOptions(batch=True))
+
+            self.assertEqual(trajectory.result, result)
+            self.assertEqual(len(trajectory), result.iterations)
+            self.assertEqual([tuple(row[1:]) for row in sink.results], \
+                list(zip(*(trajectory.column(column) for column in sink.columns[1:]))))
+
+    def testVerbosity(self):
+        """
+        Confirm that the SUMMARY level only logs how the run finished.
+        """
+        with self.assertLogs(DirectionFinderFixture.logger, level='INFO') as logs:
+            DirectionFinderFixture.run_model(results_file=None, max_iterations=3, \
+                verbosity=DirectionFinderFixture.SUMMARY)
+        self.assertEqual(len(logs.output), 1)
+
+        trajectory = DirectionFinderFixture.run_trajectory(record_trajectory=False, \
+            max_iterations=3)
+        self.assertEqual(len(trajectory), 0)
+        self.assertEqual(trajectory.result.iterations, 3)
+
+    def testFrameFilter(self):
+        """
+        Confirm that a FrameFilter is reset for each run and timed.
+        """
+        frame_filter = MedianFilter()
+        instrumentation = Instrumentation()
+        first = DirectionFinderFixture.run_trajectory(record_trajectory=False, \
+            options=RunOptions(frame_filter=frame_filter, \
+            instrumentation=instrumentation)).result
+        second = DirectionFinderFixture.run_trajectory(record_trajectory=False, \
+            options=RunOptions(frame_filter=frame_filter)).result
+
+        self.assertEqual(first, second)
+        self.assertEqual(instrumentation.Snapshot()['timers']['filtering']['calls'], \
+            first.iterations)
+
+    def testSensorNoise(self):
+        """
+        Confirm that noisy runs are reproduced by their seed and that frames
+        spoiled by garbage are read again.
+        """
+        noise = SensorNoise(seed=2, read_noise=3, garbage_probability=0.05)
+        instrumentation = Instrumentation()
+        first = DirectionFinderFixture.run_trajectory( \
+            options=RunOptions(sensor_noise=noise, instrumentation=instrumentation))
+        second = DirectionFinderFixture.run_trajectory(options=RunOptions(sensor_noise=noise))
+        quiet = DirectionFinderFixture.run_trajectory()
+
+        self.assertEqual(first.result, second.result)
+        self.assertEqual(first.positions(), second.positions())
+        self.assertNotEqual(first.positions(), quiet.positions())
+
+        rereads = instrumentation.Snapshot()['counters']['rereads']
+        self.assertGreater(rereads, 0)
+        self.assertEqual(first.moves().count((0, 0)), rereads)
+
+    def testAllGarbageFrames(self):
+        """
+        Confirm that frames made entirely of one garbage value are read
+        again rather than taken as light falling evenly on every sensor.
+        """
+        for garbage in [None, 'ERR']:
+            noise = SensorNoise(garbage_probability=1.0, garbage_values=(garbage,))
+            instrumentation = Instrumentation()
+            result = DirectionFinderFixture.run_trajectory(max_iterations=3, \
+                options=RunOptions(sensor_noise=noise, instrumentation=instrumentation)).result
+
+            self.assertEqual(result.iterations, 3)
+            self.assertEqual(result.final_error, result.initial_error)
+            counters = instrumentation.Snapshot()['counters']
+            self.assertEqual(counters['rereads'], 3)
+            self.assertEqual(counters['invalid_frames'], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the FleetSimulation
+"""
+import math
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+from FleetSimulation import FleetSimulation
+from FleetSimulation import CONVERGED, EXHAUSTED, RUNNING
+from DirectionFinderFixture import ModelResult
+from LightSensor import LightSensor
+from LightSource import LightSource
+from SensorMount import SensorMount
+from SensorNoise import SensorNoise
+
+RING = [(30 * math.cos(2 * math.pi * index / 8), \
+    30 * math.sin(2 * math.pi * index / 8), 10) for index in range(8)]
+
+class FleetSimulationTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    FleetSimulation
+    """
+
+    def testConvergedCartsLeaveActiveSet(self):
+        """
+        Confirm that a cart which reaches its source stops being simulated
+        while the others carry on.
+        """
+        sources = [LightSource((0, 0, 304), 500)]
+        fleet = FleetSimulation([(3, 0, 0), (200, 0, 0)], sources, RING, \
+            sensor_input_range=(0, 10))
+
+        self.assertEqual(fleet.active, [0, 1])
+        self.assertEqual(fleet.tick(), 1)
+        self.assertEqual(fleet.status[0], CONVERGED)
+        self.assertEqual(fleet.active, [1])
+        self.assertEqual(fleet.status[1], RUNNING)
+
+    def testCartsMoveTowardsTheirSources(self):
+        """
+        Confirm that carts given separate sources each head for their own
+        source and converge on it.
+        """
+        sources = [[LightSource((0, 0, 304), 500)], [LightSource((100, 100, 304), 500)]]
+        fleet = FleetSimulation([(40, 0, 0), (100, 60, 0)], sources, RING, \
+            sensor_input_range=(0, 10))
+        results = fleet.run(max_ticks=24)
+
+        for index, result in enumerate(results):
+            self.assertEqual(fleet.status[index], CONVERGED)
+            self.assertLess(result.final_error, result.initial_error)
+            self.assertLessEqual(result.final_error, fleet.tolerance)
+
+    def testResultsMatchRunModel(self):
+        """
+        Confirm that the results are ModelResults counting every sensor read
+        and that carts out of ticks are marked as exhausted.
+        """
+        sources = [LightSource((0, 0, 304), 500)]
+        fleet = FleetSimulation([(400, 0, 0)], sources, RING, sensor_input_range=(0, 10))
+        results = fleet.run(max_ticks=3)
+
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], ModelResult)
+        self.assertEqual(results[0].iterations, 3)
+        self.assertEqual(results[0].sensor_reads, 3 * len(RING))
+        self.assertIsNone(results[0].converged_iteration)
+        self.assertEqual(fleet.status[0], EXHAUSTED)
+        self.assertEqual(fleet.cart_steps, 3)
+
+    def testSensorPositionsFollowHeading(self):
+        """
+        Confirm that the sensor offsets are rotated by the cart heading, a
+        clockwise yaw in degrees as for a SensorMount.
+        """
+        sources = [LightSource((0, 0, 304), 500)]
+        fleet = FleetSimulation([(10, 20, 0), (10, 20, 0)], sources, RING, \
+            start_headings=[-90, 30])
+        position = fleet.sensor_positions(0)[0]
+
+        self.assertAlmostEqual(position[0], 10)
+        self.assertAlmostEqual(position[1], 50)
+        self.assertAlmostEqual(position[2], 10)
+        self.assertEqual(fleet.heading[0], 270)
+
+        mount = SensorMount()
+        for offset in RING:
+            mount.add_new_sensor(LightSensor(offset, (0, 304), (0, 1023)))
+        mount.move_to_position((10, 20, 0), 30)
+        for position, expected in zip(fleet.sensor_positions(1), mount.sensor_positions()):
+            for value, expected_value in zip(position, expected):
+                self.assertAlmostEqual(value, expected_value)
+
+    def testMismatchedSourcesRejected(self):
+        """
+        Confirm that per cart sources must be given for every cart.
+        """
+        sources = [[LightSource((0, 0, 304), 500)]]
+        with self.assertRaises(ValueError):
+            FleetSimulation([(0, 0, 0), (1, 1, 0)], sources, RING)
+
+    def testSensorNoise(self):
+        """
+        Confirm that the noise seen by a cart doesn't depend on the rest of
+        the fleet.
+        """
+        sources = [LightSource((0, 0, 304), 500)]
+        noise = SensorNoise(seed=1, read_noise=2)
+        alone = FleetSimulation([(60, 0, 0)], sources, RING, sensor_input_range=(0, 10), \
+            sensor_noise=noise).run()
+        together = FleetSimulation([(60, 0, 0), (0, 80, 0)], sources, RING, \
+            sensor_input_range=(0, 10), sensor_noise=noise).run()
+        quiet = FleetSimulation([(60, 0, 0)], sources, RING, \
+            sensor_input_range=(0, 10)).run()
+
+        self.assertEqual(together[0], alone[0])
+        self.assertNotEqual(alone[0].final_error, quiet[0].final_error)
+
+    def testGarbageFramesAreReread(self):
+        """
+        Confirm that a cart whose frame is spoiled by garbage stays where it
+        is, keeps running and reads its sensors again, as in run_model.
+        """
+        sources = [LightSource((0, 0, 304), 500)]
+        start_locations = [(60 * math.cos(index / 10 * math.pi), \
+            60 * math.sin(index / 10 * math.pi), 0) for index in range(20)]
+        fleet = FleetSimulation(start_locations, sources, RING, sensor_input_range=(0, 10), \
+            sensor_noise=SensorNoise(seed=2, read_noise=3, garbage_probability=0.05))
+        fleet.tick()
+        fleet.tick()
+        moved = {index: (fleet.x[index], fleet.y[index]) for index in range(len(fleet))}
+        rereads = fleet.rereads[:]
+        fleet.tick()
+        for index in range(len(fleet)):
+            if fleet.rereads[index] > rereads[index]:
+                self.assertEqual((fleet.x[index], fleet.y[index]), moved[index])
+
+        results = fleet.run(max_ticks=48)
+        self.assertGreater(sum(fleet.rereads), 0)
+        self.assertEqual(list(fleet.status), [CONVERGED] * len(fleet))
+        for result in results:
+            self.assertEqual(result.converged_iteration, result.iterations)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LightField object
+"""
+
+import sys
+import unittest
+sys.path.append("..")
+from LightField import LightField
+from LightSource import LightSource
+
+class LightFieldTests(unittest.TestCase):
+    """
+    Tests for the proper operation of the LightField object
+    """
+    def testSingleSourceMatchesLightSource(self):
+        """
+        Make sure that a field with one source reports the same intensity as
+        the source itself.
+        """
+        source = LightSource((200, 300, 700), 505)
+        field_under_test = LightField([source])
+
+        locations = [(300, 300, 700), (400, 300, 700), (0, 0, 0)]
+        intensities = field_under_test.get_intensity_at_locations(locations)
+        for location, intensity in zip(locations, intensities):
+            self.assertAlmostEqual(intensity, \
+                source.get_intensity_at_location(location), 6)
+
+    def testSourcesAreSummed(self):
+        """
+        Make sure that the intensity from multiple sources is summed
+        """
+        first_source = LightSource((200, 300, 700), 505)
+        second_source = LightSource((0, 300, 700), 505)
+        field_under_test = LightField([first_source, second_source])
+
+        # The location is 1 meter from both sources
+        expected_resultant = 2 * 40.1866231307
+        recorded_intensity = field_under_test.get_intensity_at_location((100, 300, 700))
+        self.assertAlmostEqual(recorded_intensity, expected_resultant, 6)
+
+    def testZeroDistance(self):
+        """
+        Make sure that querying the intensity at the location of a source does
+        not divide by zero.
+        """
+        source = LightSource((200, 300, 700), 505)
+        field_under_test = LightField([source])
+
+        recorded_intensity = field_under_test.get_intensity_at_location((200, 300, 700))
+        self.assertAlmostEqual(recorded_intensity, \
+            source.get_intensity_at_location((200, 300, 700)), 6)
+
+    def testGridNodesAreExact(self):
+        """
+        Make sure that querying a precomputed grid at one of its nodes gives
+        the exact intensity for both interpolation modes.
+        """
+        source = LightSource((0, 0, 304), 500)
+        field_under_test = LightField([source])
+
+        for interpolation in LightField.INTERPOLATION_MODES:
+            field_under_test.precompute_grid((-100, 100, 10), (-100, 100, 10), \
+                (10, 10, 1), interpolation)
+            recorded_intensity = field_under_test.get_intensity_at_location((30, -20, 10))
+            self.assertAlmostEqual(recorded_intensity, \
+                source.get_intensity_at_location((30, -20, 10)), 9)
+
+    def testGridInterpolation(self):
+        """
+        Make sure that linear interpolation between grid nodes stays close to
+        the exact intensity.
+        """
+        source = LightSource((0, 0, 304), 500)
+        field_under_test = LightField([source])
+        field_under_test.precompute_grid((-100, 100, 5), (-100, 100, 5), (0, 20, 5))
+
+        location = (12.5, -31.3, 7.2)
+        exact_intensity = source.get_intensity_at_location(location)
+        recorded_intensity = field_under_test.get_intensity_at_location(location)
+        self.assertAlmostEqual(recorded_intensity / exact_intensity, 1.0, 3)
+
+    def testOutsideGrid(self):
+        """
+        Make sure that locations outside of the grid are evaluated exactly
+        """
+        source = LightSource((0, 0, 304), 500)
+        field_under_test = LightField([source])
+        field_under_test.precompute_grid((-10, 10, 5), (-10, 10, 5), (0, 0, 1))
+
+        location = (60, 0, 0)
+        self.assertAlmostEqual(field_under_test.get_intensity_at_location(location), \
+            source.get_intensity_at_location(location), 9)
+
+    def testAddingSourceClearsGrid(self):
+        """
+        Make sure that a grid computed before a source is added is not used
+        """
+        field_under_test = LightField([LightSource((0, 0, 304), 500)])
+        field_under_test.precompute_grid((-10, 10, 5), (-10, 10, 5), (0, 0, 1))
+        field_under_test.add_source(LightSource((100, 0, 304), 500))
+
+        self.assertIsNone(field_under_test.grid)
+
+if __name__ == "__main__":
+    unittest.main()
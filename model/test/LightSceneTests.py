@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LightScene object
+"""
+
+import random
+import sys
+import unittest
+sys.path.append("..")
+from LightField import LightField
+from LightScene import LightScene
+from LightSource import LightSource
+
+def warehouse(count, seed=0):
+    rng = random.Random(seed)
+    return [LightSource((rng.uniform(0, 5000), rng.uniform(0, 5000), 600), \
+        rng.uniform(100, 500)) for _ in range(count)]
+
+def query_points(count, seed=1):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 5000), rng.uniform(0, 5000), 10) for _ in range(count)]
+
+class LightSceneTests(unittest.TestCase):
+    """
+    Tests for the proper operation of the LightScene object
+    """
+    def testExactWithoutApproximation(self):
+        """
+        Make sure that with approximation turned off the scene matches a
+        LightField over the same sources.
+        """
+        sources = warehouse(200)
+        points = query_points(50)
+        expected = LightField(sources).get_intensity_at_locations(points)
+        scene_under_test = LightScene(sources, theta=0)
+
+        for intensity, expected_intensity in zip( \
+            scene_under_test.get_intensity_at_locations(points), expected):
+            self.assertAlmostEqual(intensity / expected_intensity, 1, 9)
+
+    def testApproximationWithinBound(self):
+        """
+        Make sure that approximating distant sources stays within a couple
+        of percent of the exact intensity.
+        """
+        sources = warehouse(1000)
+        points = query_points(50)
+        expected = LightField(sources).get_intensity_at_locations(points)
+        scene_under_test = LightScene(sources, theta=0.5)
+
+        for intensity, expected_intensity in zip( \
+            scene_under_test.get_intensity_at_locations(points), expected):
+            self.assertLess(abs(intensity - expected_intensity) / expected_intensity, 0.02)
+
+    def testCutoffSkipsFarSources(self):
+        """
+        Make sure that sources which can't reach the cutoff are ignored
+        while near sources are still counted.
+        """
+        near = LightSource((0, 0, 100), 500)
+        far = [LightSource((100000 + index * 10, 0, 100), 500) for index in range(100)]
+        scene_under_test = LightScene([near] + far, theta=0, cutoff=1e-3)
+        exact_field = LightField([near] + far)
+
+        # Far sources sharing a leaf with the near source are still counted
+        intensity = scene_under_test.get_intensity_at_location((0, 0, 0))
+        self.assertLess(intensity, exact_field.get_intensity_at_location((0, 0, 0)) - 1e-3)
+        self.assertAlmostEqual(intensity, near.get_intensity_at_location((0, 0, 0)), 3)
+
+    def testAddSourceRebuildsIndex(self):
+        """
+        Make sure that a source added after a query is included in later
+        queries.
+        """
+        scene_under_test = LightScene()
+        self.assertEqual(scene_under_test.get_intensity_at_locations([(0, 0, 0)]), [0.0])
+
+        source = LightSource((0, 0, 100), 500)
+        scene_under_test.add_source(source)
+        self.assertAlmostEqual(scene_under_test.get_intensity_at_location((0, 0, 0)), \
+            source.get_intensity_at_location((0, 0, 0)), 9)
+
+    def testInvalidSettings(self):
+        """
+        Make sure that negative settings are rejected
+        """
+        with self.assertRaises(ValueError):
+            LightScene(theta=-1)
+        with self.assertRaises(ValueError):
+            LightScene(cutoff=-1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ import sys
 import unittest
 sys.path.append("..")
 from LightSensor import LightSensor
+from LightSensor import SensorQuantizer
 
 class LightSensorTests(unittest.TestCase):
     """
@@ -90,5 +91,48 @@ class LightSensorTests(unittest.TestCase):
         self.assertEqual(sensor_under_test.output_from_sources(incident_light), \
         expected_output_light)
 
+    def testSaturatedTranslation(self):
+        """
+        Confirm that inputs outside of the input range saturate at the ends of
+        the output range.
+        """
+        initial_location = (1, 5, 3)
+        initial_input_range = (0, 304)
+        initial_output_range = (0, 1023)
+        sensor_under_test = LightSensor(initial_location, initial_input_range, \
+        initial_output_range)
+
+        self.assertEqual(sensor_under_test.output_from_sources(500), 1023)
+        self.assertEqual(sensor_under_test.output_from_sources(-5), 0)
+
+    def testQuantizerMatchesSensors(self):
+        """
+        Confirm that a SensorQuantizer converts a frame of incident light the
+        same way as the individual LightSensors it was created from.
+        """
+        sensors = []
+        sensors.append(LightSensor((1, 5, 3), (1, 5), (1, 5)))
+        sensors.append(LightSensor((1, 5, 3), (1, 5), (2, 6)))
+        sensors.append(LightSensor((1, 5, 3), (1, 5), (2, 10)))
+        sensors.append(LightSensor((1, 5, 3), (0, 304), (0, 1023)))
+        quantizer_under_test = SensorQuantizer.from_sensors(sensors)
+
+        frames = [(4, 4, 4, 4), (1, 5, 3.3, 151.2), (0, 9, -1, 900)]
+        outputs = quantizer_under_test.quantize_frames(frames)
+        for frame, output in zip(frames, outputs):
+            expected = [sensor.output_from_sources(light) \
+                for sensor, light in zip(sensors, frame)]
+            self.assertEqual(list(output), expected)
+
+    def testQuantizerOutputType(self):
+        """
+        Confirm that a 10 bit A/D produces unsigned 16 bit outputs
+        """
+        quantizer_under_test = SensorQuantizer([(0, 304)], [(0, 1023)])
+        output = quantizer_under_test.quantize([1000])
+
+        self.assertEqual(output.typecode, 'H')
+        self.assertEqual(list(output), [1023])
+
 if __name__ == "__main__":
     unittest.main()
@@ -68,5 +68,20 @@ class LightSourceTests(unittest.TestCase):
         recorded_intensity = source_under_test.get_intensity_at_location(sensor_location)
         self.assertAlmostEqual(recorded_intensity, expected_resultant, 6)
 
+    def testIntensityAtSource(self):
+        """
+        Make sure that a LightSource object reports a finite intensity at its
+        own location by treating it as being the minimum distance away.
+        """
+        initial_location = (200, 300, 700)
+        intensity = 505
+        source_under_test = LightSource(initial_location, intensity, 100)
+
+        # With a minimum distance of 1 meter the result matches the intensity
+        # at one meter.
+        expected_resultant = 40.1866231307
+        recorded_intensity = source_under_test.get_intensity_at_location(initial_location)
+        self.assertAlmostEqual(recorded_intensity, expected_resultant, 6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the MotionControllers
+"""
+import math
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import DirectionFinderFixture
+from MotionController import LineSearchController
+from MotionController import MotionController
+from MotionController import ProportionalStepController
+from MotionController import StepHalvingController
+
+FRAME = [5, 5, 5, 5]
+
+class MotionControllerTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    MotionControllers
+    """
+
+    def testFixedStep(self):
+        """
+        Confirm that the default controller always moves the step size and
+        stays put when given no direction.
+        """
+        controller = MotionController(5)
+
+        self.assertEqual(controller.next_move([30, 40], FRAME), [3, 4])
+        self.assertEqual(controller.next_move([-30, -40], FRAME), [-3, -4])
+        self.assertEqual(controller.next_move([0, 0], FRAME), [0, 0])
+
+    def testStopAfterReversals(self):
+        """
+        Confirm that turning back max_reversals times in a row stops the
+        cart.
+        """
+        controller = MotionController(5, max_reversals=2)
+
+        self.assertEqual(controller.next_move([1, 0], FRAME), [5, 0])
+        self.assertEqual(controller.next_move([-1, 0], FRAME), [-5, 0])
+        self.assertEqual(controller.next_move([1, 0], FRAME), [0, 0])
+        self.assertTrue(controller.stopped)
+
+        controller.reset()
+        self.assertFalse(controller.stopped)
+        self.assertEqual(controller.next_move([1, 0], FRAME), [5, 0])
+
+    def testStepHalving(self):
+        """
+        Confirm that the step halves on each overshoot and that the cart
+        stops once it falls below the minimum step.
+        """
+        controller = StepHalvingController(8, min_step=2)
+
+        self.assertEqual(controller.next_move([1, 0], FRAME), [8, 0])
+        self.assertEqual(controller.next_move([1, 0], FRAME), [8, 0])
+        self.assertEqual(controller.next_move([-1, 0], FRAME), [-4, 0])
+        self.assertEqual(controller.next_move([0, 1], FRAME), [0, 4])
+        self.assertEqual(controller.next_move([0, -1], FRAME), [0, -2])
+        self.assertEqual(controller.next_move([0, 1], FRAME), [0, 0])
+
+    def testLineSearch(self):
+        """
+        Confirm that the step grows while the light brightens and shrinks
+        once it dims.
+        """
+        controller = LineSearchController(4, growth=2, shrink=0.5, max_step=10)
+
+        self.assertEqual(controller.next_move([1, 0], [1, 1]), [4, 0])
+        self.assertEqual(controller.next_move([1, 0], [2, 2]), [8, 0])
+        self.assertEqual(controller.next_move([1, 0], [3, 3]), [10, 0])
+        self.assertEqual(controller.next_move([1, 0], [2, 3]), [5, 0])
+
+    def testProportionalStep(self):
+        """
+        Confirm that the step follows the contrast across the sensors up to
+        the maximum step.
+        """
+        controller = ProportionalStepController(gain=10, max_step=4)
+
+        move = controller.next_move([0, 1], [11, 9])
+        self.assertAlmostEqual(move[1], 1)
+        move = controller.next_move([0, 1], [30, 10])
+        self.assertAlmostEqual(move[1], 4)
+        self.assertEqual(controller.next_move([0, 1], [10, 10]), [0, 0])
+
+    def testFixtureReportsSavings(self):
+        """
+        Confirm that the fixture reports the iterations and reads each
+        controller saves over the fixed step.
+        """
+        comparison = DirectionFinderFixture.compare_motion_controllers()
+        baseline = comparison[0][1]
+
+        self.assertEqual(comparison[0][2:], (0, 0))
+        for name, result, saved_iterations, saved_reads in comparison[1:]:
+            self.assertEqual(saved_iterations, baseline.iterations - result.iterations)
+            self.assertEqual(saved_reads, baseline.sensor_reads - result.sensor_reads)
+            self.assertGreater(saved_iterations, 0)
+            self.assertLess(result.final_error, DirectionFinderFixture.STEP_SIZE)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the PipelinedFixture
+"""
+import math
+import sys
+import time
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import DirectionFinderFixture
+from DirectionFinderFixture import RunOptions
+from PipelinedFixture import PipelinedFixture
+from PipelinedFixture import STAGES
+from PipelinedFixture import run_pipelined
+from ResultsSink import MemoryResultsSink
+from SensorNoise import SensorNoise
+
+def cart_arguments(count):
+    return [{'start_location': (60 * math.cos(index), 60 * math.sin(index), 0), \
+        'direction_finder': DirectionFinderFixture.GradientDirectionFinder(), \
+        'sensors': DirectionFinderFixture.default_layout((0, 10)), \
+        'follow_direction': True, \
+        'options': RunOptions(sensor_noise=SensorNoise(seed=index, read_noise=1))} \
+        for index in range(count)]
+
+class FailingSink(MemoryResultsSink):
+    def _write_rows(self, rows):
+        raise IOError("disk full")
+
+class SlowFailingSink(MemoryResultsSink):
+    def write_row(self, row, run_id=0):
+        time.sleep(0.1)
+        raise IOError("disk full")
+
+class PipelinedFixtureTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    PipelinedFixture
+    """
+
+    def testMatchesRunModel(self):
+        """
+        Confirm that every cart ends up where run_model takes it and writes
+        the same rows.
+        """
+        sink = MemoryResultsSink(buffer_rows=16)
+        results, depths = run_pipelined(cart_arguments(6), sink)
+        sink.close()
+
+        expected_sink = MemoryResultsSink()
+        expected = [DirectionFinderFixture.run_model(results_file=None, \
+            verbosity=DirectionFinderFixture.QUIET, results_sink=expected_sink, \
+            run_id=run_id, **arguments) for run_id, arguments in enumerate(cart_arguments(6))]
+        expected_sink.close()
+
+        self.assertEqual(results, expected)
+        self.assertEqual(sorted(sink.results), sorted(expected_sink.results))
+        for run_id in range(6):
+            self.assertEqual([row for row in sink.results if row[0] == run_id], \
+                [row for row in expected_sink.results if row[0] == run_id])
+
+        self.assertEqual(sorted(depths), sorted(STAGES))
+        self.assertEqual(depths['sensing']['items'], sum(result.iterations for result in results))
+        self.assertLessEqual(depths['sensing']['max_depth'], 6)
+        self.assertEqual(depths['deciding']['depth'], 0)
+
+    def testNothingToRun(self):
+        """
+        Confirm that carts with no iterations finish straight away.
+        """
+        fixture = PipelinedFixture()
+        fixture.add_cart(max_iterations=0)
+
+        self.assertEqual(fixture.run()[0].iterations, 0)
+        self.assertEqual(fixture.queue_depths()['sensing']['items'], 0)
+
+    def testWriteErrors(self):
+        """
+        Confirm that an error writing the results is raised from run.
+        """
+        fixture = PipelinedFixture(FailingSink(buffer_rows=1))
+        fixture.add_cart()
+
+        with self.assertRaises(IOError):
+            fixture.run()
+
+    def testWriteErrorsWithFullQueue(self):
+        """
+        Confirm that an error writing the results is raised from run even
+        when the writing queue is full once every cart has finished.
+        """
+        fixture = PipelinedFixture(SlowFailingSink(), write_queue_size=1)
+        fixture.add_cart(max_iterations=2)
+
+        with self.assertRaises(IOError):
+            fixture.run()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the ResultsSink objects
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+sys.path.append("..")
+from ResultsSink import ColumnarResultsSink
+from ResultsSink import CsvResultsSink
+from ResultsSink import MemoryResultsSink
+from ResultsSink import read_columnar_results
+
+class ResultsSinkTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the result sinks
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testRowsAreBuffered(self):
+        """
+        Confirm that rows are only written out once the buffer is full
+        """
+        sink_under_test = MemoryResultsSink(('a', 'b'), buffer_rows=2)
+        sink_under_test.write_row((1, 2), 5)
+        self.assertEqual(sink_under_test.results, [])
+
+        sink_under_test.write_row((3, 4), 6)
+        self.assertEqual(sink_under_test.results, [(5, 1, 2), (6, 3, 4)])
+
+    def testWrongRowLength(self):
+        """
+        Confirm that a row with the wrong number of values is rejected
+        """
+        sink_under_test = MemoryResultsSink(('a', 'b'))
+        self.assertRaises(ValueError, sink_under_test.write_row, (1, 2, 3))
+
+    def testCsvSink(self):
+        """
+        Confirm that the CSV sink appends every row tagged with its run id
+        """
+        path = os.path.join(self.directory, 'results.csv')
+        with CsvResultsSink(path, ('a', 'b'), buffer_rows=2) as sink_under_test:
+            for run_id in range(3):
+                sink_under_test.write_row((run_id * 1.5, 2), run_id)
+
+        with open(path, newline='') as results_file:
+            rows = list(csv.reader(results_file))
+        self.assertEqual(rows, [['0', '0.0', '2'], ['1', '1.5', '2'], ['2', '3.0', '2']])
+
+    def testColumnarSink(self):
+        """
+        Confirm that the columnar sink writes chunks which can be read back
+        """
+        path = os.path.join(self.directory, 'results')
+        with ColumnarResultsSink(path, ('a', 'b'), buffer_rows=2) as sink_under_test:
+            for run_id in range(3):
+                sink_under_test.write_row((run_id * 1.5, 2), run_id)
+
+        self.assertEqual(len(os.listdir(path)), 2)
+        columns = read_columnar_results(path)
+        self.assertEqual(columns, {'run_id': [0, 1, 2], 'a': [0.0, 1.5, 3.0], \
+            'b': [2.0, 2.0, 2.0]})
+
+if __name__ == "__main__":
+    unittest.main()
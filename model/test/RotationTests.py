@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the Rotation module
+"""
+import math
+import sys
+import unittest
+sys.path.append("..")
+import Rotation
+
+class RotationTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the rotation
+    matrices
+    """
+
+    def assertPointAlmostEqual(self, point, expected):
+        for value, expected_value in zip(point, expected):
+            self.assertAlmostEqual(value, expected_value, 9)
+
+    def testYawIsClockwise(self):
+        """
+        Confirm that a positive yaw turns the x axis towards negative y, as
+        SensorMount has always done.
+        """
+        self.assertPointAlmostEqual(Rotation.rotate(Rotation.yaw_matrix(90), (1, 0, 0)), \
+            (0, -1, 0))
+
+    def testYawAngleRoundTrip(self):
+        """
+        Confirm that yaws convert to counter-clockwise radians and back, and
+        that the angle turns the x axis the same way as the yaw matrix.
+        """
+        for yaw in [0, 30, 90, 180, 270, 359.5]:
+            angle = Rotation.yaw_to_angle(yaw)
+            self.assertAlmostEqual(Rotation.angle_to_yaw(angle), yaw, 9)
+            self.assertPointAlmostEqual(Rotation.rotate(Rotation.yaw_matrix(yaw), (1, 0, 0)), \
+                (math.cos(angle), math.sin(angle), 0))
+        self.assertAlmostEqual(Rotation.angle_to_yaw(math.pi / 2), 270, 9)
+        self.assertEqual(Rotation.angle_to_yaw(1e-20), 0.0)
+
+    def testPitchAndRoll(self):
+        """
+        Confirm that pitch raises the x axis and roll raises the y axis.
+        """
+        self.assertPointAlmostEqual(Rotation.rotate( \
+            Rotation.attitude_matrix(0, 30, 0), (1, 0, 0)), (0.8660254038, 0, 0.5))
+        self.assertPointAlmostEqual(Rotation.rotate( \
+            Rotation.attitude_matrix(0, 0, 30), (0, 1, 0)), (0, 0.8660254038, 0.5))
+
+    def testAttitudeOrder(self):
+        """
+        Confirm that a full attitude applies roll, then pitch, then yaw.
+        """
+        matrix = Rotation.attitude_matrix(90, 90, 90)
+        expected = Rotation.rotate(Rotation.yaw_matrix(90), \
+            Rotation.rotate(Rotation.attitude_matrix(0, 90, 0), \
+            Rotation.rotate(Rotation.attitude_matrix(0, 0, 90), (1, 2, 3))))
+        self.assertPointAlmostEqual(Rotation.rotate(matrix, (1, 2, 3)), expected)
+
+    def testTransposeInverts(self):
+        """
+        Confirm that the transpose of a rotation undoes it.
+        """
+        matrix = Rotation.attitude_matrix(17, -40, 123)
+        product = Rotation.multiply(Rotation.transpose(matrix), matrix)
+        for row, identity_row in zip(product, Rotation.IDENTITY):
+            self.assertPointAlmostEqual(row, identity_row)
+
+    def testRepeatedHeadingsAreCached(self):
+        """
+        Confirm that asking for the same heading twice reuses the matrix.
+        """
+        first = Rotation.yaw_matrix(12.34)
+        hits = Rotation.cache_info()['yaw'].hits
+        self.assertIs(Rotation.yaw_matrix(12.34), first)
+        self.assertEqual(Rotation.cache_info()['yaw'].hits, hits + 1)
+
+    def testEquivalentHeadingsShareAMatrix(self):
+        """
+        Confirm that headings a whole number of turns apart, or differing
+        only by rounding, reuse the same matrix.
+        """
+        first = Rotation.yaw_matrix(0.3)
+        self.assertIs(Rotation.yaw_matrix(0.1 + 0.2), first)
+        self.assertIs(Rotation.yaw_matrix(720.3), first)
+        self.assertIs(Rotation.attitude_matrix(-359.7, 360, 0), first)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the ScenarioRunner
+"""
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import ScenarioRunner
+
+class ScenarioRunnerTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    ScenarioRunner
+    """
+
+    def testExpandSweep(self):
+        """
+        Confirm that every combination of listed values is repeated and each
+        scenario gets a unique run id and seed.
+        """
+        sweep = {'sensor_count': [4, 8], 'start_distance': (20, 200)}
+        scenarios = ScenarioRunner.expand_sweep(sweep, repeats=3, base_seed=7)
+
+        self.assertEqual(len(scenarios), 6)
+        self.assertEqual([scenario['run_id'] for scenario in scenarios], list(range(6)))
+        self.assertEqual(len(set(scenario['seed'] for scenario in scenarios)), 6)
+        self.assertEqual([scenario['sensor_count'] for scenario in scenarios], \
+            [4, 4, 4, 8, 8, 8])
+
+    def testRingSensors(self):
+        """
+        Confirm that ring sensors start on the y axis and proceed clockwise
+        """
+        sensors = ScenarioRunner.ring_sensors(4, 30)
+        expected = [(0, 30, 10), (30, 0, 10), (0, -30, 10), (-30, 0, 10)]
+        for sensor, location in zip(sensors, expected):
+            for actual, wanted in zip(sensor.current_position(), location):
+                self.assertAlmostEqual(actual, wanted, 6)
+
+    def testDeterministicAcrossProcesses(self):
+        """
+        Confirm that the results of a sweep do not depend on the number of
+        worker processes used to run it.
+        """
+        scenarios = ScenarioRunner.expand_sweep(repeats=8, base_seed=3)
+        serial = ScenarioRunner.run_scenarios(scenarios, processes=1)
+        parallel = ScenarioRunner.run_scenarios(scenarios, processes=2)
+
+        self.assertEqual(serial, parallel)
+
+    def testSummarize(self):
+        """
+        Confirm that the summary statistics are aggregated correctly
+        """
+        results = []
+        results.append({'run_id': 0, 'converged_iteration': 4, 'final_error': 1.0, \
+            'diverged': False, 'sensor_reads': 28})
+        results.append({'run_id': 1, 'converged_iteration': None, 'final_error': 9.0, \
+            'diverged': True, 'sensor_reads': 168})
+        results.append({'run_id': 2, 'converged_iteration': 6, 'final_error': 2.0, \
+            'diverged': False, 'sensor_reads': 42})
+        summary = ScenarioRunner.summarize(results)
+
+        self.assertEqual(summary['runs'], 3)
+        self.assertAlmostEqual(summary['convergence_rate'], 2 / 3, 6)
+        self.assertAlmostEqual(summary['divergence_rate'], 1 / 3, 6)
+        self.assertEqual(summary['mean_iterations_to_converge'], 5)
+        self.assertEqual(summary['median_final_error'], 2.0)
+        self.assertEqual(summary['max_final_error'], 9.0)
+        self.assertEqual(summary['mean_sensor_reads'], 238 / 3)
+
+    def testCompareDirectionFinders(self):
+        """
+        Confirm that every DirectionFinder class is evaluated on the same
+        scenarios and summarized under its own name.
+        """
+        from DirectionFinder import DirectionFinder
+        from InterpolatingDirectionFinder import CentroidDirectionFinder
+        comparison = ScenarioRunner.compare_direction_finders( \
+            [DirectionFinder, CentroidDirectionFinder], repeats=4, processes=1)
+
+        self.assertEqual(sorted(comparison), ['CentroidDirectionFinder', 'DirectionFinder'])
+        for summary in comparison.values():
+            self.assertEqual(summary['runs'], 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the SensorArray object
+"""
+import sys
+import unittest
+sys.path.append("..")
+from LightSensor import LightSensor
+from SensorArray import SensorArray
+
+class SensorArrayTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the SensorArray
+    object
+    """
+
+    def testAddSensor(self):
+        """
+        Confirm that sensors added to a SensorArray report the location and
+        ranges they were added with.
+        """
+        array_under_test = SensorArray()
+        index = array_under_test.add_sensor((1, 5, 3), (0, 304), (0, 1023))
+
+        self.assertEqual(index, 0)
+        self.assertEqual(len(array_under_test), 1)
+        sensor = array_under_test.get_sensor(0)
+        self.assertEqual(sensor.current_position(), (1, 5, 3))
+        self.assertEqual(sensor.input_range, (0, 304))
+        self.assertEqual(sensor.output_range, (0, 1023))
+
+    def testEmptyRanges(self):
+        """
+        Confirm that a sensor added without ranges reports empty ranges
+        """
+        array_under_test = SensorArray()
+        array_under_test.add_light_sensor(LightSensor((1, 0, 0), (), ()))
+
+        self.assertEqual(array_under_test.get_sensor(0).input_range, ())
+        self.assertEqual(array_under_test.get_sensor(0).output_range, ())
+
+    def testViewWritesThrough(self):
+        """
+        Confirm that moving a sensor through its view updates the array
+        """
+        array_under_test = SensorArray()
+        array_under_test.add_sensor((1, 5, 3), (1, 5), (1, 5))
+        array_under_test.add_sensor((2, 5, 3), (1, 5), (1, 5))
+
+        array_under_test.get_sensor(1).move_to_position((7, 8, 9))
+        self.assertEqual(array_under_test.positions(), [(1, 5, 3), (7, 8, 9)])
+
+    def testViewOutput(self):
+        """
+        Confirm that a view translates incident light the same way as a
+        LightSensor with the same ranges.
+        """
+        array_under_test = SensorArray()
+        array_under_test.add_sensor((1, 5, 3), (1, 5), (2, 10))
+        reference_sensor = LightSensor((1, 5, 3), (1, 5), (2, 10))
+
+        self.assertEqual(array_under_test.get_sensor(0).output_from_sources(4), \
+            reference_sensor.output_from_sources(4))
+
+    def testTransform(self):
+        """
+        Confirm that a transform rotates every sensor about the origin point
+        and translates it to the destination.
+        """
+        array_under_test = SensorArray()
+        array_under_test.add_sensor((1, 0, 0), (), ())
+        array_under_test.add_sensor((2, 1, 0), (), ())
+
+        # 90 degree rotation about (1, 1, 0) followed by a move to (3, 3, 1)
+        rotation_matrix = ((0, 1, 0), (-1, 0, 0), (0, 0, 1))
+        array_under_test.transform(rotation_matrix, (1, 1, 0), (3, 3, 1))
+
+        self.assertEqual(array_under_test.positions(), [(2, 3, 1), (3, 2, 1)])
+
+    def testIndexOutOfRange(self):
+        """
+        Confirm that requesting a sensor that doesn't exist raises an
+        IndexError just like indexing a list would.
+        """
+        array_under_test = SensorArray()
+        array_under_test.add_sensor((1, 0, 0), (), ())
+
+        self.assertRaises(IndexError, array_under_test.get_sensor, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the SensorLayout module
+"""
+import json
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+from SensorLayout import SensorLayout
+from SensorLayout import compile_layout
+from SensorLayout import load_layout
+from SensorMount import SensorMount
+from InterpolatingDirectionFinder import GradientDirectionFinder
+
+class SensorLayoutTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the SensorLayout
+    specs
+    """
+
+    def testDefaultRing(self):
+        """
+        Confirm that the default spec gives the eight sensors the fixture has
+        always used, with the first on the positive y axis.
+        """
+        layout = compile_layout()
+
+        self.assertEqual(layout.sensor_count(), 8)
+        self.assertEqual(layout[0], (0.0, 30.0, 10.0))
+        self.assertEqual(layout[2], (30.0, 0.0, 10.0))
+        self.assertEqual(layout[4], (0.0, -30.0, 10.0))
+        self.assertEqual(layout[6], (-30.0, 0.0, 10.0))
+        self.assertEqual(layout.input_range, (0, 304))
+        self.assertEqual(layout.output_range, (0, 1023))
+
+    def testGridAndCustom(self):
+        """
+        Confirm that grids are centred on the mount and custom offsets take
+        the default height.
+        """
+        grid = compile_layout({'type': 'grid', 'rows': 2, 'columns': 3, 'spacing': 10})
+        self.assertEqual(list(grid), [(-10, 5, 10), (0, 5, 10), (10, 5, 10), \
+            (-10, -5, 10), (0, -5, 10), (10, -5, 10)])
+
+        custom = compile_layout({'type': 'custom', 'offsets': [[1, 2], [3, 4, 5]]})
+        self.assertEqual(list(custom), [(1, 2, 10), (3, 4, 5)])
+
+        with self.assertRaises(ValueError):
+            compile_layout({'type': 'hexagon'})
+
+    def testCompiledOnce(self):
+        """
+        Confirm that equal specs share one hashable layout and that what it
+        works out is kept with it.
+        """
+        layout = compile_layout(count=6)
+        self.assertIs(compile_layout({'count': 6, 'type': 'ring', 'radius': 30, \
+            'height': 10}), layout)
+        self.assertEqual(hash(layout), hash(compile_layout(count=6)))
+        self.assertIs(layout.offset_arrays(), layout.offset_arrays())
+        self.assertIs(layout.quantizer(), layout.quantizer())
+
+        calls = []
+        layout.precompute('test', calls.append)
+        layout.precompute('test', calls.append)
+        self.assertEqual(calls, [layout])
+
+    def testEqualityMatchesGeometryId(self):
+        """
+        Confirm that layouts are equal and hash the same only when their
+        offsets and ranges match, as their geometry_id does.
+        """
+        offsets = [(0, 30, 10), (30, 0, 10)]
+        layout = SensorLayout(offsets)
+        same = SensorLayout(offsets, name="same")
+        narrower = SensorLayout(offsets, input_range=(0, 100))
+        coarser = SensorLayout(offsets, output_range=(0, 255))
+
+        self.assertEqual(layout, same)
+        self.assertEqual(hash(layout), hash(same))
+        self.assertEqual(hash(layout), layout.geometry_id)
+        self.assertNotEqual(layout, narrower)
+        self.assertNotEqual(layout, coarser)
+        self.assertNotEqual(layout, tuple(layout))
+        self.assertEqual(len({layout, same, narrower, coarser}), 3)
+
+    def testLoadLayout(self):
+        """
+        Confirm that a spec can be loaded from a JSON file.
+        """
+        spec = {'type': 'ring', 'count': 4, 'radius': 20, 'height': 5, \
+            'output_range': [0, 255]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "layout.json")
+            with open(path, "w") as spec_file:
+                json.dump(spec, spec_file)
+            layout = load_layout(path)
+
+        self.assertEqual(list(layout), [(0, 20, 5), (20, 0, 5), (0, -20, 5), (-20, 0, 5)])
+        self.assertEqual(layout.output_range, (0, 255))
+        self.assertEqual(pickle.loads(pickle.dumps(layout)), layout)
+
+    def testSharedByMounts(self):
+        """
+        Confirm that mounts built from a layout don't affect each other and
+        that a GradientDirectionFinder keeps its fit with the layout.
+        """
+        layout = compile_layout()
+        first = SensorMount.from_layout(layout)
+        second = SensorMount.from_layout(layout)
+        first.get_sensor(0).location = (1, 2, 3)
+
+        self.assertEqual(first.sensor_positions()[0], (1, 2, 3))
+        self.assertEqual(second.sensor_positions(), list(layout))
+
+        GradientDirectionFinder().FindDirections([list(range(8))], layout)
+        self.assertIn('GradientDirectionFinder', layout._precomputed)
+        self.assertIsInstance(layout, SensorLayout)
+
+if __name__ == "__main__":
+    unittest.main()
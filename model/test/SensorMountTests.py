@@ -2,6 +2,7 @@
 """
 Contains unit tests for SensorMount object
 """
+import math
 import sys
 import unittest
 sys.path.append("..")
@@ -212,5 +213,123 @@ class SensorMountTests(unittest.TestCase):
             self.assertAlmostEqual(mount_under_test.get_sensor(i).current_position()[2],\
                 resultant_location[i][2], 6)
 
+    def testManySmallMovesStayExact(self):
+        """
+        Confirm that many small rotations and translations which add up to a
+        full turn return a sensor to exactly where it started.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((100, 0, 0), (), ()))
+
+        for step in range(1, 100001):
+            mount_under_test.move_to_position((step % 7, step % 3, 0), 360 / 100000)
+        mount_under_test.move_to_position((0, 0, 0), 0)
+
+        final_position = mount_under_test.get_sensor(0).current_position()
+        self.assertAlmostEqual(final_position[0], 100, 6)
+        self.assertAlmostEqual(final_position[1], 0, 6)
+        self.assertAlmostEqual(math.remainder(mount_under_test.current_heading(), 360), 0, 6)
+
+    def testHeadingStaysWithinATurn(self):
+        """
+        Confirm that relative rotations keep the heading within a single
+        turn and reuse the matrix of the heading they come back to.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((1, 0, 0), (), ()))
+        mount_under_test.move_to_position((0, 0, 0), 350.1)
+        first_matrix = mount_under_test._matrix()
+        for _ in range(3):
+            mount_under_test.move_to_position((0, 0, 0), 120.2)
+        mount_under_test.move_to_position((0, 0, 0), -360.6)
+
+        self.assertGreaterEqual(mount_under_test.current_heading(), 0)
+        self.assertLess(mount_under_test.current_heading(), 360)
+        self.assertIs(mount_under_test._matrix(), first_matrix)
+
+    def testSensorOffsetsStayInMountFrame(self):
+        """
+        Confirm that the sensor offsets don't change as the mount moves and
+        that a direction found from them is turned to match the mount.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((1, 0, 10), (), ()))
+        offsets = mount_under_test.sensor_offsets()
+        mount_under_test.move_to_position((5, 5, 0), 90)
+
+        self.assertIs(mount_under_test.sensor_offsets(), offsets)
+        self.assertEqual(offsets, ((1, 0, 10),))
+        world_direction = mount_under_test.to_world_direction((1, 0))
+        sensor_position = mount_under_test.sensor_positions()[0]
+        self.assertAlmostEqual(world_direction[0], sensor_position[0] - 5, 6)
+        self.assertAlmostEqual(world_direction[1], sensor_position[1] - 5, 6)
+
+        mount_under_test.set_sensor_position(0, (5, 7, 0))
+        self.assertIsNot(mount_under_test.sensor_offsets(), offsets)
+
+    def testMoveIsDeferred(self):
+        """
+        Confirm that moving a SensorMount only updates its pose and that the
+        sensor positions are worked out when they are next read.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((1, 0, 0), (), ()))
+        mount_under_test.move_to_position((1, 2, 3), 0)
+
+        self.assertIsNone(mount_under_test.positions)
+        self.assertEqual(mount_under_test.sensor_positions(), [(2, 2, 3)])
+
+    def testAddSensorAfterMove(self):
+        """
+        Confirm that a sensor attached after the SensorMount has been moved
+        and rotated keeps its absolute position and then moves with the mount.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.move_to_position((10, 0, 0), 90)
+        mount_under_test.add_new_sensor(LightSensor((11, 0, 0), (), ()))
+
+        position = mount_under_test.get_sensor(0).current_position()
+        self.assertAlmostEqual(position[0], 11, 6)
+        self.assertAlmostEqual(position[1], 0, 6)
+
+        mount_under_test.move_to_position((10, 0, 0), 90)
+        position = mount_under_test.get_sensor(0).current_position()
+        self.assertAlmostEqual(position[0], 10, 6)
+        self.assertAlmostEqual(position[1], -1, 6)
+
+    def testMoveSingleSensor(self):
+        """
+        Confirm that moving an attached sensor through get_sensor keeps it at
+        the same place on the SensorMount for later moves.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((1, 0, 0), (), ()))
+        mount_under_test.get_sensor(0).move_to_position((0, 2, 0))
+        mount_under_test.move_to_position((5, 5, 0), 0)
+
+        self.assertEqual(mount_under_test.get_sensor(0).current_position(), (5, 7, 0))
+
+    def testPitchAndRoll(self):
+        """
+        Confirm that a SensorMount can be tilted for a drone and that
+        sensors added while tilted keep their place on the mount.
+        """
+        mount_under_test = SensorMount()
+        mount_under_test.add_new_sensor(LightSensor((10, 0, 0), (), ()))
+        mount_under_test.move_to_pose((0, 0, 100), 0, pitch=90)
+
+        position = mount_under_test.get_sensor(0).current_position()
+        self.assertAlmostEqual(position[0], 0, 6)
+        self.assertAlmostEqual(position[1], 0, 6)
+        self.assertAlmostEqual(position[2], 110, 6)
+        self.assertEqual(mount_under_test.current_attitude(), (0, 90, 0))
+
+        mount_under_test.add_new_sensor(LightSensor((0, 0, 90), (), ()))
+        mount_under_test.move_to_pose((0, 0, 0), 0)
+        position = mount_under_test.get_sensor(1).current_position()
+        self.assertAlmostEqual(position[0], -10, 6)
+        self.assertAlmostEqual(position[1], 0, 6)
+        self.assertAlmostEqual(position[2], 0, 6)
+
 if __name__ == "__main__":
     unittest.main()
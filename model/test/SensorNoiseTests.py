@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the SensorNoise module
+"""
+import statistics
+import sys
+import unittest
+from array import array
+sys.path.append("..")
+sys.path.append("../..")
+from DirectionFinder import DirectionFinder
+from LightSensor import SensorQuantizer
+from SensorNoise import GARBAGE_VALUES
+from SensorNoise import NoisyQuantizer
+from SensorNoise import SensorNoise
+from SensorNoise import normal
+from SensorNoise import uniform
+
+RANGES = ([(0, 304)] * 8, [(0, 1023)] * 8)
+
+class SensorNoiseTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the sensor
+    noise model
+    """
+
+    def testCounterBasedStreams(self):
+        """
+        Confirm that random values depend only on their counters and are
+        spread as expected.
+        """
+        self.assertEqual(uniform(1, 2, 3, 4), uniform(1, 2, 3, 4))
+        self.assertNotEqual(uniform(1, 2, 3, 4), uniform(1, 2, 3, 5))
+        self.assertNotEqual(uniform(1, 2, 3, 4), uniform(2, 2, 3, 4))
+
+        values = [normal(7, 1, frame_id, 0) for frame_id in range(20000)]
+        self.assertAlmostEqual(statistics.mean(values), 0, delta=0.03)
+        self.assertAlmostEqual(statistics.stdev(values), 1, delta=0.03)
+
+    def testNoNoise(self):
+        """
+        Confirm that a perfect noise model gives the plain quantized outputs.
+        """
+        quantizer = SensorQuantizer(*RANGES)
+        noisy = NoisyQuantizer(quantizer, SensorNoise())
+        frames = [[index * 10 + sensor for sensor in range(8)] for index in range(5)]
+
+        self.assertEqual(noisy.quantize_frames(frames), quantizer.quantize_frames(frames))
+        self.assertEqual(noisy.next_frame_id, 5)
+
+    def testReproducibleInAnyOrder(self):
+        """
+        Confirm that a frame gets the same noise whether it is converted on
+        its own or in a batch.
+        """
+        noise = SensorNoise(seed=3, shot_noise=0.5, read_noise=4, gain_mismatch=0.05, \
+            offset_mismatch=2)
+        frames = [[100 + frame_id] * 8 for frame_id in range(10)]
+        batch = NoisyQuantizer(SensorQuantizer(*RANGES), noise).quantize_frames(frames)
+        single = NoisyQuantizer(SensorQuantizer(*RANGES), noise)
+
+        for frame_id in reversed(range(10)):
+            self.assertEqual(single.quantize(frames[frame_id], frame_id), batch[frame_id])
+        self.assertNotEqual(batch[0], batch[1])
+        self.assertEqual(batch[0].typecode, 'H')
+
+    def testFaults(self):
+        """
+        Confirm that dead and stuck channels never change and that garbage
+        values are rejected by the DirectionFinder.
+        """
+        noise = SensorNoise(seed=5, dead_probability=0.25, stuck_probability=0.25, \
+            garbage_probability=0.1)
+        noisy = NoisyQuantizer(SensorQuantizer(*RANGES), noise)
+        frames = noisy.quantize_frames([[index * 10] * 8 for index in range(200)])
+
+        for sensor, stuck in enumerate(noisy.stuck):
+            if stuck is not None:
+                self.assertTrue(all(frame[sensor] in (stuck,) + GARBAGE_VALUES \
+                    for frame in frames))
+        self.assertIn(0, noisy.stuck)
+
+        garbage = [frame for frame in frames if not isinstance(frame, array)]
+        self.assertGreater(len(garbage), 0)
+        locations = [(index, 0) for index in range(8)]
+        self.assertEqual(DirectionFinder().FindDirections(garbage, locations), \
+            [()] * len(garbage))
+
+if __name__ == "__main__":
+    unittest.main()
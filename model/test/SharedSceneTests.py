@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the SharedScene
+"""
+import sys
+import unittest
+sys.path.append("..")
+sys.path.append("../..")
+import ScenarioRunner
+from LightField import LightField
+from LightSource import LightSource
+from SensorArray import SensorArray
+from SharedScene import SharedScene
+
+class SharedSceneTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the
+    SharedScene
+    """
+
+    def setUp(self):
+        self.sources = [LightSource((0, 0, 304), 500), LightSource((100, 50, 250), 200, 2)]
+        self.field = LightField(self.sources)
+        self.grid = self.field.precompute_grid((-100, 100, 10), (-100, 100, 10), (10, 10, 1))
+        self.template = SensorArray()
+        for sensor in ScenarioRunner.ring_sensors(8, 30, input_range=(0, 10)):
+            self.template.add_light_sensor(sensor)
+        self.scene = SharedScene.publish(self.sources, self.grid, {'ring': self.template})
+
+    def tearDown(self):
+        self.scene.close()
+        self.scene.unlink()
+
+    def testAttachedSources(self):
+        """
+        Confirm that an attached scene recreates the published sources.
+        """
+        attached = SharedScene.attach(self.scene.descriptor)
+        sources = attached.sources()
+
+        self.assertEqual([source.get_location() for source in sources], \
+            [(0, 0, 304), (100, 50, 250)])
+        self.assertEqual([source.get_output_intensity() for source in sources], [500, 200])
+        self.assertEqual(sources[1].min_distance, 2)
+        attached.close()
+
+    def testAttachedGridIsShared(self):
+        """
+        Confirm that the attached field interpolates the published grid from
+        shared memory without copying it.
+        """
+        attached = SharedScene.attach(self.scene.descriptor)
+        field = attached.light_field()
+
+        self.assertIsInstance(field.grid.values, memoryview)
+        self.assertEqual(field.grid.shape(), self.grid.shape())
+        for location in [(5, 5, 10), (-73, 12, 10), (500, 0, 10)]:
+            self.assertAlmostEqual(field.get_intensity_at_location(location), \
+                self.field.get_intensity_at_location(location), 9)
+        del field
+        attached.close()
+
+    def testSensorTemplate(self):
+        """
+        Confirm that a published sensor layout is read back unchanged.
+        """
+        attached = SharedScene.attach(self.scene.descriptor)
+        sensors = attached.sensors('ring')
+
+        self.assertEqual(attached.template_names(), ['ring'])
+        self.assertEqual(len(sensors), 8)
+        for index, sensor in enumerate(sensors):
+            self.assertEqual(sensor.location, self.template.position(index))
+            self.assertEqual(sensor.input_range, (0, 10))
+            self.assertEqual(sensor.output_range, (0, 1023))
+        with self.assertRaises(KeyError):
+            attached.sensor_template('missing')
+        del sensors, sensor
+        attached.close()
+
+    def testScenariosInSharedScene(self):
+        """
+        Confirm that scenarios give the same results in a shared scene
+        whether they are run in this process or by workers.
+        """
+        scenarios = ScenarioRunner.expand_sweep(repeats=4, base_seed=3)
+        for scenario in scenarios:
+            scenario['sensor_template'] = 'ring'
+
+        serial = ScenarioRunner.run_scenarios(scenarios, processes=1, scene=self.scene)
+        parallel = ScenarioRunner.run_scenarios(scenarios, processes=2, scene=self.scene)
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result['sensor_reads'] for result in serial], \
+            [result['iterations'] * 8 for result in serial])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Contains unit tests for the Trajectory
+"""
+import sys
+import unittest
+sys.path.append("..")
+from ResultsSink import MemoryResultsSink
+from Trajectory import Trajectory
+
+class TrajectoryTests(unittest.TestCase):
+    """
+    Suite of test cases to confirm the expected operation of the Trajectory
+    """
+
+    def testRecord(self):
+        """
+        Confirm that recorded iterations can be read back by column and
+        written to a ResultsSink.
+        """
+        trajectory = Trajectory(2)
+        trajectory.record((60, 0, 0), [-5, 0], 55)
+        trajectory.record((55, 0, 0), [-5, 0], 50)
+
+        self.assertEqual(len(trajectory), 2)
+        self.assertEqual(trajectory.positions(), [(60, 0), (55, 0)])
+        self.assertEqual(trajectory.moves(), [(-5, 0), (-5, 0)])
+        self.assertEqual(list(trajectory.errors()), [55, 50])
+
+        sink = MemoryResultsSink()
+        trajectory.write_to(sink, run_id=3)
+        sink.close()
+        self.assertEqual(sink.results, [(3, 60, 0, -5, 0, 55), (3, 55, 0, -5, 0, 50)])
+
+    def testGrow(self):
+        """
+        Confirm that a trajectory grows past its capacity.
+        """
+        trajectory = Trajectory()
+        for iteration in range(40):
+            trajectory.record((iteration, 0), (1, 0), 40 - iteration)
+
+        self.assertEqual(len(trajectory), 40)
+        self.assertGreaterEqual(trajectory.capacity, 40)
+        self.assertEqual(list(trajectory.errors()), list(range(40, 0, -1)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,5 +5,6 @@ from distutils.core import setup
 setup(name='next-move-determination',
       version='0.1',
       description='library for performing DF and suggesting a maneuver based on sensor data',
-      py_modules=['DirectionFinder']
+      py_modules=['DirectionCache', 'DirectionFinder', 'DirectionStream', 'FrameFilter', 'FrameLog',
+                  'Instrumentation', 'InterpolatingDirectionFinder', 'SensorFrame']
     )
\ No newline at end of file